@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for name normalization and matching.
+
+Compares the previous per-client implementation (a loop of str.replace
+calls on every comparison) with jamknife.matching, both cold (cache
+cleared before every round) and warm (memoized, as in a sync job that
+compares the same playlist names against many candidates).
+
+Usage:
+    python scripts/benchmark_matching.py [rounds]
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+# Add parent directory to path to import jamknife modules
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from jamknife.matching import names_match, normalize_name
+
+PAIRS = [
+    ("The Beatles", "Beatles"),
+    ("Karma Police", "Karma Police (Remastered)"),
+    ("Hello, World! (Live)", "hello world live"),
+    ("Sigur Rós", "Sigur Ros"),
+    ("Song - Remastered: 2011", "Song Remastered 2011"),
+    ("Don't Stop Me Now", "Don't Stop Me Now - 2011 Mix"),
+    ("Airbag", "Paranoid Android"),
+    ("Everything In Its Right Place", "Everything in Its Right Place"),
+]
+
+
+def legacy_normalize(name):
+    """The normalization previously copied into each client."""
+    name = name.lower().strip()
+    if name.startswith("the "):
+        name = name[4:]
+    for char in ["'", '"', ".", ",", "!", "?", "(", ")", "[", "]", "-", ":"]:
+        name = name.replace(char, "")
+    return " ".join(name.split())
+
+
+def legacy_names_match(name1, name2):
+    if not name1 or not name2:
+        return False
+    n1 = legacy_normalize(name1)
+    n2 = legacy_normalize(name2)
+    return n1 == n2 or n1 in n2 or n2 in n1
+
+
+def run_legacy():
+    for a, b in PAIRS:
+        legacy_names_match(a, b)
+
+
+uncached_normalize = normalize_name.__wrapped__
+
+
+def run_uncached():
+    for a, b in PAIRS:
+        n1 = uncached_normalize(a)
+        n2 = uncached_normalize(b)
+        _ = n1 == n2 or n1 in n2 or n2 in n1
+
+
+def run_warm():
+    for a, b in PAIRS:
+        names_match(a, b)
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    comparisons = rounds * len(PAIRS)
+
+    results = {}
+    runs = (("legacy", run_legacy), ("uncached", run_uncached), ("warm", run_warm))
+    for name, func in runs:
+        seconds = min(timeit.repeat(func, number=rounds, repeat=3))
+        results[name] = seconds / comparisons * 1e9
+        print(f"{name:<8} {results[name]:8.1f} ns/comparison")
+
+    for name in ("uncached", "warm"):
+        print(f"{name} speedup over legacy: {results['legacy'] / results[name]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
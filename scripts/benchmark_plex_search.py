@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Count the Plex requests made by artist-based track search.
+
+Compares the old album-by-album crawl (one request per album) with the
+single allLeaves request now used by PlexClient.search_track strategy 2.
+
+Usage:
+    PLEX_URL=http://plex:32400 PLEX_TOKEN=... \\
+        python scripts/benchmark_plex_search.py "Artist" "Track title"
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import jamknife modules
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import requests
+from plexapi.server import PlexServer
+
+from jamknife.matching import names_match
+
+
+class CountingSession(requests.Session):
+    """Session that counts the requests sent through it."""
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    def request(self, *args, **kwargs):
+        self.count += 1
+        return super().request(*args, **kwargs)
+
+
+def crawl_albums(music, artist, title):
+    """The old strategy: artist -> albums -> tracks."""
+    for plex_artist in music.searchArtists(title=artist):
+        if names_match(plex_artist.title, artist):
+            for plex_album in plex_artist.albums():
+                for track in plex_album.tracks():
+                    if names_match(track.title, title):
+                        return track
+    return None
+
+
+def all_leaves(music, artist, title):
+    """The new strategy: artist -> all tracks in one request."""
+    for plex_artist in music.searchArtists(title=artist):
+        if names_match(plex_artist.title, artist):
+            for track in plex_artist.tracks():
+                if names_match(track.title, title):
+                    return track
+    return None
+
+
+def measure(session, name, func, *args):
+    """Run a strategy and print its request count and duration."""
+    session.count = 0
+    start = time.perf_counter()
+    track = func(*args)
+    elapsed = time.perf_counter() - start
+    found = f"{track.title} ({track.parentTitle})" if track else "not found"
+    print(f"{name:<12} {session.count:>4} requests  {elapsed:6.2f}s  {found}")
+
+
+def main():
+    if len(sys.argv) != 3:
+        print(__doc__)
+        sys.exit(1)
+    artist, title = sys.argv[1], sys.argv[2]
+
+    session = CountingSession()
+    server = PlexServer(
+        os.environ.get("PLEX_URL", "http://localhost:32400"),
+        os.environ.get("PLEX_TOKEN", ""),
+        session=session,
+    )
+    music = server.library.section(os.environ.get("PLEX_MUSIC_LIBRARY", "Music"))
+
+    measure(session, "album crawl", crawl_albums, music, artist, title)
+    measure(session, "allLeaves", all_leaves, music, artist, title)
+
+
+if __name__ == "__main__":
+    main()
@@ -44,7 +44,7 @@ def extract_model_fields() -> Dict[str, Set[str]]:
     models["AlbumDownload"] = {
         "id", "ytmusic_album_id", "ytmusic_album_url",
         "album_name", "artist_name", "yubal_job_id",
-        "status", "progress", "error_message",
+        "status", "progress", "error_message", "priority", "track_name",
         "queued_at", "completed_at", "created_at"
     }
     
@@ -1,15 +1,32 @@
 """Clients for external services."""
 
 from jamknife.clients.listenbrainz import ListenBrainzClient, Playlist, Track
-from jamknife.clients.plex import PlexClient
-from jamknife.clients.ytmusic import YTMusicResolver
-from jamknife.clients.yubal import YubalClient
+from jamknife.clients.plex import PlexClient, PlexClientPool
+from jamknife.clients.plex_catalog import PlexTrackCatalog
+from jamknife.clients.plex_index import PlexLibraryIndex
+from jamknife.clients.rate_limit import AdaptiveRateLimiter
+from jamknife.clients.ytmusic import YTMusicPool, YTMusicResolver
+from jamknife.clients.ytmusic_cache import (
+    YTMusicAlbumCache,
+    YTMusicArtistCache,
+    YTMusicResolutionCache,
+)
+from jamknife.clients.yubal import YubalClient, YubalJobFeed
 
 __all__ = [
+    "AdaptiveRateLimiter",
     "ListenBrainzClient",
     "Playlist",
     "Track",
     "PlexClient",
+    "PlexClientPool",
+    "PlexLibraryIndex",
+    "PlexTrackCatalog",
+    "YTMusicAlbumCache",
+    "YTMusicArtistCache",
+    "YTMusicPool",
+    "YTMusicResolutionCache",
     "YTMusicResolver",
     "YubalClient",
+    "YubalJobFeed",
 ]
@@ -1,13 +1,23 @@
 """Plex client for library search and playlist management."""
 
 import logging
-from dataclasses import dataclass
-
+import posixpath
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+import requests
 from plexapi.audio import Track
 from plexapi.exceptions import NotFound
 from plexapi.playlist import Playlist
 from plexapi.server import PlexServer
 
+from jamknife.clients.plex_index import IndexedTrack, PlexLibraryIndex
+from jamknife.matching import names_match, normalize_name, similarity
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,18 +29,119 @@ class PlexTrackMatch:
     title: str
     artist: str
     album: str | None
-    track: Track
+    track: Track | None = None  # None when answered from the library index
+
+
+@dataclass
+class RatingKeyLookup:
+    """Result of fetching several tracks by rating key."""
+
+    tracks: dict[str, Track]
+    missing: list[str]
+
+
+@dataclass
+class PlaylistUpdatePlan:
+    """Minimal set of edits turning one playlist order into another.
+
+    Indices in ``remove`` refer to the current playlist. ``add`` lists rating
+    keys to append, in desired order. ``moves`` refer to the playlist after
+    removals and additions: each (item, after) pair moves item directly
+    after another item, or to the top when after is None. Moves must be
+    applied in order.
+    """
+
+    remove: list[int] = field(default_factory=list)
+    add: list[str] = field(default_factory=list)
+    moves: list[tuple[int, int | None]] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether the playlist is already up to date."""
+        return not (self.remove or self.add or self.moves)
+
+
+def plan_playlist_update(current: list[str], desired: list[str]) -> PlaylistUpdatePlan:
+    """Plan the fewest removals, additions and moves from current to desired.
+
+    Both lists are rating keys in playlist order and may contain duplicates.
+    Items already in the right relative order (the longest increasing run of
+    target positions) are left untouched.
+    """
+    # Pair existing items with desired positions, first come first served
+    available: dict[str, deque[int]] = defaultdict(deque)
+    for i, key in enumerate(current):
+        available[key].append(i)
+
+    target_of_current: dict[int, int] = {}
+    add_targets: list[int] = []
+    for target, key in enumerate(desired):
+        if available[key]:
+            target_of_current[available[key].popleft()] = target
+        else:
+            add_targets.append(target)
+
+    plan = PlaylistUpdatePlan(
+        remove=[i for i in range(len(current)) if i not in target_of_current],
+        add=[desired[t] for t in add_targets],
+    )
+
+    # Order after removals and appends, expressed as desired positions
+    targets = [target_of_current[i] for i in sorted(target_of_current)] + add_targets
+    stable = _longest_increasing_subsequence(targets)
+    slot_of_target = {target: slot for slot, target in enumerate(targets)}
+
+    for target in range(len(desired)):
+        slot = slot_of_target[target]
+        if slot in stable:
+            continue
+        after = slot_of_target[target - 1] if target > 0 else None
+        plan.moves.append((slot, after))
+
+    return plan
+
+
+def _longest_increasing_subsequence(values: list[int]) -> set[int]:
+    """Return the indices of one longest strictly increasing subsequence."""
+    tails: list[int] = []  # values ending the best subsequence of each length
+    tail_indices: list[int] = []
+    previous: list[int | None] = [None] * len(values)
+
+    for i, value in enumerate(values):
+        pos = bisect_left(tails, value)
+        if pos == len(tails):
+            tails.append(value)
+            tail_indices.append(i)
+        else:
+            tails[pos] = value
+            tail_indices[pos] = i
+        previous[i] = tail_indices[pos - 1] if pos > 0 else None
+
+    result: set[int] = set()
+    index = tail_indices[-1] if tail_indices else None
+    while index is not None:
+        result.add(index)
+        index = previous[index]
+    return result
 
 
 class PlexClient:
     """Client for Plex Media Server operations."""
 
+    # Rating keys fetched per /library/metadata request
+    RATING_KEY_BATCH_SIZE = 200
+
+    # Folders scanned individually before collapsing to a common parent
+    MAX_SCAN_PATHS = 10
+
     def __init__(
         self,
         base_url: str,
         token: str,
         music_library: str = "Music",
         verify_ssl: bool = True,
+        library_index: PlexLibraryIndex | None = None,
+        session: requests.Session | None = None,
     ):
         """Initialize the Plex client.
 
@@ -39,6 +150,9 @@ class PlexClient:
             token: Plex authentication token.
             music_library: Name of the music library section.
             verify_ssl: Whether to verify SSL certificates (default: True).
+            library_index: Optional shared library index consulted before
+                           searching on the server.
+            session: Optional HTTP session to reuse for server requests.
         """
         self._base_url = base_url
         self._token = token
@@ -46,25 +160,30 @@ class PlexClient:
         self._verify_ssl = verify_ssl
         self._server: PlexServer | None = None
         self._music_section = None
+        self._library_index = library_index
+        self._session = session
+        self._connect_lock = threading.Lock()
 
     def _connect(self) -> PlexServer:
         """Establish connection to Plex server."""
-        if self._server is None:
-            session = None
-            if not self._verify_ssl:
-                import requests
-                from requests.packages.urllib3.exceptions import InsecureRequestWarning
-
-                requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
-                session = requests.Session()
-                session.verify = False
-                logger.warning(
-                    "SSL certificate verification disabled for Plex connection"
-                )
-
-            self._server = PlexServer(self._base_url, self._token, session=session)
-            logger.info("Connected to Plex server: %s", self._server.friendlyName)
-        return self._server
+        with self._connect_lock:
+            if self._server is None:
+                session = self._session
+                if not self._verify_ssl:
+                    from requests.packages.urllib3.exceptions import (
+                        InsecureRequestWarning,
+                    )
+
+                    requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
+                    session = session or requests.Session()
+                    session.verify = False
+                    logger.warning(
+                        "SSL certificate verification disabled for Plex connection"
+                    )
+
+                self._server = PlexServer(self._base_url, self._token, session=session)
+                logger.info("Connected to Plex server: %s", self._server.friendlyName)
+            return self._server
 
     def _get_music_section(self):
         """Get the music library section."""
@@ -73,12 +192,65 @@ class PlexClient:
             self._music_section = server.library.section(self._music_library_name)
         return self._music_section
 
+    def ping(self) -> bool:
+        """Check that the server connection still answers requests."""
+        if self._server is None:
+            return False
+        try:
+            self._server.query("/identity")
+        except Exception as e:
+            logger.warning("Plex health check failed: %s", e)
+            return False
+        return True
+
+    def reset(self) -> None:
+        """Drop the cached server connection and section."""
+        with self._connect_lock:
+            self._server = None
+            self._music_section = None
+
+    def _get_library_index(self) -> PlexLibraryIndex | None:
+        """Get the library index, (re)building it if it is stale.
+
+        Returns None if no index is configured or it could not be built.
+        """
+        index = self._library_index
+        if index is None:
+            return None
+
+        if index.is_stale:
+            try:
+                index.refresh_if_stale(self._get_music_section())
+            except Exception as e:
+                logger.warning("Failed to build Plex library index: %s", e)
+                return index if index.is_loaded else None
+        return index
+
+    def find_track_by_mbid(self, recording_mbid: str) -> PlexTrackMatch | None:
+        """Find a track by MusicBrainz recording ID using the library index.
+
+        Only tracks whose Plex GUIDs carry the MBID can be found this way; no
+        request is made to the server beyond keeping the index fresh.
+
+        Args:
+            recording_mbid: MusicBrainz recording ID.
+
+        Returns:
+            PlexTrackMatch if found, None otherwise.
+        """
+        index = self._get_library_index()
+        if index is None:
+            return None
+        entry = index.find_by_recording_mbid(recording_mbid)
+        return self._create_match_from_index(entry) if entry else None
+
     def search_track(
         self, title: str, artist: str, album: str | None = None
     ) -> PlexTrackMatch | None:
         """Search for a track in the Plex library.
 
-        Uses a multi-stage search strategy:
+        Consults the library index and its persistent catalog first, then
+        falls back to a multi-stage search on the server:
         1. Exact match on title + artist + album (if provided)
         2. Exact match on title + artist
         3. Fuzzy search with ranking
@@ -91,6 +263,14 @@ class PlexClient:
         Returns:
             PlexTrackMatch if found, None otherwise.
         """
+        index = self._get_library_index()
+        if index is not None:
+            entry = index.find_track(title, artist, album) or index.search_catalog(
+                title, artist, album
+            )
+            if entry:
+                return self._create_match_from_index(entry)
+
         music = self._get_music_section()
 
         # Strategy 1: Search by title and filter by artist
@@ -107,31 +287,40 @@ class PlexClient:
         except Exception as e:
             logger.debug("Track search failed: %s", e)
 
-        # Strategy 2: Search by artist first, then find track
+        # Strategy 2: Search by artist first, then scan all of the artist's
+        # tracks from a single allLeaves request rather than album by album
         try:
             artist_results = music.searchArtists(title=artist)
             for plex_artist in artist_results:
-                if self._names_match(plex_artist.title, artist):
-                    for plex_album in plex_artist.albums():
-                        for track in plex_album.tracks():
-                            if self._names_match(track.title, title):
-                                if album:
-                                    if self._names_match(plex_album.title, album):
-                                        return self._create_match(track)
-                                else:
-                                    return self._create_match(track)
+                if not self._names_match(plex_artist.title, artist):
+                    continue
+                for track in plex_artist.tracks():
+                    if not self._names_match(track.title, title):
+                        continue
+                    if album and not self._names_match(track.parentTitle or "", album):
+                        continue
+                    return self._create_match(track)
         except Exception as e:
             logger.debug("Artist-based search failed: %s", e)
 
-        # Strategy 3: Broad search
+        # Strategy 3: Broad search, keeping the closest of the ranked results
         try:
             results = music.search(f"{artist} {title}", mediatype="track", limit=20)
-            for track in results:
-                track_artist = self._get_track_artist(track)
-                if self._names_match(track.title, title) and self._names_match(
-                    track_artist, artist
-                ):
-                    return self._create_match(track)
+            candidates = [
+                track
+                for track in results
+                if self._names_match(track.title, title)
+                and self._names_match(self._get_track_artist(track), artist)
+            ]
+            if candidates:
+                best = max(
+                    candidates,
+                    key=lambda t: (
+                        similarity(t.title, title)
+                        + similarity(self._get_track_artist(t), artist)
+                    ),
+                )
+                return self._create_match(best)
         except Exception as e:
             logger.debug("Broad search failed: %s", e)
 
@@ -152,6 +341,12 @@ class PlexClient:
         Returns:
             PlexTrackMatch if found, None otherwise.
         """
+        index = self._get_library_index()
+        if index is not None:
+            entry = index.find_track_on_album(album_name, track_title, artist_name)
+            if entry:
+                return self._create_match_from_index(entry)
+
         music = self._get_music_section()
 
         try:
@@ -178,6 +373,51 @@ class PlexClient:
         except (NotFound, ValueError):
             return None
 
+    def get_tracks_by_rating_keys(
+        self, rating_keys: list[str], batch_size: int | None = None
+    ) -> RatingKeyLookup:
+        """Fetch many tracks with one /library/metadata/k1,k2,... request per batch.
+
+        Keys that no longer exist in Plex are reported as missing and dropped
+        from the library index.
+
+        Args:
+            rating_keys: Rating keys to fetch (duplicates are fetched once).
+            batch_size: Keys per request (default: RATING_KEY_BATCH_SIZE).
+
+        Returns:
+            RatingKeyLookup with the found tracks keyed by rating key and the
+            keys that were not found.
+        """
+        batch_size = batch_size or self.RATING_KEY_BATCH_SIZE
+        keys = [k for k in dict.fromkeys(rating_keys) if k.isdigit()]
+        invalid = [k for k in dict.fromkeys(rating_keys) if not k.isdigit()]
+
+        tracks: dict[str, Track] = {}
+        server = self._connect()
+        for start in range(0, len(keys), batch_size):
+            batch = keys[start : start + batch_size]
+            # One page for the whole batch; plexapi otherwise pages at
+            # X_PLEX_CONTAINER_SIZE (100) and splits larger batches
+            try:
+                items = server.fetchItems(
+                    f"/library/metadata/{','.join(batch)}",
+                    container_size=len(batch),
+                )
+            except NotFound:
+                continue
+            for item in items:
+                tracks[str(item.ratingKey)] = item
+
+        missing = invalid + [k for k in keys if k not in tracks]
+        if missing:
+            logger.info("%d rating key(s) no longer exist in Plex", len(missing))
+            if self._library_index is not None:
+                for key in missing:
+                    self._library_index.remove(key)
+
+        return RatingKeyLookup(tracks=tracks, missing=missing)
+
     def create_playlist(
         self, name: str, tracks: list[Track], replace_existing: bool = True
     ) -> Playlist:
@@ -205,11 +445,226 @@ class PlexClient:
         logger.info("Created playlist '%s' with %d tracks", name, len(tracks))
         return playlist
 
-    def refresh_library(self) -> None:
-        """Trigger a library refresh for the music section."""
+    def update_playlist(self, name: str, tracks: list[Track]) -> Playlist:
+        """Bring a playlist in line with the given tracks using minimal edits.
+
+        Unlike create_playlist(replace_existing=True), only the items that
+        changed are removed, added or moved, so the playlist keeps its rating
+        key and an unchanged playlist costs a single request.
+
+        Args:
+            name: Name of the playlist.
+            tracks: Plex Track objects in the desired order.
+
+        Returns:
+            The updated (or newly created) Playlist object.
+        """
+        server = self._connect()
+
+        try:
+            playlist = server.playlist(name)
+        except NotFound:
+            return self.create_playlist(name, tracks, replace_existing=False)
+
+        if playlist.smart:
+            return self.create_playlist(name, tracks, replace_existing=True)
+
+        items = playlist.items()
+        current = [str(item.ratingKey) for item in items]
+        desired = [str(track.ratingKey) for track in tracks]
+        plan = plan_playlist_update(current, desired)
+        if plan.is_empty:
+            logger.info("Playlist '%s' is already up to date", name)
+            return playlist
+
+        # Playlist.removeItems/moveItem find items by rating key, so a track
+        # listed twice can't be told apart; rebuild those playlists instead
+        if len(set(current)) < len(current) or len(set(desired)) < len(desired):
+            return self.create_playlist(name, tracks, replace_existing=True)
+
+        if plan.remove:
+            playlist.removeItems([items[index] for index in plan.remove])
+
+        if plan.add:
+            by_key = {str(track.ratingKey): track for track in tracks}
+            playlist.addItems([by_key[key] for key in plan.add])
+
+        if plan.moves:
+            removed = set(plan.remove)
+            expected = [
+                str(item.ratingKey) for i, item in enumerate(items) if i not in removed
+            ] + plan.add
+
+            playlist.reload()
+            items = playlist.items()
+            if [str(item.ratingKey) for item in items] != expected:
+                logger.warning(
+                    "Playlist '%s' changed during update, recreating it", name
+                )
+                return self.create_playlist(name, tracks, replace_existing=True)
+
+            for slot, after in plan.moves:
+                playlist.moveItem(
+                    items[slot], after=items[after] if after is not None else None
+                )
+
+        logger.info(
+            "Updated playlist '%s': %d removed, %d added, %d moved",
+            name,
+            len(plan.remove),
+            len(plan.add),
+            len(plan.moves),
+        )
+        return playlist
+
+    def refresh_library(self, paths: list[str] | None = None) -> datetime | None:
+        """Scan the music section for new files.
+
+        With paths, only those folders are scanned (as seen by the Plex
+        server). Nested paths are dropped, and more than MAX_SCAN_PATHS
+        folders are collapsed into their common parent.
+
+        Args:
+            paths: Folders to scan, or None to scan the whole section.
+
+        Returns:
+            When the section was last scanned before this refresh, to pass to
+            wait_for_library_scan.
+        """
         music = self._get_music_section()
-        music.refresh()
-        logger.info("Triggered library refresh for %s", self._music_library_name)
+        _refreshing, scanned_at = self.get_library_scan_state()
+
+        scan_paths = self._collapse_scan_paths(paths or [])
+        if not scan_paths:
+            music.update()
+            logger.info("Triggered library scan for %s", self._music_library_name)
+            return scanned_at
+
+        for path in scan_paths:
+            music.update(path=path)
+        logger.info(
+            "Triggered partial library scan for %s: %s",
+            self._music_library_name,
+            ", ".join(scan_paths),
+        )
+        return scanned_at
+
+    def _collapse_scan_paths(self, paths: list[str]) -> list[str]:
+        """Reduce scan paths to the minimal set of folders covering them."""
+        unique = sorted({posixpath.normpath(p) for p in paths if p})
+        collapsed: list[str] = []
+        for path in unique:
+            if collapsed and (
+                path == collapsed[-1]
+                or path.startswith(collapsed[-1].rstrip("/") + "/")
+            ):
+                continue
+            collapsed.append(path)
+
+        if len(collapsed) > self.MAX_SCAN_PATHS:
+            common = posixpath.commonpath(collapsed)
+            # Paths sharing nothing but the filesystem root mean a full scan
+            return [common] if common not in ("", "/") else []
+        return collapsed
+
+    def get_library_scan_state(self) -> tuple[bool, datetime | None]:
+        """Get whether the music section is scanning and when it last finished.
+
+        Reads /library/sections directly, since plexapi caches section
+        objects and their refreshing flag would never change.
+
+        Returns:
+            Tuple of (refreshing, scanned_at).
+        """
+        music = self._get_music_section()
+        data = self._connect().query("/library/sections")
+        for directory in data:
+            if directory.attrib.get("key") == str(music.key):
+                refreshing = directory.attrib.get("refreshing") in ("1", "true")
+                scanned_at = directory.attrib.get("scannedAt")
+                return refreshing, (
+                    datetime.fromtimestamp(int(scanned_at), tz=timezone.utc)
+                    if scanned_at
+                    else None
+                )
+        return False, None
+
+    def wait_for_library_scan(
+        self,
+        since: datetime | None = None,
+        timeout: float = 600.0,
+        start_timeout: float = 10.0,
+        poll_interval: float = 0.5,
+        max_poll_interval: float = 10.0,
+    ) -> bool:
+        """Wait until a triggered library scan has finished.
+
+        Polls the section with exponential backoff. The scan counts as done
+        once the section is no longer refreshing and its scannedAt has moved
+        past ``since``. If the scan is never seen starting within
+        start_timeout, it is assumed to have been too small to observe.
+        Failed polls count as neither running nor finished.
+
+        Args:
+            since: scannedAt before the scan was triggered (from
+                   refresh_library).
+            timeout: Maximum seconds to wait.
+            start_timeout: Seconds to wait for the scan to become visible.
+            poll_interval: Initial seconds between polls.
+            max_poll_interval: Upper bound for the backed-off poll interval.
+
+        Returns:
+            True if the scan finished, False if the timeout was reached.
+        """
+        started = time.monotonic()
+        interval = poll_interval
+        seen_running = False
+
+        while True:
+            try:
+                refreshing, scanned_at = self.get_library_scan_state()
+            except Exception as e:
+                logger.debug("Failed to poll library scan state: %s", e)
+                elapsed = time.monotonic() - started
+            else:
+                seen_running = seen_running or refreshing
+                elapsed = time.monotonic() - started
+                if not refreshing:
+                    if scanned_at and (since is None or scanned_at > since):
+                        break
+                    if seen_running or elapsed > start_timeout:
+                        break
+
+            if elapsed > timeout:
+                logger.warning(
+                    "Library scan of %s still running after %ds",
+                    self._music_library_name,
+                    timeout,
+                )
+                return False
+
+            time.sleep(interval)
+            interval = min(interval * 1.5, max_poll_interval)
+
+        logger.info(
+            "Library scan of %s finished after %.1fs",
+            self._music_library_name,
+            time.monotonic() - started,
+        )
+        return True
+
+    def refresh_library_index(self) -> None:
+        """Merge recently added or updated tracks into the library index.
+
+        Only tracks changed since the index's high-water mark are fetched, so
+        this is cheap enough to call after every import.
+        """
+        if self._library_index is None:
+            return
+        try:
+            self._library_index.refresh(self._get_music_section())
+        except Exception as e:
+            logger.warning("Failed to refresh Plex library index: %s", e)
 
     def _get_track_artist(self, track: Track) -> str:
         """Get the artist name for a track."""
@@ -221,23 +676,11 @@ class PlexClient:
 
     def _names_match(self, name1: str, name2: str) -> bool:
         """Check if two names match (case-insensitive, normalized)."""
-        if not name1 or not name2:
-            return False
-        n1 = self._normalize_name(name1)
-        n2 = self._normalize_name(name2)
-        return n1 == n2 or n1 in n2 or n2 in n1
+        return names_match(name1, name2)
 
     def _normalize_name(self, name: str) -> str:
         """Normalize a name for comparison."""
-        # Lowercase, remove common variations
-        name = name.lower().strip()
-        # Remove "the " prefix
-        if name.startswith("the "):
-            name = name[4:]
-        # Remove common punctuation
-        for char in ["'", '"', ".", ",", "!", "?", "(", ")", "[", "]"]:
-            name = name.replace(char, "")
-        return name
+        return normalize_name(name)
 
     def _create_match(self, track: Track) -> PlexTrackMatch:
         """Create a PlexTrackMatch from a Plex Track."""
@@ -248,3 +691,119 @@ class PlexClient:
             album=track.parentTitle,
             track=track,
         )
+
+    def _create_match_from_index(self, entry: IndexedTrack) -> PlexTrackMatch:
+        """Create a PlexTrackMatch from a library index entry."""
+        return PlexTrackMatch(
+            rating_key=entry.rating_key,
+            title=entry.title,
+            artist=entry.artist,
+            album=entry.album,
+        )
+
+
+class PlexClientPool:
+    """Shared, thread-safe source of connected Plex clients.
+
+    One server connection and music section handle are kept for the whole
+    process over a keep-alive HTTP session. Clients handed out share them,
+    so jobs don't reconnect or look up the section on every run. The
+    connection is health-checked periodically and re-established if it
+    stops answering.
+    """
+
+    # Seconds between connection health checks
+    HEALTH_CHECK_INTERVAL = 60.0
+
+    # Keep-alive connections held open to the server
+    POOL_CONNECTIONS = 10
+
+    def __init__(
+        self,
+        base_url: str,
+        token: str,
+        music_library: str = "Music",
+        verify_ssl: bool = True,
+        health_check_interval: float | None = None,
+    ):
+        """Initialize the pool.
+
+        Args:
+            base_url: Plex server URL (e.g., http://localhost:32400).
+            token: Plex authentication token.
+            music_library: Name of the music library section.
+            verify_ssl: Whether to verify SSL certificates (default: True).
+            health_check_interval: Seconds between health checks
+                                   (default: HEALTH_CHECK_INTERVAL).
+        """
+        self._base_url = base_url
+        self._token = token
+        self._music_library_name = music_library
+        self._verify_ssl = verify_ssl
+        self._health_check_interval = (
+            health_check_interval
+            if health_check_interval is not None
+            else self.HEALTH_CHECK_INTERVAL
+        )
+        self._lock = threading.Lock()
+        self._session: requests.Session | None = None
+        self._client: PlexClient | None = None
+        self._checked_at = 0.0
+
+    def get_client(self, library_index: PlexLibraryIndex | None = None) -> PlexClient:
+        """Get a client bound to the shared connection.
+
+        Args:
+            library_index: Optional library index for the client to consult.
+
+        Returns:
+            A connected PlexClient.
+        """
+        with self._lock:
+            client = self._get_shared_client()
+            server = client._connect()
+            section = client._get_music_section()
+
+        pooled = PlexClient(
+            self._base_url,
+            self._token,
+            self._music_library_name,
+            self._verify_ssl,
+            library_index=library_index,
+            session=self._session,
+        )
+        pooled._server = server
+        pooled._music_section = section
+        return pooled
+
+    def close(self) -> None:
+        """Close the shared session and drop the connection."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+            self._session = None
+            self._client = None
+
+    def _get_shared_client(self) -> PlexClient:
+        if self._client is None:
+            self._session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=self.POOL_CONNECTIONS,
+                pool_maxsize=self.POOL_CONNECTIONS,
+            )
+            self._session.mount("http://", adapter)
+            self._session.mount("https://", adapter)
+            self._client = PlexClient(
+                self._base_url,
+                self._token,
+                self._music_library_name,
+                self._verify_ssl,
+                session=self._session,
+            )
+            self._checked_at = time.monotonic()
+        elif time.monotonic() - self._checked_at >= self._health_check_interval:
+            if not self._client.ping():
+                logger.info("Reconnecting to Plex server")
+                self._client.reset()
+            self._checked_at = time.monotonic()
+        return self._client
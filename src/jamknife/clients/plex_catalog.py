@@ -0,0 +1,176 @@
+"""SQLite-backed catalog of Plex tracks that survives restarts."""
+
+import logging
+from collections.abc import Callable, Iterable
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from jamknife.clients.plex_index import IndexedTrack
+from jamknife.database import PlexTrack
+from jamknife.matching import normalize_name
+
+logger = logging.getLogger(__name__)
+
+
+class PlexTrackCatalog:
+    """Persistent copy of the Plex library index with full-text search.
+
+    Rows live in the plex_tracks table; plex_tracks_fts (created by
+    migration 002) provides token search over the normalized names.
+    """
+
+    # Rows written per INSERT statement
+    BATCH_SIZE = 1000
+
+    def __init__(self, session_factory: Callable[[], Session]):
+        """Initialize the catalog.
+
+        Args:
+            session_factory: SQLAlchemy session factory.
+        """
+        self._session_factory = session_factory
+
+    def load(self) -> list[IndexedTrack]:
+        """Load every cataloged track."""
+        with self._session_factory() as session:
+            rows = session.execute(select(PlexTrack)).scalars().all()
+            return [self._to_indexed(row) for row in rows]
+
+    def last_rebuilt_at(self) -> datetime | None:
+        """When the catalog was last fully rebuilt.
+
+        A full rebuild rewrites every row, so the oldest indexed_at is the
+        time of the last rebuild.
+        """
+        with self._session_factory() as session:
+            value = session.execute(select(func.min(PlexTrack.indexed_at))).scalar()
+        if value is not None and value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value
+
+    def replace_all(self, entries: Iterable[IndexedTrack]) -> None:
+        """Replace the catalog contents with a full snapshot."""
+        indexed_at = datetime.now(timezone.utc)
+        with self._session_factory() as session:
+            session.execute(delete(PlexTrack))
+            self._insert(session, list(entries), indexed_at)
+            session.commit()
+
+    def upsert(self, entries: Iterable[IndexedTrack]) -> None:
+        """Insert or replace the given tracks."""
+        entries = list(entries)
+        if not entries:
+            return
+
+        indexed_at = datetime.now(timezone.utc)
+        with self._session_factory() as session:
+            keys = [e.rating_key for e in entries]
+            for start in range(0, len(keys), self.BATCH_SIZE):
+                session.execute(
+                    delete(PlexTrack).where(
+                        PlexTrack.rating_key.in_(keys[start : start + self.BATCH_SIZE])
+                    )
+                )
+            self._insert(session, entries, indexed_at)
+            session.commit()
+
+    def search(
+        self, title: str, artist: str | None = None, limit: int = 20
+    ) -> list[IndexedTrack]:
+        """Full-text search for tracks containing every word of title/artist.
+
+        Returns an empty list if the FTS table is unavailable.
+        """
+        query = self._fts_query(title, artist)
+        if not query:
+            return []
+
+        try:
+            with self._session_factory() as session:
+                rowids = [
+                    row[0]
+                    for row in session.execute(
+                        text(
+                            "SELECT rowid FROM plex_tracks_fts "
+                            "WHERE plex_tracks_fts MATCH :query "
+                            "ORDER BY rank LIMIT :limit"
+                        ),
+                        {"query": query, "limit": limit},
+                    )
+                ]
+                if not rowids:
+                    return []
+                rows = (
+                    session.execute(select(PlexTrack).where(PlexTrack.id.in_(rowids)))
+                    .scalars()
+                    .all()
+                )
+                by_id = {row.id: row for row in rows}
+                return [self._to_indexed(by_id[i]) for i in rowids if i in by_id]
+        except OperationalError as e:
+            logger.debug("Plex catalog search failed: %s", e)
+            return []
+
+    def _insert(
+        self, session: Session, entries: list[IndexedTrack], indexed_at: datetime
+    ) -> None:
+        for start in range(0, len(entries), self.BATCH_SIZE):
+            batch = entries[start : start + self.BATCH_SIZE]
+            session.execute(
+                insert(PlexTrack),
+                [self._to_row(entry, indexed_at) for entry in batch],
+            )
+
+    @staticmethod
+    def _fts_query(title: str, artist: str | None) -> str:
+        """Build an FTS5 query requiring every token of title and artist."""
+
+        def column_terms(column: str, value: str | None) -> str | None:
+            tokens = normalize_name(value or "").split()
+            if not tokens:
+                return None
+            quoted = " AND ".join('"{}"'.format(t.replace('"', '""')) for t in tokens)
+            return f"{column} : ({quoted})"
+
+        terms = [
+            t
+            for t in (
+                column_terms("title_norm", title),
+                column_terms("artist_norm", artist),
+            )
+            if t
+        ]
+        return " AND ".join(terms)
+
+    @staticmethod
+    def _to_row(entry: IndexedTrack, indexed_at: datetime) -> dict:
+        return {
+            "rating_key": entry.rating_key,
+            "title": entry.title,
+            "artist": entry.artist,
+            "album": entry.album,
+            "album_artist": entry.album_artist,
+            "title_norm": normalize_name(entry.title),
+            "artist_norm": normalize_name(entry.artist),
+            "album_norm": normalize_name(entry.album) if entry.album else None,
+            "guids": "\n".join(entry.guids) or None,
+            "added_at": entry.added_at,
+            "updated_at": entry.updated_at,
+            "indexed_at": indexed_at,
+        }
+
+    @staticmethod
+    def _to_indexed(row: PlexTrack) -> IndexedTrack:
+        return IndexedTrack(
+            rating_key=row.rating_key,
+            title=row.title,
+            artist=row.artist,
+            album=row.album,
+            album_artist=row.album_artist,
+            added_at=row.added_at,
+            updated_at=row.updated_at,
+            guids=tuple(row.guids.split("\n")) if row.guids else (),
+        )
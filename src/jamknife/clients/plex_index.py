@@ -0,0 +1,418 @@
+"""In-memory index of the Plex music library for local track lookups."""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+
+from plexapi import utils
+from plexapi.audio import Track
+
+from jamknife.matching import names_match, normalize_name
+
+if TYPE_CHECKING:
+    from jamknife.clients.plex_catalog import PlexTrackCatalog
+
+logger = logging.getLogger(__name__)
+
+# Prefix of MusicBrainz GUIDs attached to tracks by Plex agents
+MBID_GUID_PREFIX = "mbid://"
+
+
+@dataclass
+class IndexedTrack:
+    """Lightweight snapshot of a Plex track held in the library index."""
+
+    rating_key: str
+    title: str
+    artist: str
+    album: str | None
+    album_artist: str | None = None
+    added_at: datetime | None = None
+    updated_at: datetime | None = None
+    guids: tuple[str, ...] = ()
+
+    @classmethod
+    def from_plex(cls, track: Track) -> "IndexedTrack":
+        """Create an IndexedTrack from a Plex Track.
+
+        Reads the track's raw XML attributes: tracks from a section crawl
+        are partial objects, and plexapi reloads a partial object from the
+        server whenever one of its attributes is None or [] (e.g.
+        originalTitle, which most tracks don't have, or the guids of a track
+        without any).
+        """
+        attrib = track._data.attrib
+        return cls(
+            rating_key=attrib["ratingKey"],
+            title=attrib.get("title") or "",
+            artist=attrib.get("originalTitle") or attrib.get("grandparentTitle") or "",
+            album=attrib.get("parentTitle"),
+            album_artist=attrib.get("grandparentTitle"),
+            added_at=utils.toDatetime(attrib.get("addedAt")),
+            updated_at=utils.toDatetime(attrib.get("updatedAt")),
+            guids=tuple(
+                guid.attrib["id"]
+                for guid in track._data.findall("Guid")
+                if "id" in guid.attrib
+            ),
+        )
+
+    @property
+    def recording_mbids(self) -> list[str]:
+        """MusicBrainz recording IDs attached to the track by Plex agents."""
+        return [
+            guid.removeprefix(MBID_GUID_PREFIX)
+            for guid in self.guids
+            if guid.startswith(MBID_GUID_PREFIX)
+        ]
+
+    @property
+    def changed_at(self) -> datetime | None:
+        """Most recent of added_at and updated_at."""
+        stamps = [s for s in (self.added_at, self.updated_at) if s is not None]
+        return max(stamps) if stamps else None
+
+
+class PlexLibraryIndex:
+    """Snapshot of a Plex music section keyed by normalized title/artist/album.
+
+    The index answers MusicBrainz ID and exact (normalized) name lookups
+    locally so that the common case of a track already being in the library
+    does not cost any requests to the Plex server. Lookups that miss the
+    index should fall back to the regular network search.
+
+    Once built, the index is kept current with incremental updates that only
+    fetch tracks added or updated since the newest timestamp seen so far.
+    Deleted tracks are only dropped by the periodic full rebuild.
+
+    When a catalog is attached, every change is also written to SQLite so a
+    restart reloads the snapshot from disk instead of re-crawling Plex.
+
+    A single index is meant to be shared by every PlexClient in the process,
+    so all access is guarded by a lock.
+    """
+
+    # Number of items requested per page while crawling the section
+    CONTAINER_SIZE = 1000
+
+    # Overlap applied to the high-water mark, Plex timestamps have 1s resolution
+    HIGH_WATER_MARK_OVERLAP = timedelta(seconds=1)
+
+    def __init__(
+        self,
+        max_age: float | None = None,
+        rebuild_interval: float | None = 7 * 24 * 3600,
+        catalog: "PlexTrackCatalog | None" = None,
+    ):
+        """Initialize an empty index.
+
+        Args:
+            max_age: Seconds after which the snapshot is considered stale and
+                     should be updated incrementally. None means never stale.
+            rebuild_interval: Seconds between full rebuilds, which also drop
+                              tracks deleted from Plex. None disables them.
+            catalog: Optional persistent catalog mirroring the index.
+        """
+        self._max_age = max_age
+        self._rebuild_interval = rebuild_interval
+        self._catalog = catalog
+        self._lock = threading.RLock()
+        self._build_lock = threading.RLock()
+        self._tracks: dict[str, IndexedTrack] = {}
+        self._by_title: dict[str, list[IndexedTrack]] = {}
+        self._by_artist: dict[str, list[IndexedTrack]] = {}
+        self._by_album: dict[str, list[IndexedTrack]] = {}
+        self._by_recording_mbid: dict[str, IndexedTrack] = {}
+        self._loaded_at: float | None = None
+        self._rebuilt_at: float | None = None
+        self._high_water_mark: datetime | None = None
+
+    def __len__(self) -> int:
+        return len(self._tracks)
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the index holds a snapshot of the library."""
+        return self._loaded_at is not None
+
+    @property
+    def is_stale(self) -> bool:
+        """Whether the snapshot is missing or older than max_age."""
+        if self._loaded_at is None:
+            return True
+        if self._max_age is None:
+            return False
+        return time.monotonic() - self._loaded_at > self._max_age
+
+    @property
+    def high_water_mark(self) -> datetime | None:
+        """Newest addedAt/updatedAt timestamp seen in the library."""
+        return self._high_water_mark
+
+    def _needs_rebuild(self) -> bool:
+        """Whether the next refresh should be a full crawl."""
+        if self._rebuilt_at is None or self._high_water_mark is None:
+            return True
+        if self._rebuild_interval is None:
+            return False
+        return time.time() - self._rebuilt_at > self._rebuild_interval
+
+    def rebuild(self, music_section) -> int:
+        """Replace the index contents with a full crawl of a music section.
+
+        Args:
+            music_section: The plexapi music LibrarySection to crawl.
+
+        Returns:
+            Number of tracks indexed.
+        """
+        started = time.monotonic()
+        tracks = music_section.searchTracks(
+            container_size=self.CONTAINER_SIZE, includeGuids=True
+        )
+        entries = [IndexedTrack.from_plex(track) for track in tracks]
+
+        with self._lock:
+            self._clear()
+            self._high_water_mark = None
+            for entry in entries:
+                self._insert(entry)
+            self._loaded_at = time.monotonic()
+            self._rebuilt_at = time.time()
+
+        logger.info(
+            "Indexed %d Plex tracks in %.1fs",
+            len(entries),
+            time.monotonic() - started,
+        )
+
+        if self._catalog is not None:
+            try:
+                self._catalog.replace_all(entries)
+            except Exception as e:
+                logger.warning("Failed to persist Plex track catalog: %s", e)
+
+        return len(entries)
+
+    def update(self, music_section) -> int:
+        """Merge tracks added or updated since the high-water mark.
+
+        Falls back to a full rebuild if the index has no high-water mark yet.
+
+        Args:
+            music_section: The plexapi music LibrarySection to query.
+
+        Returns:
+            Number of tracks added or replaced.
+        """
+        if self._high_water_mark is None:
+            return self.rebuild(music_section)
+
+        since = self._high_water_mark - self.HIGH_WATER_MARK_OVERLAP
+        tracks = music_section.searchTracks(
+            filters={"or": [{"addedAt>>": since}, {"updatedAt>>": since}]},
+            container_size=self.CONTAINER_SIZE,
+            includeGuids=True,
+        )
+        entries = [IndexedTrack.from_plex(track) for track in tracks]
+
+        with self._lock:
+            for entry in entries:
+                self._remove(entry.rating_key)
+                self._insert(entry)
+            self._loaded_at = time.monotonic()
+
+        if entries:
+            logger.info("Merged %d new or updated Plex tracks into index", len(entries))
+            if self._catalog is not None:
+                try:
+                    self._catalog.upsert(entries)
+                except Exception as e:
+                    logger.warning("Failed to update Plex track catalog: %s", e)
+
+        return len(entries)
+
+    def load_from_catalog(self) -> int:
+        """Populate the index from the persistent catalog.
+
+        Returns:
+            Number of tracks loaded (0 if there is no catalog or it is empty).
+        """
+        if self._catalog is None:
+            return 0
+
+        try:
+            entries = self._catalog.load()
+            rebuilt_at = self._catalog.last_rebuilt_at()
+        except Exception as e:
+            logger.warning("Failed to load Plex track catalog: %s", e)
+            return 0
+
+        if not entries:
+            return 0
+
+        with self._lock:
+            self._clear()
+            self._high_water_mark = None
+            for entry in entries:
+                self._insert(entry)
+            self._loaded_at = time.monotonic()
+            self._rebuilt_at = rebuilt_at.timestamp() if rebuilt_at else None
+
+        logger.info("Loaded %d Plex tracks from catalog", len(entries))
+        return len(entries)
+
+    def refresh(self, music_section) -> None:
+        """Bring the index up to date, incrementally where possible.
+
+        Concurrent callers wait for a single crawl rather than each starting
+        their own.
+        """
+        with self._build_lock:
+            if not self.is_loaded:
+                self.load_from_catalog()
+            if self._needs_rebuild():
+                self.rebuild(music_section)
+            else:
+                self.update(music_section)
+
+    def refresh_if_stale(self, music_section) -> None:
+        """Refresh the index if it is stale."""
+        with self._build_lock:
+            if self.is_stale:
+                self.refresh(music_section)
+
+    def add(self, entry: IndexedTrack) -> None:
+        """Add or replace a single track in the index."""
+        with self._lock:
+            self._remove(entry.rating_key)
+            self._insert(entry)
+
+    def remove(self, rating_key: str) -> None:
+        """Remove a track from the index if present."""
+        with self._lock:
+            self._remove(rating_key)
+
+    def get(self, rating_key: str) -> IndexedTrack | None:
+        """Get an indexed track by rating key."""
+        return self._tracks.get(rating_key)
+
+    def find_by_recording_mbid(self, recording_mbid: str) -> IndexedTrack | None:
+        """Find a track by the MusicBrainz recording ID in its Plex GUIDs."""
+        if not recording_mbid:
+            return None
+        return self._by_recording_mbid.get(recording_mbid.lower())
+
+    def find_track(
+        self, title: str, artist: str, album: str | None = None
+    ) -> IndexedTrack | None:
+        """Find a track by title and artist, optionally constrained by album.
+
+        Mirrors the matching rules of PlexClient.search_track, but only
+        considers tracks whose normalized title or artist matches exactly.
+        """
+        with self._lock:
+            # Exact title, fuzzy artist
+            for entry in self._by_title.get(normalize_name(title), ()):
+                if not names_match(entry.artist, artist):
+                    continue
+                if album and entry.album and not names_match(entry.album, album):
+                    continue
+                return entry
+
+            # Exact artist, fuzzy title
+            for entry in self._by_artist.get(normalize_name(artist), ()):
+                if not names_match(entry.title, title):
+                    continue
+                if album and not names_match(entry.album, album):
+                    continue
+                return entry
+
+        return None
+
+    def find_track_on_album(
+        self, album_name: str, track_title: str, artist_name: str | None = None
+    ) -> IndexedTrack | None:
+        """Find a track by album name and title.
+
+        Mirrors the matching rules of PlexClient.search_track_by_album_and_title.
+        """
+        with self._lock:
+            for entry in self._by_album.get(normalize_name(album_name), ()):
+                if artist_name and not names_match(
+                    entry.album_artist or "", artist_name
+                ):
+                    continue
+                if names_match(entry.title, track_title):
+                    return entry
+
+        return None
+
+    def search_catalog(
+        self, title: str, artist: str, album: str | None = None
+    ) -> IndexedTrack | None:
+        """Find a track through the catalog's full-text index.
+
+        Catches tracks whose title carries extra words (e.g. "- Remastered")
+        that the exact lookups in find_track cannot see.
+        """
+        if self._catalog is None:
+            return None
+
+        for entry in self._catalog.search(title, artist):
+            if not names_match(entry.title, title):
+                continue
+            if not names_match(entry.artist, artist):
+                continue
+            if album and entry.album and not names_match(entry.album, album):
+                continue
+            return entry
+
+        return None
+
+    def _clear(self) -> None:
+        self._tracks.clear()
+        self._by_title.clear()
+        self._by_artist.clear()
+        self._by_album.clear()
+        self._by_recording_mbid.clear()
+
+    def _insert(self, entry: IndexedTrack) -> None:
+        self._tracks[entry.rating_key] = entry
+        changed_at = entry.changed_at
+        if changed_at and (
+            self._high_water_mark is None or changed_at > self._high_water_mark
+        ):
+            self._high_water_mark = changed_at
+        self._by_title.setdefault(normalize_name(entry.title), []).append(entry)
+        self._by_artist.setdefault(normalize_name(entry.artist), []).append(entry)
+        if entry.album:
+            self._by_album.setdefault(normalize_name(entry.album), []).append(entry)
+        for mbid in entry.recording_mbids:
+            self._by_recording_mbid[mbid.lower()] = entry
+
+    def _remove(self, rating_key: str) -> None:
+        entry = self._tracks.pop(rating_key, None)
+        if entry is None:
+            return
+        self._discard(self._by_title, normalize_name(entry.title), entry)
+        self._discard(self._by_artist, normalize_name(entry.artist), entry)
+        if entry.album:
+            self._discard(self._by_album, normalize_name(entry.album), entry)
+        for mbid in entry.recording_mbids:
+            if self._by_recording_mbid.get(mbid.lower()) is entry:
+                del self._by_recording_mbid[mbid.lower()]
+
+    @staticmethod
+    def _discard(
+        bucket_map: dict[str, list[IndexedTrack]], key: str, entry: IndexedTrack
+    ) -> None:
+        bucket = bucket_map.get(key)
+        if not bucket:
+            return
+        bucket[:] = [e for e in bucket if e is not entry]
+        if not bucket:
+            del bucket_map[key]
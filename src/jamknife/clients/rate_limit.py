@@ -0,0 +1,171 @@
+"""Adaptive token-bucket rate limiting for external API calls."""
+
+import logging
+import re
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# HTTP statuses that mean the service wants us to slow down
+THROTTLE_STATUSES = (429, 503)
+
+_THROTTLE_MESSAGE = re.compile(r"HTTP (429|503)\b")
+
+
+def is_throttled(error: BaseException) -> bool:
+    """Check whether an exception is a throttling response.
+
+    Recognizes exceptions carrying an HTTP response (requests/httpx) as well
+    as ytmusicapi's YTMusicServerError, which only reports the status in
+    its message.
+    """
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    if status in THROTTLE_STATUSES:
+        return True
+    return bool(_THROTTLE_MESSAGE.search(str(error)))
+
+
+@dataclass
+class RateLimiterMetrics:
+    """Snapshot of a rate limiter's state."""
+
+    rate: float
+    max_rate: float
+    tokens: float
+    queue_depth: int
+    calls: int
+    throttled: int
+    paused_for: float
+
+
+class AdaptiveRateLimiter:
+    """Thread-safe token bucket that backs off when throttled.
+
+    Each call takes one token; tokens refill at the current rate up to the
+    burst size. A throttling response halves the rate and pauses all calls
+    (for Retry-After when given); every successful call then recovers the
+    rate additively towards its configured maximum.
+    """
+
+    def __init__(
+        self,
+        rate: float = 5.0,
+        burst: int = 5,
+        min_rate: float = 0.2,
+        recovery: float = 0.05,
+        backoff: float = 5.0,
+    ):
+        """Initialize the limiter.
+
+        Args:
+            rate: Maximum calls per second.
+            burst: Calls allowed back to back after an idle period.
+            min_rate: Floor the rate never backs off below.
+            recovery: Calls per second regained after each successful call.
+            backoff: Seconds to pause after a throttling response without
+                     a Retry-After.
+        """
+        self._max_rate = rate
+        self._rate = rate
+        self._burst = burst
+        self._min_rate = min(min_rate, rate)
+        self._recovery = recovery
+        self._backoff = backoff
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._waiting = 0
+        self._calls = 0
+        self._throttled = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a call may be made."""
+        with self._lock:
+            self._waiting += 1
+        try:
+            while True:
+                with self._lock:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if now >= self._paused_until and self._tokens >= 1:
+                        self._tokens -= 1
+                        self._calls += 1
+                        return
+                    wait = max(
+                        self._paused_until - now,
+                        (1 - self._tokens) / self._rate,
+                    )
+                time.sleep(wait)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+    def record_success(self) -> None:
+        """Recover some of the rate lost to earlier throttling."""
+        with self._lock:
+            if self._rate < self._max_rate:
+                self._rate = min(self._max_rate, self._rate + self._recovery)
+
+    def record_throttle(self, retry_after: float | None = None) -> None:
+        """Back off after a throttling response."""
+        with self._lock:
+            self._throttled += 1
+            self._rate = max(self._min_rate, self._rate / 2)
+            pause = retry_after if retry_after is not None else self._backoff
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+            self._tokens = 0.0
+            rate = self._rate
+        logger.warning(
+            "Throttled by remote service; backing off to %.2f calls/s for %.0fs",
+            rate,
+            pause,
+        )
+
+    def call(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Call func through the limiter, adapting to throttling errors."""
+        self.acquire()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            if is_throttled(e):
+                self.record_throttle(self._retry_after(e))
+            raise
+        self.record_success()
+        return result
+
+    def metrics(self) -> RateLimiterMetrics:
+        """Get a snapshot of the limiter's state."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            return RateLimiterMetrics(
+                rate=self._rate,
+                max_rate=self._max_rate,
+                tokens=self._tokens,
+                queue_depth=self._waiting,
+                calls=self._calls,
+                throttled=self._throttled,
+                paused_for=max(0.0, self._paused_until - now),
+            )
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._tokens = min(self._burst, self._tokens + elapsed * self._rate)
+
+    @staticmethod
+    def _retry_after(error: BaseException) -> float | None:
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None) or {}
+        try:
+            return float(headers.get("Retry-After"))
+        except (TypeError, ValueError):
+            return None
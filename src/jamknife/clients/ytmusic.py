@@ -1,10 +1,27 @@
 """YouTube Music resolver for finding album URLs."""
 
 import logging
+import queue
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
+import requests
 from ytmusicapi import YTMusic
 
+from jamknife.clients.rate_limit import AdaptiveRateLimiter
+from jamknife.matching import names_match, normalize_name, similarity
+
+if TYPE_CHECKING:
+    from jamknife.clients.ytmusic_cache import (
+        YTMusicAlbumCache,
+        YTMusicArtistCache,
+        YTMusicResolutionCache,
+    )
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,45 +37,235 @@ class AlbumInfo:
     track_count: int | None = None
 
 
+@dataclass
+class AlbumTrack:
+    """A track on a YouTube Music album."""
+
+    video_id: str
+    title: str
+    track_number: int | None = None
+
+
+@dataclass
+class AlbumDetails:
+    """Details of a YouTube Music album as returned by get_album."""
+
+    browse_id: str
+    title: str
+    artist: str
+    audio_playlist_id: str | None = None
+    year: str | None = None
+    track_count: int | None = None
+    # None when the track list wasn't recorded
+    tracks: list[AlbumTrack] | None = None
+
+
+@dataclass
+class ArtistAlbum:
+    """An album listed on a YouTube Music artist page."""
+
+    browse_id: str
+    title: str
+
+
+class _SearchAbandoned(Exception):
+    """Raised in a raced search whose result is no longer needed."""
+
+
+class YTMusicPool:
+    """Thread-safe pool of YTMusic clients shared across sync jobs.
+
+    YTMusic isn't safe to share between threads, so each call checks a
+    client out for its duration. Clients are created on first use, up to
+    the pool size, and then reused along with their HTTP sessions, so
+    parallel lookups don't serialize on one client and new jobs don't pay
+    for setting clients up again. The pool also owns the threads that run
+    raced song searches for every resolver using it.
+    """
+
+    def __init__(self, size: int = 4):
+        """Initialize the pool.
+
+        Args:
+            size: Maximum number of clients, i.e. concurrent calls.
+        """
+        self._size = max(1, size)
+        self._idle: queue.LifoQueue[YTMusic] = queue.LifoQueue()
+        self._sessions: list[requests.Session] = []
+        self._race_executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        """Maximum number of clients in the pool."""
+        return self._size
+
+    @property
+    def race_executor(self) -> ThreadPoolExecutor:
+        """Threads for raced song searches, created on first use."""
+        with self._lock:
+            if self._race_executor is None:
+                self._race_executor = ThreadPoolExecutor(
+                    max_workers=self._size, thread_name_prefix="ytmusic-race"
+                )
+            return self._race_executor
+
+    @contextmanager
+    def client(self) -> Iterator[YTMusic]:
+        """Check out a client, blocking while all of them are busy."""
+        ytm = self._checkout()
+        try:
+            yield ytm
+        finally:
+            self._idle.put(ytm)
+
+    def close(self) -> None:
+        """Stop the race threads and close every client's HTTP session."""
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+            executor, self._race_executor = self._race_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        for session in sessions:
+            session.close()
+
+    def _checkout(self) -> YTMusic:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._sessions) < self._size:
+                session = requests.Session()
+                self._sessions.append(session)
+                return YTMusic(requests_session=session)
+        return self._idle.get()
+
+
 class YTMusicResolver:
     """Resolver for finding YouTube Music album URLs for tracks."""
 
     # YouTube Music album URL format
     ALBUM_URL_TEMPLATE = "https://music.youtube.com/playlist?list={browse_id}"
     BROWSE_URL_TEMPLATE = "https://music.youtube.com/browse/{browse_id}"
+    TRACK_URL_TEMPLATE = "https://music.youtube.com/watch?v={video_id}"
+
+    # Threads running raced song searches for a resolver without a pool
+    RACE_WORKERS = 4
+
+    def __init__(
+        self,
+        cache: "YTMusicResolutionCache | None" = None,
+        album_cache: "YTMusicAlbumCache | None" = None,
+        rate_limiter: AdaptiveRateLimiter | None = None,
+        race_strategies: bool = False,
+        artist_cache: "YTMusicArtistCache | None" = None,
+        pool: YTMusicPool | None = None,
+    ):
+        """Initialize the YouTube Music client.
 
-    def __init__(self):
-        """Initialize the YouTube Music client."""
-        self._ytm = YTMusic()
+        Args:
+            cache: Optional resolution cache consulted before searching.
+            album_cache: Optional album details cache consulted before
+                         fetching an album.
+            rate_limiter: Optional limiter shared by every resolver in the
+                          process; all YouTube Music calls pass through it.
+            race_strategies: Run the album and song searches concurrently
+                             instead of one after the other, on the pool's
+                             race threads (or the resolver's own, which
+                             close() stops).
+            artist_cache: Optional cache of artist searches and album
+                          lists consulted before browsing an artist.
+            pool: Optional pool of clients shared with other resolvers;
+                  without one the resolver uses a client of its own.
+        """
+        self._pool = pool
+        self._ytm = YTMusic() if pool is None else None
+        self._cache = cache
+        self._album_cache = album_cache
+        self._artist_cache = artist_cache
+        self._rate_limiter = rate_limiter
+        self._local = threading.local()
+        self._race_strategies = race_strategies
+        self._own_race_executor: ThreadPoolExecutor | None = None
+
+    def close(self) -> None:
+        """Stop the resolver's own race threads, if it started any."""
+        if self._own_race_executor is not None:
+            self._own_race_executor.shutdown(wait=False, cancel_futures=True)
+            self._own_race_executor = None
+
+    def _race_executor(self) -> ThreadPoolExecutor:
+        """Get the threads raced song searches run on."""
+        if self._pool is not None:
+            return self._pool.race_executor
+        if self._own_race_executor is None:
+            self._own_race_executor = ThreadPoolExecutor(
+                max_workers=self.RACE_WORKERS, thread_name_prefix="ytmusic-race"
+            )
+        return self._own_race_executor
 
     def find_album_for_track(
-        self, track_title: str, artist_name: str, album_name: str | None = None
+        self,
+        track_title: str,
+        artist_name: str,
+        album_name: str | None = None,
+        recording_mbid: str | None = None,
     ) -> AlbumInfo | None:
         """Find the album containing a track on YouTube Music.
 
-        Uses a multi-stage search strategy:
+        Answers from the resolution cache when possible, otherwise uses a
+        multi-stage search strategy:
         1. If album name provided, search for album directly
         2. Search for the song and get its album info
         3. Search for artist and browse albums
 
+        Results are cached, including "not found" unless a search failed.
+
         Args:
             track_title: Title of the track.
             artist_name: Name of the artist.
             album_name: Optional album name for more precise matching.
+            recording_mbid: Optional MusicBrainz recording ID for the cache.
 
         Returns:
             AlbumInfo if found, None otherwise.
         """
-        # Strategy 1: Search for album directly if name is provided
-        if album_name:
-            album = self._search_album(album_name, artist_name)
+        if self._cache is not None:
+            cached = self._cache.get(
+                track_title, artist_name, album_name, recording_mbid
+            )
+            if cached is not None:
+                return cached.album
+
+        self._local.errors = 0
+        album = self._find_album(track_title, artist_name, album_name)
+
+        # Don't remember a miss that may only be a network failure
+        if self._cache is not None and (album or not self._local.errors):
+            self._cache.put(track_title, artist_name, album_name, recording_mbid, album)
+        return album
+
+    def _find_album(
+        self, track_title: str, artist_name: str, album_name: str | None
+    ) -> AlbumInfo | None:
+        if album_name and self._race_strategies:
+            album = self._race_album_and_song_search(
+                track_title, artist_name, album_name
+            )
+            if album:
+                return album
+        else:
+            # Strategy 1: Search for album directly if name is provided
+            if album_name:
+                album = self._search_album(album_name, artist_name)
+                if album:
+                    return album
+
+            # Strategy 2: Search for the song and get album info
+            album = self._search_song_get_album(track_title, artist_name)
             if album:
                 return album
-
-        # Strategy 2: Search for the song and get album info
-        album = self._search_song_get_album(track_title, artist_name)
-        if album:
-            return album
 
         # Strategy 3: Search for artist's discography
         if album_name:
@@ -68,14 +275,52 @@ class YTMusicResolver:
 
         return None
 
+    def _race_album_and_song_search(
+        self, track_title: str, artist_name: str, album_name: str
+    ) -> AlbumInfo | None:
+        """Run strategies 1 and 2 concurrently, preferring strategy 1.
+
+        A miss then costs the slower of the two searches rather than both
+        in turn. When the album search succeeds, the song search is
+        cancelled if it hasn't started, or abandoned before its next call
+        if it has, so it stops using rate limiter tokens and pool clients.
+        """
+        abandoned = threading.Event()
+        song_search = self._race_executor().submit(
+            self._count_errors,
+            abandoned,
+            self._search_song_get_album,
+            track_title,
+            artist_name,
+        )
+        album = self._search_album(album_name, artist_name)
+        if album:
+            abandoned.set()
+            song_search.cancel()
+            return album
+
+        album, errors = song_search.result()
+        self._local.errors = getattr(self._local, "errors", 0) + errors
+        return album
+
+    def _count_errors(self, abandoned: threading.Event, func, *args):
+        """Run a strategy on a worker thread, returning its failed searches."""
+        self._local.errors = 0
+        self._local.abandoned = abandoned
+        try:
+            return func(*args), self._local.errors
+        finally:
+            self._local.abandoned = None
+
     def _search_album(self, album_name: str, artist_name: str) -> AlbumInfo | None:
         """Search for an album by name and artist."""
         try:
             query = f"{artist_name} {album_name}"
-            results = self._ytm.search(query, filter="albums", limit=10)
+            results = self._call("search", query, filter="albums", limit=10)
 
+            candidates = []
             for result in results:
-                if result.get("resultType") != "album":
+                if result.get("resultType") != "album" or not result.get("browseId"):
                     continue
 
                 result_title = result.get("title", "")
@@ -84,11 +329,19 @@ class YTMusicResolver:
                 if self._names_match(result_title, album_name) and self._artist_matches(
                     result_artists, artist_name
                 ):
-                    browse_id = result.get("browseId")
-                    if browse_id:
-                        return self._create_album_info(result, browse_id)
+                    candidates.append(result)
+
+            # Prefer the closest title, e.g. the plain album over its deluxe
+            # edition, keeping YouTube's ranking on ties
+            if candidates:
+                best = max(
+                    candidates,
+                    key=lambda r: similarity(r.get("title", ""), album_name),
+                )
+                return self._create_album_info(best, best["browseId"])
 
         except Exception as e:
+            self._note_error()
             logger.debug("Album search failed for '%s': %s", album_name, e)
 
         return None
@@ -99,7 +352,7 @@ class YTMusicResolver:
         """Search for a song and extract its album information."""
         try:
             query = f"{artist_name} {track_title}"
-            results = self._ytm.search(query, filter="songs", limit=10)
+            results = self._call("search", query, filter="songs", limit=10)
 
             for result in results:
                 if result.get("resultType") != "song":
@@ -117,6 +370,7 @@ class YTMusicResolver:
                         return self._fetch_album_details(album_info.get("id"))
 
         except Exception as e:
+            self._note_error()
             logger.debug("Song search failed for '%s': %s", track_title, e)
 
         return None
@@ -125,74 +379,143 @@ class YTMusicResolver:
         self, artist_name: str, album_name: str
     ) -> AlbumInfo | None:
         """Search for an artist and browse their albums."""
-        try:
-            results = self._ytm.search(artist_name, filter="artists", limit=5)
-
-            for result in results:
-                if result.get("resultType") != "artist":
-                    continue
+        for browse_id in self._find_artist_ids(artist_name):
+            for album in self._get_artist_albums(browse_id):
+                if self._names_match(album.title, album_name):
+                    return self._fetch_album_details(album.browse_id)
 
-                result_name = result.get("artist", "")
-                if not self._names_match(result_name, artist_name):
-                    continue
-
-                browse_id = result.get("browseId")
-                if not browse_id:
-                    continue
-
-                # Get artist's albums
-                try:
-                    artist_data = self._ytm.get_artist(browse_id)
-                    albums_data = artist_data.get("albums", {})
-                    albums = albums_data.get("results", [])
+        return None
 
-                    for album in albums:
-                        if self._names_match(album.get("title", ""), album_name):
-                            album_browse_id = album.get("browseId")
-                            if album_browse_id:
-                                return self._fetch_album_details(album_browse_id)
-                except Exception as e:
-                    logger.debug("Failed to get artist albums: %s", e)
+    def _find_artist_ids(self, artist_name: str) -> list[str]:
+        """Get browse IDs of artists matching a name, using the artist cache."""
+        if self._artist_cache is not None:
+            browse_ids = self._artist_cache.get_artist_ids(artist_name)
+            if browse_ids is not None:
+                return browse_ids
 
+        try:
+            results = self._call("search", artist_name, filter="artists", limit=5)
         except Exception as e:
+            self._note_error()
             logger.debug("Artist search failed for '%s': %s", artist_name, e)
+            return []
+
+        browse_ids = [
+            result["browseId"]
+            for result in results
+            if result.get("resultType") == "artist"
+            and result.get("browseId")
+            and self._names_match(result.get("artist", ""), artist_name)
+        ]
+        if self._artist_cache is not None:
+            self._artist_cache.put_artist_ids(artist_name, browse_ids)
+        return browse_ids
+
+    def _get_artist_albums(self, browse_id: str) -> list[ArtistAlbum]:
+        """Get the albums on an artist's page, using the artist cache."""
+        if self._artist_cache is not None:
+            albums = self._artist_cache.get_albums(browse_id)
+            if albums is not None:
+                return albums
 
-        return None
+        try:
+            artist_data = self._call("get_artist", browse_id)
+        except Exception as e:
+            self._note_error()
+            logger.debug("Failed to get artist albums: %s", e)
+            return []
+
+        albums = [
+            ArtistAlbum(browse_id=album["browseId"], title=album.get("title", ""))
+            for album in artist_data.get("albums", {}).get("results", [])
+            if album.get("browseId")
+        ]
+        if self._artist_cache is not None:
+            self._artist_cache.put_albums(browse_id, albums)
+        return albums
+
+    def get_album_tracks(self, browse_id: str) -> list[AlbumTrack] | None:
+        """Get the tracks of an album, using the album cache.
+
+        Returns:
+            The album's tracks, or None if the album couldn't be fetched.
+        """
+        details = self._get_album_details(browse_id, with_tracks=True)
+        return details.tracks if details else None
+
+    @classmethod
+    def track_url(cls, track: AlbumTrack) -> str:
+        """Get the URL for downloading a single album track."""
+        return cls.TRACK_URL_TEMPLATE.format(video_id=track.video_id)
 
     def _fetch_album_details(self, browse_id: str) -> AlbumInfo | None:
-        """Fetch full album details by browse ID."""
+        """Fetch full album details by browse ID, using the album cache."""
+        details = self._get_album_details(browse_id)
+        return self._album_info_from_details(details) if details else None
+
+    def _get_album_details(
+        self, browse_id: str, with_tracks: bool = False
+    ) -> AlbumDetails | None:
+        """Get album details from the album cache or get_album.
+
+        Cached details without a track list are refetched when with_tracks
+        is set.
+        """
+        if self._album_cache is not None:
+            details = self._album_cache.get(browse_id)
+            if details is not None and (not with_tracks or details.tracks is not None):
+                return details
+
         try:
-            album = self._ytm.get_album(browse_id)
+            album = self._call("get_album", browse_id)
             if not album:
                 return None
 
-            title = album.get("title", "Unknown Album")
             artists = self._get_artist_names(album)
-            artist = artists[0] if artists else "Unknown Artist"
-            year = album.get("year")
-            track_count = album.get("trackCount")
-
-            # Get the playlist ID for the album URL
-            # Albums use OLAK5uy_ format for playlist IDs
-            audio_playlist_id = album.get("audioPlaylistId")
-            if audio_playlist_id:
-                url = self.ALBUM_URL_TEMPLATE.format(browse_id=audio_playlist_id)
-            else:
-                url = self.BROWSE_URL_TEMPLATE.format(browse_id=browse_id)
-
-            return AlbumInfo(
-                album_id=browse_id,
-                title=title,
-                artist=artist,
-                url=url,
-                year=year,
-                track_count=track_count,
+            details = AlbumDetails(
+                browse_id=browse_id,
+                title=album.get("title", "Unknown Album"),
+                artist=artists[0] if artists else "Unknown Artist",
+                # Albums use OLAK5uy_ format for playlist IDs
+                audio_playlist_id=album.get("audioPlaylistId"),
+                year=album.get("year"),
+                track_count=self._get_track_count(album),
+                tracks=[
+                    AlbumTrack(
+                        video_id=track["videoId"],
+                        title=track.get("title", ""),
+                        track_number=track.get("trackNumber"),
+                    )
+                    for track in album.get("tracks") or []
+                    if track.get("videoId")
+                ],
             )
 
         except Exception as e:
+            self._note_error()
             logger.debug("Failed to fetch album details for '%s': %s", browse_id, e)
             return None
 
+        if self._album_cache is not None:
+            self._album_cache.put(details)
+        return details
+
+    def _album_info_from_details(self, details: AlbumDetails) -> AlbumInfo:
+        """Build AlbumInfo, preferring the audio playlist URL for the album."""
+        if details.audio_playlist_id:
+            url = self.ALBUM_URL_TEMPLATE.format(browse_id=details.audio_playlist_id)
+        else:
+            url = self.BROWSE_URL_TEMPLATE.format(browse_id=details.browse_id)
+
+        return AlbumInfo(
+            album_id=details.browse_id,
+            title=details.title,
+            artist=details.artist,
+            url=url,
+            year=details.year,
+            track_count=details.track_count,
+        )
+
     def _create_album_info(self, result: dict, browse_id: str) -> AlbumInfo:
         """Create AlbumInfo from search result."""
         title = result.get("title", "Unknown Album")
@@ -200,6 +523,19 @@ class YTMusicResolver:
         artist = artists[0] if artists else "Unknown Artist"
         year = result.get("year")
 
+        # Album search results usually carry the audio playlist ID already,
+        # so the album only needs fetching when it's missing
+        playlist_id = result.get("playlistId")
+        if playlist_id:
+            return AlbumInfo(
+                album_id=browse_id,
+                title=title,
+                artist=artist,
+                url=self.ALBUM_URL_TEMPLATE.format(browse_id=playlist_id),
+                year=year,
+                track_count=self._get_track_count(result),
+            )
+
         # Fetch full details to get the audio playlist ID
         full_album = self._fetch_album_details(browse_id)
         if full_album:
@@ -241,37 +577,42 @@ class YTMusicResolver:
 
         return artists
 
+    def _get_track_count(self, data: dict) -> int | None:
+        """Extract the track count, given as a number or as text like "12 songs"."""
+        count = data.get("trackCount")
+        if isinstance(count, str):
+            digits = count.split(" ")[0].replace(",", "")
+            return int(digits) if digits.isdigit() else None
+        return count
+
+    def _call(self, method: str, *args, **kwargs):
+        """Call a YTMusic method through the shared rate limiter, if any."""
+        abandoned = getattr(self._local, "abandoned", None)
+        if abandoned is not None and abandoned.is_set():
+            raise _SearchAbandoned(method)
+        if self._rate_limiter is None:
+            return self._invoke(method, *args, **kwargs)
+        return self._rate_limiter.call(self._invoke, method, *args, **kwargs)
+
+    def _invoke(self, method: str, *args, **kwargs):
+        """Call a YTMusic method on a pooled client, or the resolver's own."""
+        if self._pool is None:
+            return getattr(self._ytm, method)(*args, **kwargs)
+        with self._pool.client() as ytm:
+            return getattr(ytm, method)(*args, **kwargs)
+
+    def _note_error(self) -> None:
+        """Count a failed search for the current lookup."""
+        self._local.errors = getattr(self._local, "errors", 0) + 1
+
     def _names_match(self, name1: str, name2: str) -> bool:
         """Check if two names match (case-insensitive, normalized)."""
-        if not name1 or not name2:
-            return False
-        n1 = self._normalize_name(name1)
-        n2 = self._normalize_name(name2)
-        # Check exact match or containment
-        return n1 == n2 or n1 in n2 or n2 in n1
+        return names_match(name1, name2)
 
     def _artist_matches(self, artists: list[str], target: str) -> bool:
         """Check if any artist in the list matches the target."""
-        target_norm = self._normalize_name(target)
-        for artist in artists:
-            artist_norm = self._normalize_name(artist)
-            if (
-                artist_norm == target_norm
-                or artist_norm in target_norm
-                or target_norm in artist_norm
-            ):
-                return True
-        return False
+        return any(names_match(artist, target) for artist in artists)
 
     def _normalize_name(self, name: str) -> str:
         """Normalize a name for comparison."""
-        name = name.lower().strip()
-        # Remove "the " prefix
-        if name.startswith("the "):
-            name = name[4:]
-        # Remove common punctuation
-        for char in ["'", '"', ".", ",", "!", "?", "(", ")", "[", "]", "-", ":"]:
-            name = name.replace(char, "")
-        # Normalize whitespace
-        name = " ".join(name.split())
-        return name
+        return normalize_name(name)
@@ -0,0 +1,492 @@
+"""Persistent caches of YouTube Music lookups."""
+
+import json
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, or_, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from jamknife.clients.ytmusic import AlbumDetails, AlbumInfo, AlbumTrack, ArtistAlbum
+from jamknife.database import (
+    YTMusicAlbum,
+    YTMusicArtist,
+    YTMusicArtistSearch,
+    YTMusicResolution,
+)
+from jamknife.matching import normalize_name
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedResolution:
+    """A cached lookup result; album is None for a cached "not found"."""
+
+    album: AlbumInfo | None
+    resolved_at: datetime
+    recording_mbid: str | None = None
+
+    @property
+    def found(self) -> bool:
+        """Whether the lookup found an album."""
+        return self.album is not None
+
+
+class YTMusicResolutionCache:
+    """Cache of find_album_for_track results keyed by MBID and query.
+
+    Entries are looked up by recording MBID first, then by the normalized
+    (title, artist, album) query. Albums that were found and lookups that
+    found nothing expire after separate TTLs.
+
+    Writes are buffered in memory and persisted by flush(), so worker
+    threads resolving tracks never contend with the sync job's database
+    transaction.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        ttl: float = 30 * 24 * 3600,
+        negative_ttl: float = 7 * 24 * 3600,
+    ):
+        """Initialize the cache.
+
+        Args:
+            session_factory: SQLAlchemy session factory.
+            ttl: Seconds a found album stays valid.
+            negative_ttl: Seconds a "not found" result stays valid.
+        """
+        self._session_factory = session_factory
+        self._ttl = timedelta(seconds=ttl)
+        self._negative_ttl = timedelta(seconds=negative_ttl)
+        self._lock = threading.Lock()
+        self._entries: dict[str, CachedResolution] = {}
+        self._pending: dict[str, CachedResolution] = {}
+
+    @staticmethod
+    def query_key(title: str, artist: str, album: str | None = None) -> str:
+        """Build the normalized query key for a lookup."""
+        return "|".join(normalize_name(part or "") for part in (title, artist, album))
+
+    def get(
+        self,
+        title: str,
+        artist: str,
+        album: str | None = None,
+        recording_mbid: str | None = None,
+    ) -> CachedResolution | None:
+        """Get a fresh cached resolution, or None if the lookup must run."""
+        key = self.query_key(title, artist, album)
+        with self._lock:
+            for memory_key in self._memory_keys(key, recording_mbid):
+                entry = self._entries.get(memory_key)
+                if entry is not None and self._is_fresh(entry):
+                    return entry
+
+        try:
+            entry = self._load(key, recording_mbid)
+        except SQLAlchemyError as e:
+            logger.debug("YouTube Music cache lookup failed: %s", e)
+            return None
+        if entry is None or not self._is_fresh(entry):
+            return None
+
+        with self._lock:
+            for memory_key in self._memory_keys(key, entry.recording_mbid):
+                self._entries[memory_key] = entry
+        return entry
+
+    def put(
+        self,
+        title: str,
+        artist: str,
+        album: str | None,
+        recording_mbid: str | None,
+        album_info: AlbumInfo | None,
+    ) -> None:
+        """Record a resolution; it is persisted on the next flush()."""
+        key = self.query_key(title, artist, album)
+        entry = CachedResolution(
+            album=album_info,
+            resolved_at=datetime.now(timezone.utc),
+            recording_mbid=recording_mbid,
+        )
+        with self._lock:
+            for memory_key in self._memory_keys(key, recording_mbid):
+                self._entries[memory_key] = entry
+            self._pending[key] = entry
+
+    def flush(self) -> int:
+        """Persist buffered resolutions.
+
+        Returns:
+            Number of entries written; failed writes stay buffered.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        try:
+            with self._session_factory() as session:
+                mbids = [e.recording_mbid for e in pending.values() if e.recording_mbid]
+                session.execute(
+                    delete(YTMusicResolution).where(
+                        or_(
+                            YTMusicResolution.query_key.in_(list(pending)),
+                            YTMusicResolution.recording_mbid.in_(mbids),
+                        )
+                    )
+                )
+                session.add_all(
+                    self._to_row(key, entry) for key, entry in pending.items()
+                )
+                session.commit()
+        except SQLAlchemyError as e:
+            logger.warning("Failed to persist YouTube Music cache: %s", e)
+            with self._lock:
+                for key, entry in pending.items():
+                    self._pending.setdefault(key, entry)
+            return 0
+
+        return len(pending)
+
+    def _load(self, key: str, recording_mbid: str | None) -> CachedResolution | None:
+        condition = YTMusicResolution.query_key == key
+        if recording_mbid:
+            condition = or_(
+                condition, YTMusicResolution.recording_mbid == recording_mbid
+            )
+
+        with self._session_factory() as session:
+            rows = session.execute(select(YTMusicResolution).where(condition)).scalars()
+            # Prefer the row for this exact recording over a same-name query
+            best = None
+            for row in rows:
+                if recording_mbid and row.recording_mbid == recording_mbid:
+                    best = row
+                    break
+                best = best or row
+            return self._to_entry(best) if best else None
+
+    def _is_fresh(self, entry: CachedResolution) -> bool:
+        ttl = self._ttl if entry.found else self._negative_ttl
+        return datetime.now(timezone.utc) - entry.resolved_at < ttl
+
+    @staticmethod
+    def _memory_keys(key: str, recording_mbid: str | None) -> list[str]:
+        keys = [f"query:{key}"]
+        if recording_mbid:
+            keys.insert(0, f"mbid:{recording_mbid}")
+        return keys
+
+    @staticmethod
+    def _to_row(key: str, entry: CachedResolution) -> YTMusicResolution:
+        album = entry.album
+        return YTMusicResolution(
+            recording_mbid=entry.recording_mbid,
+            query_key=key,
+            found=album is not None,
+            album_id=album.album_id if album else None,
+            album_title=album.title if album else None,
+            album_artist=album.artist if album else None,
+            album_url=album.url if album else None,
+            year=album.year if album else None,
+            track_count=album.track_count if album else None,
+            resolved_at=entry.resolved_at,
+        )
+
+    @staticmethod
+    def _to_entry(row: YTMusicResolution) -> CachedResolution:
+        resolved_at = row.resolved_at
+        if resolved_at.tzinfo is None:
+            resolved_at = resolved_at.replace(tzinfo=timezone.utc)
+        album = (
+            AlbumInfo(
+                album_id=row.album_id,
+                title=row.album_title,
+                artist=row.album_artist,
+                url=row.album_url,
+                year=row.year,
+                track_count=row.track_count,
+            )
+            if row.found
+            else None
+        )
+        return CachedResolution(
+            album=album, resolved_at=resolved_at, recording_mbid=row.recording_mbid
+        )
+
+
+class YTMusicAlbumCache:
+    """LRU of album details backed by the ytmusic_albums table.
+
+    Album details don't change once published, so entries never expire;
+    the in-memory LRU only bounds memory use. Like the resolution cache,
+    new entries are written to the database by flush().
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], max_size: int = 1024):
+        """Initialize the cache.
+
+        Args:
+            session_factory: SQLAlchemy session factory.
+            max_size: Albums kept in memory.
+        """
+        self._session_factory = session_factory
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, AlbumDetails] = OrderedDict()
+        self._pending: dict[str, AlbumDetails] = {}
+
+    def get(self, browse_id: str) -> AlbumDetails | None:
+        """Get cached details for an album, or None if it must be fetched."""
+        with self._lock:
+            details = self._entries.get(browse_id)
+            if details is not None:
+                self._entries.move_to_end(browse_id)
+                return details
+
+        try:
+            with self._session_factory() as session:
+                row = session.execute(
+                    select(YTMusicAlbum).where(YTMusicAlbum.browse_id == browse_id)
+                ).scalar_one_or_none()
+                details = self._to_details(row) if row else None
+        except SQLAlchemyError as e:
+            logger.debug("YouTube Music album cache lookup failed: %s", e)
+            return None
+
+        if details is not None:
+            with self._lock:
+                self._remember(details)
+        return details
+
+    def put(self, details: AlbumDetails) -> None:
+        """Record fetched details; they are persisted on the next flush()."""
+        with self._lock:
+            self._remember(details)
+            self._pending[details.browse_id] = details
+
+    def flush(self) -> int:
+        """Persist buffered album details.
+
+        Returns:
+            Number of albums written; failed writes stay buffered.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        try:
+            with self._session_factory() as session:
+                session.execute(
+                    delete(YTMusicAlbum).where(
+                        YTMusicAlbum.browse_id.in_(list(pending))
+                    )
+                )
+                session.add_all(self._to_row(d) for d in pending.values())
+                session.commit()
+        except SQLAlchemyError as e:
+            logger.warning("Failed to persist YouTube Music album cache: %s", e)
+            with self._lock:
+                for browse_id, details in pending.items():
+                    self._pending.setdefault(browse_id, details)
+            return 0
+
+        return len(pending)
+
+    def _remember(self, details: AlbumDetails) -> None:
+        self._entries[details.browse_id] = details
+        self._entries.move_to_end(details.browse_id)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    @staticmethod
+    def _to_row(details: AlbumDetails) -> YTMusicAlbum:
+        return YTMusicAlbum(
+            browse_id=details.browse_id,
+            title=details.title,
+            artist=details.artist,
+            audio_playlist_id=details.audio_playlist_id,
+            year=details.year,
+            track_count=details.track_count,
+            tracks=(
+                json.dumps([asdict(track) for track in details.tracks])
+                if details.tracks is not None
+                else None
+            ),
+        )
+
+    @staticmethod
+    def _to_details(row: YTMusicAlbum) -> AlbumDetails:
+        return AlbumDetails(
+            browse_id=row.browse_id,
+            title=row.title,
+            artist=row.artist,
+            audio_playlist_id=row.audio_playlist_id,
+            year=row.year,
+            track_count=row.track_count,
+            tracks=(
+                [AlbumTrack(**track) for track in json.loads(row.tracks)]
+                if row.tracks is not None
+                else None
+            ),
+        )
+
+
+class YTMusicArtistCache:
+    """Cache of artist searches and artist album lists.
+
+    Artist search results (normalized name to matching browse IDs) and the
+    albums on each artist's page are kept in memory and in the database,
+    and both expire after the same TTL so new releases are picked up.
+    Like the other caches, new entries are written by flush().
+    """
+
+    def __init__(
+        self, session_factory: Callable[[], Session], ttl: float = 7 * 24 * 3600
+    ):
+        """Initialize the cache.
+
+        Args:
+            session_factory: SQLAlchemy session factory.
+            ttl: Seconds an artist search or album list stays valid.
+        """
+        self._session_factory = session_factory
+        self._ttl = timedelta(seconds=ttl)
+        self._lock = threading.Lock()
+        self._artist_ids: dict[str, tuple[list[str], datetime]] = {}
+        self._albums: dict[str, tuple[list[ArtistAlbum], datetime]] = {}
+        self._pending_artist_ids: dict[str, tuple[list[str], datetime]] = {}
+        self._pending_albums: dict[str, tuple[list[ArtistAlbum], datetime]] = {}
+
+    def get_artist_ids(self, artist_name: str) -> list[str] | None:
+        """Get browse IDs of artists matching a name, or None if unknown."""
+        key = normalize_name(artist_name)
+        with self._lock:
+            entry = self._artist_ids.get(key)
+        if entry is None:
+            entry = self._load(
+                YTMusicArtistSearch,
+                YTMusicArtistSearch.name_key == key,
+                lambda row: row.browse_ids.split("\n") if row.browse_ids else [],
+            )
+            if entry is None:
+                return None
+            with self._lock:
+                self._artist_ids[key] = entry
+        return entry[0] if self._is_fresh(entry[1]) else None
+
+    def put_artist_ids(self, artist_name: str, browse_ids: list[str]) -> None:
+        """Record an artist search; it is persisted on the next flush()."""
+        key = normalize_name(artist_name)
+        entry = (list(browse_ids), datetime.now(timezone.utc))
+        with self._lock:
+            self._artist_ids[key] = entry
+            self._pending_artist_ids[key] = entry
+
+    def get_albums(self, browse_id: str) -> list[ArtistAlbum] | None:
+        """Get the albums on an artist's page, or None if unknown."""
+        with self._lock:
+            entry = self._albums.get(browse_id)
+        if entry is None:
+            entry = self._load(
+                YTMusicArtist,
+                YTMusicArtist.browse_id == browse_id,
+                lambda row: [ArtistAlbum(**album) for album in json.loads(row.albums)],
+            )
+            if entry is None:
+                return None
+            with self._lock:
+                self._albums[browse_id] = entry
+        return entry[0] if self._is_fresh(entry[1]) else None
+
+    def put_albums(self, browse_id: str, albums: list[ArtistAlbum]) -> None:
+        """Record an artist's albums; they are persisted on the next flush()."""
+        entry = (list(albums), datetime.now(timezone.utc))
+        with self._lock:
+            self._albums[browse_id] = entry
+            self._pending_albums[browse_id] = entry
+
+    def flush(self) -> int:
+        """Persist buffered artist searches and album lists.
+
+        Returns:
+            Number of entries written; failed writes stay buffered.
+        """
+        with self._lock:
+            artist_ids, self._pending_artist_ids = self._pending_artist_ids, {}
+            albums, self._pending_albums = self._pending_albums, {}
+        if not artist_ids and not albums:
+            return 0
+
+        try:
+            with self._session_factory() as session:
+                session.execute(
+                    delete(YTMusicArtistSearch).where(
+                        YTMusicArtistSearch.name_key.in_(list(artist_ids))
+                    )
+                )
+                session.execute(
+                    delete(YTMusicArtist).where(
+                        YTMusicArtist.browse_id.in_(list(albums))
+                    )
+                )
+                session.add_all(
+                    YTMusicArtistSearch(
+                        name_key=key, browse_ids="\n".join(ids), fetched_at=fetched_at
+                    )
+                    for key, (ids, fetched_at) in artist_ids.items()
+                )
+                session.add_all(
+                    YTMusicArtist(
+                        browse_id=browse_id,
+                        albums=json.dumps(
+                            [
+                                {"browse_id": a.browse_id, "title": a.title}
+                                for a in artist_albums
+                            ]
+                        ),
+                        fetched_at=fetched_at,
+                    )
+                    for browse_id, (artist_albums, fetched_at) in albums.items()
+                )
+                session.commit()
+        except SQLAlchemyError as e:
+            logger.warning("Failed to persist YouTube Music artist cache: %s", e)
+            with self._lock:
+                for key, entry in artist_ids.items():
+                    self._pending_artist_ids.setdefault(key, entry)
+                for browse_id, entry in albums.items():
+                    self._pending_albums.setdefault(browse_id, entry)
+            return 0
+
+        return len(artist_ids) + len(albums)
+
+    def _load(self, model, condition, decode):
+        try:
+            with self._session_factory() as session:
+                row = session.execute(
+                    select(model).where(condition)
+                ).scalar_one_or_none()
+                if row is None:
+                    return None
+                fetched_at = row.fetched_at
+                if fetched_at.tzinfo is None:
+                    fetched_at = fetched_at.replace(tzinfo=timezone.utc)
+                return decode(row), fetched_at
+        except (SQLAlchemyError, ValueError, TypeError) as e:
+            logger.debug("YouTube Music artist cache lookup failed: %s", e)
+            return None
+
+    def _is_fresh(self, fetched_at: datetime) -> bool:
+        return datetime.now(timezone.utc) - fetched_at < self._ttl
@@ -1,7 +1,12 @@
 """Yubal API client for submitting download jobs."""
 
+import json
 import logging
-from dataclasses import dataclass
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from enum import StrEnum
 
 import httpx
@@ -61,9 +66,68 @@ class Job:
     completed_at: str | None = None
 
 
+@dataclass
+class JobEvent:
+    """A change pushed by Yubal's job event stream."""
+
+    # Jobs created or updated
+    jobs: list[Job] = field(default_factory=list)
+    # IDs of jobs that were deleted
+    deleted: list[str] = field(default_factory=list)
+    # Whether jobs is the complete job list, replacing what was known
+    replace: bool = False
+
+
+class YubalSnapshot:
+    """Point-in-time view of Yubal's jobs, indexed by ID and URL.
+
+    Taken once per scheduling pass so queue checks and duplicate lookups
+    don't each download the job list. Jobs created during the pass should
+    be add()ed so later lookups in the same pass see them.
+    """
+
+    def __init__(self, jobs: Iterable[Job]):
+        """Index a job list (oldest first, as returned by list_jobs)."""
+        self.taken_at = time.monotonic()
+        self._by_id: dict[str, Job] = {}
+        self._by_url: dict[str, Job] = {}
+        for job in jobs:
+            self.add(job)
+
+    @property
+    def jobs(self) -> list[Job]:
+        """All jobs in the snapshot."""
+        return list(self._by_id.values())
+
+    @property
+    def active_count(self) -> int:
+        """Number of jobs queued or running in Yubal."""
+        return sum(1 for job in self._by_id.values() if job.status.is_active)
+
+    def add(self, job: Job) -> None:
+        """Record a job, replacing any earlier job with the same ID or URL."""
+        self._by_id[job.id] = job
+        self._by_url[job.url] = job
+
+    def get(self, job_id: str) -> Job | None:
+        """Get a job by ID."""
+        return self._by_id.get(job_id)
+
+    def find_by_url(self, url: str) -> Job | None:
+        """Get the most recent job for a URL."""
+        return self._by_url.get(url)
+
+
 class YubalClient:
     """Client for the Yubal download API."""
 
+    # Server-sent events stream of job changes, where Yubal offers one
+    EVENTS_ENDPOINT = "/jobs/events"
+
+    # Seconds without any event (or keep-alive) before the stream is
+    # considered dead and should be reopened
+    EVENTS_IDLE_TIMEOUT = 300.0
+
     def __init__(self, base_url: str, timeout: float = 30.0):
         """Initialize the Yubal client.
 
@@ -116,7 +180,9 @@ class YubalClient:
             max_items: Optional maximum number of tracks to download.
 
         Returns:
-            The created Job object.
+            The created Job object. When Yubal only returns the new job's
+            ID, the job is reported as pending rather than listing every
+            job to look it up.
 
         Raises:
             httpx.HTTPStatusError: If the request fails (e.g., 409 for queue full).
@@ -128,10 +194,10 @@ class YubalClient:
             data["max_items"] = max_items
 
         response = self._post("/jobs", data)
-        job_id = response.get("id")
+        if "url" in response:
+            return self._parse_job(response)
 
-        # The create endpoint only returns the ID, fetch full job details
-        return self.get_job(job_id)
+        return Job(id=response["id"], url=url, status=JobStatus.PENDING, progress=0.0)
 
     def get_job(self, job_id: str) -> Job:
         """Get the status of a download job.
@@ -143,11 +209,10 @@ class YubalClient:
             The Job object with current status.
         """
         # Jobs are returned via list endpoint, no individual get
-        jobs = self.list_jobs()
-        for job in jobs:
-            if job.id == job_id:
-                return job
-        raise ValueError(f"Job not found: {job_id}")
+        job = self.snapshot().get(job_id)
+        if job is None:
+            raise ValueError(f"Job not found: {job_id}")
+        return job
 
     def list_jobs(self) -> list[Job]:
         """List all jobs.
@@ -161,6 +226,85 @@ class YubalClient:
             jobs.append(self._parse_job(job_data))
         return jobs
 
+    def snapshot(self) -> YubalSnapshot:
+        """List all jobs once and index them by ID and URL."""
+        return YubalSnapshot(self.list_jobs())
+
+    @contextmanager
+    def subscribe_jobs(self) -> Iterator[Iterator[JobEvent] | None]:
+        """Open Yubal's job event stream.
+
+        The stream is server-sent events: "job" events carry a job
+        object, "deleted" events carry {"id": ...} and "snapshot" events
+        carry {"jobs": [...]}. Unknown events and keep-alive comments are
+        skipped.
+
+        Yields:
+            An iterator of JobEvents that ends when the server closes the
+            stream, or None if the server doesn't offer job events (so the
+            caller should poll list_jobs instead).
+
+        Raises:
+            httpx.HTTPError: If the stream can't be opened or breaks.
+        """
+        url = f"{self._base_url}{self.EVENTS_ENDPOINT}"
+        timeout = httpx.Timeout(self._timeout, read=self.EVENTS_IDLE_TIMEOUT)
+        with self._client.stream(
+            "GET", url, headers={"Accept": "text/event-stream"}, timeout=timeout
+        ) as response:
+            if response.status_code in (404, 405, 501):
+                yield None
+                return
+            response.raise_for_status()
+            content_type = response.headers.get("content-type", "")
+            if not content_type.startswith("text/event-stream"):
+                yield None
+                return
+            yield self._parse_events(response.iter_lines())
+
+    def _parse_events(self, lines: Iterable[str]) -> Iterator[JobEvent]:
+        """Parse server-sent event lines into JobEvents."""
+        event_type = "message"
+        data_lines: list[str] = []
+        for line in lines:
+            if line.startswith(":"):
+                continue
+            if line:
+                name, _, value = line.partition(":")
+                value = value.removeprefix(" ")
+                if name == "event":
+                    event_type = value
+                elif name == "data":
+                    data_lines.append(value)
+                continue
+
+            # A blank line dispatches the event
+            if data_lines:
+                event = self._parse_event(event_type, "\n".join(data_lines))
+                if event is not None:
+                    yield event
+            event_type = "message"
+            data_lines = []
+
+    def _parse_event(self, event_type: str, data: str) -> JobEvent | None:
+        """Parse one event's data, or return None to skip it."""
+        try:
+            payload = json.loads(data)
+        except json.JSONDecodeError:
+            logger.debug("Skipping malformed Yubal event: %s", data)
+            return None
+        if not isinstance(payload, dict):
+            return None
+
+        if event_type == "deleted":
+            return JobEvent(deleted=[payload["id"]]) if "id" in payload else None
+        if event_type == "snapshot" or "jobs" in payload:
+            jobs = [self._parse_job(job) for job in payload.get("jobs", [])]
+            return JobEvent(jobs=jobs, replace=True)
+        if event_type in ("job", "message") and "url" in payload:
+            return JobEvent(jobs=[self._parse_job(payload)])
+        return None
+
     def cancel_job(self, job_id: str) -> None:
         """Cancel a running or queued job.
 
@@ -248,3 +392,182 @@ class YubalClient:
 
     def __exit__(self, *args) -> None:
         self.close()
+
+
+class YubalJobFeed:
+    """Live view of Yubal's jobs, kept current by server-pushed events.
+
+    A background thread subscribes to Yubal's job events, seeds the view
+    with one job listing once connected and applies every event after
+    that. While the feed is live, snapshot() replaces listing all jobs;
+    when the server doesn't offer events or the stream breaks, snapshot()
+    returns None so callers fall back to polling, and the feed keeps
+    trying to reconnect in the background.
+    """
+
+    # Seconds before reconnecting after the stream broke, doubled for
+    # every further failure in a row
+    RECONNECT_INTERVAL = 5.0
+
+    # Seconds between checks whether a server without job events has
+    # started offering them
+    UNSUPPORTED_RETRY_INTERVAL = 600.0
+
+    def __init__(
+        self,
+        base_url: str,
+        on_change: Callable[[], None] | None = None,
+        reconnect_interval: float = RECONNECT_INTERVAL,
+        unsupported_retry_interval: float = UNSUPPORTED_RETRY_INTERVAL,
+    ):
+        """Initialize the feed.
+
+        Args:
+            base_url: Base URL of the Yubal server.
+            on_change: Called (from the feed's thread) when a job appears,
+                       changes status or is deleted, and when the feed
+                       goes live. Progress-only updates don't call it.
+            reconnect_interval: Seconds to wait before reconnecting after
+                                the stream broke.
+            unsupported_retry_interval: Seconds to wait before checking
+                                        again for a server without events;
+                                        also caps reconnect backoff.
+        """
+        self._base_url = base_url
+        self._on_change = on_change
+        self._reconnect_interval = reconnect_interval
+        self._unsupported_retry_interval = unsupported_retry_interval
+        self._jobs: dict[str, Job] = {}
+        self._live = False
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._failures = 0
+        self._client: YubalClient | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def live(self) -> bool:
+        """Whether job events are currently being received."""
+        return self._live
+
+    def snapshot(self) -> YubalSnapshot | None:
+        """Get the current jobs, or None if the feed isn't live."""
+        with self._lock:
+            if not self._live:
+                return None
+            return YubalSnapshot(list(self._jobs.values()))
+
+    def start(self) -> None:
+        """Start following job events in a background thread."""
+        if self._thread is not None:
+            return
+        # Each run gets its own event, so a thread still finishing a read
+        # after stop() can't be revived by a later start()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(self._stopped,), name="yubal-job-feed", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop following job events.
+
+        Doesn't wait for the thread: a read blocked on an idle stream only
+        returns once the server sends something or the connection drops,
+        and the thread exits then.
+        """
+        self._stopped.set()
+        client = self._client
+        if client is not None:
+            client.close()
+        self._thread = None
+        self._set_live(False)
+
+    def _run(self, stopped: threading.Event) -> None:
+        while not stopped.is_set():
+            client = YubalClient(self._base_url)
+            self._client = client
+            try:
+                supported = self._follow(client, stopped)
+            except Exception as e:
+                if not stopped.is_set():
+                    logger.warning("Yubal job events interrupted: %s", e)
+                supported = True
+            finally:
+                self._client = None
+                client.close()
+                self._set_live(False)
+
+            if supported:
+                wait = min(
+                    self._unsupported_retry_interval,
+                    self._reconnect_interval * 2 ** min(self._failures, 10),
+                )
+                self._failures += 1
+            else:
+                logger.info("Yubal doesn't offer job events; polling for job status")
+                wait = self._unsupported_retry_interval
+            stopped.wait(wait)
+
+    def _follow(self, client: YubalClient, stopped: threading.Event) -> bool:
+        """Follow the event stream until it ends or the feed is stopped.
+
+        Returns:
+            False if the server doesn't offer job events.
+        """
+        with client.subscribe_jobs() as events:
+            if events is None:
+                return False
+
+            # Listed after subscribing, so no change can fall in between
+            jobs = client.list_jobs()
+            with self._lock:
+                self._jobs = {job.id: job for job in jobs}
+            if stopped.is_set():
+                return True
+            self._failures = 0
+            self._set_live(True)
+            logger.info("Following Yubal job events")
+
+            for event in events:
+                if stopped.is_set():
+                    break
+                if self._apply(event):
+                    self._notify()
+        return True
+
+    def _apply(self, event: JobEvent) -> bool:
+        """Apply an event, returning whether any job appeared or changed status."""
+        changed = False
+        with self._lock:
+            if event.replace:
+                changed = {job.id: job.status for job in event.jobs} != {
+                    job.id: job.status for job in self._jobs.values()
+                }
+                self._jobs = {}
+            for job in event.jobs:
+                previous = self._jobs.get(job.id)
+                if not event.replace and (
+                    previous is None or previous.status != job.status
+                ):
+                    changed = True
+                self._jobs[job.id] = job
+            for job_id in event.deleted:
+                if self._jobs.pop(job_id, None) is not None:
+                    changed = True
+        return changed
+
+    def _set_live(self, live: bool) -> None:
+        with self._lock:
+            was_live = self._live
+            self._live = live
+        if live and not was_live:
+            self._notify()
+
+    def _notify(self) -> None:
+        if self._on_change is None:
+            return
+        try:
+            self._on_change()
+        except Exception as e:
+            logger.warning("Yubal job feed listener failed: %s", e)
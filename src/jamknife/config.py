@@ -29,11 +29,64 @@ class Config:
         default_factory=lambda: os.environ.get("PLEX_VERIFY_SSL", "true").lower()
         == "true"
     )
+    plex_index_enabled: bool = field(
+        default_factory=lambda: os.environ.get("PLEX_INDEX_ENABLED", "true").lower()
+        == "true"
+    )
+    plex_index_max_age: int = field(
+        default_factory=lambda: int(os.environ.get("PLEX_INDEX_MAX_AGE", "21600"))
+    )
+    plex_scan_timeout: int = field(
+        default_factory=lambda: int(os.environ.get("PLEX_SCAN_TIMEOUT", "600"))
+    )
+    plex_downloads_dir: str = field(
+        default_factory=lambda: os.environ.get("PLEX_DOWNLOADS_DIR", "")
+    )
+    plex_scan_coalesce_window: float = field(
+        default_factory=lambda: float(os.environ.get("PLEX_SCAN_COALESCE_WINDOW", "5"))
+    )
+    plex_match_concurrency: int = field(
+        default_factory=lambda: int(os.environ.get("PLEX_MATCH_CONCURRENCY", "4"))
+    )
 
     # Yubal settings
     yubal_url: str = field(
         default_factory=lambda: os.environ.get("YUBAL_URL", "http://localhost:8080")
     )
+    yubal_push_updates: bool = field(
+        default_factory=lambda: (
+            os.environ.get("YUBAL_PUSH_UPDATES", "true").lower() == "true"
+        )
+    )
+    track_download_threshold: float = field(
+        default_factory=lambda: float(os.environ.get("TRACK_DOWNLOAD_THRESHOLD", "0.2"))
+    )
+
+    # YouTube Music settings
+    ytmusic_match_concurrency: int = field(
+        default_factory=lambda: int(os.environ.get("YTMUSIC_MATCH_CONCURRENCY", "2"))
+    )
+    ytmusic_rate_limit: float = field(
+        default_factory=lambda: float(os.environ.get("YTMUSIC_RATE_LIMIT", "5"))
+    )
+    ytmusic_race_strategies: bool = field(
+        default_factory=lambda: (
+            os.environ.get("YTMUSIC_RACE_STRATEGIES", "false").lower() == "true"
+        )
+    )
+    ytmusic_cache_ttl: int = field(
+        default_factory=lambda: int(os.environ.get("YTMUSIC_CACHE_TTL", "2592000"))
+    )
+    ytmusic_negative_cache_ttl: int = field(
+        default_factory=lambda: int(
+            os.environ.get("YTMUSIC_NEGATIVE_CACHE_TTL", "604800")
+        )
+    )
+    ytmusic_artist_cache_ttl: int = field(
+        default_factory=lambda: int(
+            os.environ.get("YTMUSIC_ARTIST_CACHE_TTL", "604800")
+        )
+    )
 
     # Storage paths
     data_dir: Path = field(
@@ -86,6 +139,17 @@ class Config:
         """Path to SQLite database file."""
         return self.data_dir / "jamknife.db"
 
+    @property
+    def plex_scan_root(self) -> str:
+        """Downloads directory as seen by the Plex server."""
+        return self.plex_downloads_dir or self.downloads_dir.as_posix()
+
+    @property
+    def ytmusic_pool_size(self) -> int:
+        """YouTube Music clients needed, counting raced song searches."""
+        workers = self.ytmusic_match_concurrency
+        return workers * 2 if self.ytmusic_race_strategies else workers
+
     def validate(self) -> list[str]:
         """Validate required configuration. Returns list of missing fields."""
         errors = []
@@ -95,6 +159,12 @@ class Config:
             errors.append("PLEX_TOKEN is required")
         if not self.yubal_url:
             errors.append("YUBAL_URL is required")
+        if self.plex_match_concurrency < 1:
+            errors.append("PLEX_MATCH_CONCURRENCY must be at least 1")
+        if self.ytmusic_match_concurrency < 1:
+            errors.append("YTMUSIC_MATCH_CONCURRENCY must be at least 1")
+        if self.ytmusic_rate_limit <= 0:
+            errors.append("YTMUSIC_RATE_LIMIT must be greater than 0")
         return errors
 
 
@@ -183,6 +183,11 @@ class AlbumDownload(Base):
     )
     progress: Mapped[float] = mapped_column(Integer, default=0)
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Higher priority downloads are submitted first
+    priority: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Set when only this track of the album is downloaded; the album ID and
+    # URL columns then hold the track's video ID and URL
+    track_name: Mapped[str | None] = mapped_column(String(500), nullable=True)
 
     # Timestamps
     queued_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
@@ -220,6 +225,112 @@ class MBIDPlexMapping(Base):
     )
 
 
+class PlexTrack(Base):
+    """Persistent catalog entry for a track in the Plex music library.
+
+    Searchable through the plex_tracks_fts FTS5 table, which is kept in sync
+    by triggers created in migration 002.
+    """
+
+    __tablename__ = "plex_tracks"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    rating_key: Mapped[str] = mapped_column(
+        String(50), unique=True, nullable=False, index=True
+    )
+    title: Mapped[str] = mapped_column(String(500), nullable=False)
+    artist: Mapped[str] = mapped_column(String(500), nullable=False)
+    album: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    album_artist: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    title_norm: Mapped[str] = mapped_column(String(500), nullable=False)
+    artist_norm: Mapped[str] = mapped_column(String(500), nullable=False)
+    album_norm: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    guids: Mapped[str | None] = mapped_column(Text, nullable=True)  # One per line
+    added_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    updated_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    indexed_at: Mapped[datetime] = mapped_column(
+        DateTime, default=lambda: datetime.now(timezone.utc)
+    )
+
+
+class YTMusicResolution(Base):
+    """Cached YouTube Music album lookup for a track.
+
+    Rows with found=False record that no album could be found, so the
+    lookup isn't repeated until the negative TTL expires.
+    """
+
+    __tablename__ = "ytmusic_resolutions"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    recording_mbid: Mapped[str | None] = mapped_column(
+        String(36), nullable=True, index=True
+    )
+    query_key: Mapped[str] = mapped_column(
+        String(1500), unique=True, nullable=False, index=True
+    )
+    found: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    album_id: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    album_title: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    album_artist: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    album_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    year: Mapped[str | None] = mapped_column(String(10), nullable=True)
+    track_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    resolved_at: Mapped[datetime] = mapped_column(
+        DateTime, default=lambda: datetime.now(timezone.utc)
+    )
+
+
+class YTMusicAlbum(Base):
+    """Cached YouTube Music album details, keyed by browse ID."""
+
+    __tablename__ = "ytmusic_albums"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    browse_id: Mapped[str] = mapped_column(
+        String(100), unique=True, nullable=False, index=True
+    )
+    title: Mapped[str] = mapped_column(String(500), nullable=False)
+    artist: Mapped[str] = mapped_column(String(500), nullable=False)
+    audio_playlist_id: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    year: Mapped[str | None] = mapped_column(String(10), nullable=True)
+    track_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    tracks: Mapped[str | None] = mapped_column(Text, nullable=True)  # JSON list
+    fetched_at: Mapped[datetime] = mapped_column(
+        DateTime, default=lambda: datetime.now(timezone.utc)
+    )
+
+
+class YTMusicArtistSearch(Base):
+    """Cached YouTube Music artist search, keyed by normalized artist name."""
+
+    __tablename__ = "ytmusic_artist_searches"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name_key: Mapped[str] = mapped_column(
+        String(500), unique=True, nullable=False, index=True
+    )
+    browse_ids: Mapped[str] = mapped_column(Text, nullable=False)  # One per line
+    fetched_at: Mapped[datetime] = mapped_column(
+        DateTime, default=lambda: datetime.now(timezone.utc)
+    )
+
+
+class YTMusicArtist(Base):
+    """Cached album list from a YouTube Music artist page."""
+
+    __tablename__ = "ytmusic_artists"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    browse_id: Mapped[str] = mapped_column(
+        String(100), unique=True, nullable=False, index=True
+    )
+    albums: Mapped[str] = mapped_column(Text, nullable=False)  # JSON list
+    fetched_at: Mapped[datetime] = mapped_column(
+        DateTime, default=lambda: datetime.now(timezone.utc)
+    )
+
+
 def init_database(db_path: Path) -> sessionmaker:
     """Initialize database and return session factory.
 
@@ -0,0 +1,78 @@
+"""Name normalization and similarity shared by the Plex and YouTube Music clients."""
+
+import string
+import unicodedata
+from difflib import SequenceMatcher
+from functools import lru_cache
+
+# Punctuation removed before comparing names
+_ASCII_PUNCTUATION = "'\".,!?()[]-:"
+_UNICODE_PUNCTUATION = "‘’“”"
+
+# ASCII names take a bytes.translate fast path that lowercases and strips
+# punctuation in one pass; anything else goes through str.translate
+_ASCII_LOWER_TABLE = bytes.maketrans(
+    string.ascii_uppercase.encode(), string.ascii_lowercase.encode()
+)
+_ASCII_DELETE = _ASCII_PUNCTUATION.encode()
+_UNICODE_TABLE = str.maketrans("", "", _ASCII_PUNCTUATION + _UNICODE_PUNCTUATION)
+
+# Normalized names memoized across calls
+NORMALIZE_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize_name(name: str) -> str:
+    """Normalize a name for comparison.
+
+    Folds case and diacritics, strips common punctuation, collapses
+    whitespace and drops a leading "the".
+    """
+    if name.isascii():
+        name = (
+            name.encode("ascii")
+            .translate(_ASCII_LOWER_TABLE, _ASCII_DELETE)
+            .decode("ascii")
+        )
+    else:
+        name = "".join(
+            c
+            for c in unicodedata.normalize("NFKD", name)
+            if not unicodedata.combining(c)
+        )
+        name = name.casefold().translate(_UNICODE_TABLE)
+    name = " ".join(name.split())
+    # Remove "the " prefix
+    if name.startswith("the "):
+        name = name[4:]
+    return name
+
+
+def names_match(name1: str | None, name2: str | None) -> bool:
+    """Check if two names match exactly or one contains the other once normalized."""
+    if not name1 or not name2:
+        return False
+    n1 = normalize_name(name1)
+    n2 = normalize_name(name2)
+    return n1 == n2 or n1 in n2 or n2 in n1
+
+
+def similarity(name1: str | None, name2: str | None) -> float:
+    """Score how similar two names are, from 0.0 to 1.0.
+
+    Exact matches score 1.0 and containment scores between 0.8 and 1.0
+    (closer lengths score higher). Anything else gets a character-level
+    ratio scaled below 0.8, so it never outranks a containment match.
+    """
+    if not name1 or not name2:
+        return 0.0
+    n1 = normalize_name(name1)
+    n2 = normalize_name(name2)
+    if n1 == n2:
+        return 1.0
+    if not n1 or not n2:
+        return 0.0
+    shorter, longer = sorted((n1, n2), key=len)
+    if shorter in longer:
+        return 0.8 + 0.2 * len(shorter) / len(longer)
+    return 0.8 * SequenceMatcher(None, n1, n2).ratio()
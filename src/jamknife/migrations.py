@@ -180,6 +180,134 @@ def migration_001_add_playlist_schedule(session: Session) -> None:
     session.commit()
 
 
+def migration_002_add_plex_tracks_fts(session: Session) -> None:
+    """Add the FTS5 index over the Plex track catalog."""
+    session.execute(
+        text(
+            """
+            CREATE TABLE IF NOT EXISTS plex_tracks (
+                id INTEGER PRIMARY KEY,
+                rating_key VARCHAR(50) NOT NULL UNIQUE,
+                title VARCHAR(500) NOT NULL,
+                artist VARCHAR(500) NOT NULL,
+                album VARCHAR(500),
+                album_artist VARCHAR(500),
+                title_norm VARCHAR(500) NOT NULL,
+                artist_norm VARCHAR(500) NOT NULL,
+                album_norm VARCHAR(500),
+                guids TEXT,
+                added_at DATETIME,
+                updated_at DATETIME,
+                indexed_at DATETIME
+            )
+            """
+        )
+    )
+    session.execute(
+        text(
+            """
+            CREATE INDEX IF NOT EXISTS ix_plex_tracks_rating_key
+            ON plex_tracks (rating_key)
+            """
+        )
+    )
+    session.execute(
+        text(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS plex_tracks_fts USING fts5(
+                title_norm,
+                artist_norm,
+                album_norm,
+                content='plex_tracks',
+                content_rowid='id'
+            )
+            """
+        )
+    )
+
+    # Keep the external-content FTS table in sync with plex_tracks
+    session.execute(
+        text(
+            """
+            CREATE TRIGGER IF NOT EXISTS plex_tracks_fts_ai
+            AFTER INSERT ON plex_tracks BEGIN
+                INSERT INTO plex_tracks_fts (rowid, title_norm, artist_norm, album_norm)
+                VALUES (new.id, new.title_norm, new.artist_norm, new.album_norm);
+            END
+            """
+        )
+    )
+    session.execute(
+        text(
+            """
+            CREATE TRIGGER IF NOT EXISTS plex_tracks_fts_ad
+            AFTER DELETE ON plex_tracks BEGIN
+                INSERT INTO plex_tracks_fts
+                    (plex_tracks_fts, rowid, title_norm, artist_norm, album_norm)
+                VALUES
+                    ('delete', old.id, old.title_norm, old.artist_norm, old.album_norm);
+            END
+            """
+        )
+    )
+    session.execute(
+        text(
+            """
+            CREATE TRIGGER IF NOT EXISTS plex_tracks_fts_au
+            AFTER UPDATE ON plex_tracks BEGIN
+                INSERT INTO plex_tracks_fts
+                    (plex_tracks_fts, rowid, title_norm, artist_norm, album_norm)
+                VALUES
+                    ('delete', old.id, old.title_norm, old.artist_norm, old.album_norm);
+                INSERT INTO plex_tracks_fts (rowid, title_norm, artist_norm, album_norm)
+                VALUES (new.id, new.title_norm, new.artist_norm, new.album_norm);
+            END
+            """
+        )
+    )
+
+    # Index any rows written before the FTS table existed
+    session.execute(
+        text("INSERT INTO plex_tracks_fts (plex_tracks_fts) VALUES ('rebuild')")
+    )
+    session.commit()
+
+
+def migration_003_add_download_priority(session: Session) -> None:
+    """Add the priority column used to order pending downloads."""
+    columns = {
+        row[1] for row in session.execute(text("PRAGMA table_info(album_downloads)"))
+    }
+    if "priority" not in columns:
+        session.execute(
+            text(
+                """
+                ALTER TABLE album_downloads
+                ADD COLUMN priority INTEGER DEFAULT 0 NOT NULL
+                """
+            )
+        )
+    session.commit()
+
+
+def migration_004_add_track_downloads(session: Session) -> None:
+    """Add columns for single-track downloads and cached album track lists."""
+    additions = {
+        "album_downloads": ("track_name", "VARCHAR(500)"),
+        "ytmusic_albums": ("tracks", "TEXT"),
+    }
+    for table, (column, column_type) in additions.items():
+        columns = {
+            row[1] for row in session.execute(text(f"PRAGMA table_info({table})"))
+        }
+        # Missing tables are created complete by create_all
+        if columns and column not in columns:
+            session.execute(
+                text(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+            )
+    session.commit()
+
+
 # ============================================================================
 # All migrations in order
 # ============================================================================
@@ -190,4 +318,19 @@ ALL_MIGRATIONS = [
         description="Add playlist scheduling and enable/disable fields",
         up=migration_001_add_playlist_schedule,
     ),
+    Migration(
+        version="002",
+        description="Add full-text search index for the Plex track catalog",
+        up=migration_002_add_plex_tracks_fts,
+    ),
+    Migration(
+        version="003",
+        description="Add priority to album downloads",
+        up=migration_003_add_download_priority,
+    ),
+    Migration(
+        version="004",
+        description="Add single-track downloads and album track lists",
+        up=migration_004_add_track_downloads,
+    ),
 ]
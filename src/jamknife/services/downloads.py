@@ -0,0 +1,389 @@
+"""Prioritized, fair submission of album downloads to Yubal."""
+
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from sqlalchemy.orm import Session
+
+from jamknife.clients.yubal import JobStatus, YubalClient, YubalSnapshot
+from jamknife.database import (
+    AlbumDownload,
+    DownloadStatus,
+    PlaylistSyncJob,
+    SyncStatus,
+    TrackMatch,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def prefer_track_downloads(
+    needed: int, track_count: int | None, threshold: float
+) -> bool:
+    """Decide whether to download needed tracks one by one instead of the album.
+
+    Downloading the album costs every one of its tracks; downloading
+    tracks individually costs only the ones needed. Track downloads win
+    when the needed tracks are at most threshold of the album, which
+    leaves albums for cases where most of the album is wanted anyway (and
+    a single job is cheaper to track than many).
+
+    Args:
+        needed: Number of the album's tracks that are needed.
+        track_count: Number of tracks on the album, if known.
+        threshold: Largest needed share of the album to download as
+                   tracks; 0 always downloads albums.
+    """
+    if threshold <= 0 or not track_count or needed <= 0:
+        return False
+    return needed / track_count <= threshold
+
+
+# Score a pending download gains per hour waited, so downloads for large
+# jobs still move up behind a steady stream of small ones
+AGE_WEIGHT_PER_HOUR = 0.05
+
+# Width of the score tiers downloads are ranked by. Scores in the same
+# tier count as equal, so comparable jobs still take turns instead of the
+# one with a marginally higher (e.g. slightly older) score taking every
+# slot
+SCORE_TIER = 0.1
+
+
+@dataclass
+class CriticalPath:
+    """How much each unfinished download holds up the sync jobs waiting on it."""
+
+    # Critical-path score per download ID
+    scores: dict[int, float] = field(default_factory=dict)
+    # Oldest waiting sync job per download ID
+    owners: dict[int, int] = field(default_factory=dict)
+
+
+def critical_path(session: Session) -> CriticalPath:
+    """Score unfinished downloads by the sync jobs they unblock.
+
+    A sync job resumes only once all of its downloads finish, so a
+    download matters more the more jobs wait on it, the more of their
+    tracks it provides, and the fewer other downloads those jobs still
+    wait for. Each waiting job j contributes (1 + tracks_j) / remaining_j
+    to a download's score, where tracks_j is the number of job j's
+    tracks on the album and remaining_j the number of job j's unfinished
+    downloads. A job's last download therefore scores at least 1, and
+    submitting the highest scores first finishes playlists soonest on
+    average when Yubal's queue is the bottleneck.
+    """
+    finished = (DownloadStatus.COMPLETED, DownloadStatus.FAILED)
+    rows = (
+        session.query(TrackMatch.sync_job_id, TrackMatch.album_download_id)
+        .join(AlbumDownload, TrackMatch.album_download_id == AlbumDownload.id)
+        .join(PlaylistSyncJob, TrackMatch.sync_job_id == PlaylistSyncJob.id)
+        .filter(AlbumDownload.status.notin_(finished))
+        .filter(
+            PlaylistSyncJob.status.notin_([SyncStatus.COMPLETED, SyncStatus.FAILED])
+        )
+        .all()
+    )
+
+    tracks = Counter((job_id, download_id) for job_id, download_id in rows)
+    remaining: dict[int, set[int]] = defaultdict(set)
+    for job_id, download_id in tracks:
+        remaining[job_id].add(download_id)
+
+    path = CriticalPath()
+    for (job_id, download_id), count in tracks.items():
+        share = (1 + count) / len(remaining[job_id])
+        path.scores[download_id] = path.scores.get(download_id, 0.0) + share
+        path.owners[download_id] = min(path.owners.get(download_id, job_id), job_id)
+    return path
+
+
+class PollCadence:
+    """Adaptive interval between download status polls.
+
+    While downloads are in flight, their progress deltas between polls
+    give an estimate of when the first one finishes, and the next poll
+    is due then (between min_interval and busy_interval). Without
+    progress to go on, busy_interval is used. When nothing is active
+    the interval doubles on every idle poll, up to max_interval.
+    """
+
+    MIN_INTERVAL = 5.0
+    BUSY_INTERVAL = 30.0
+    MAX_INTERVAL = 600.0
+
+    def __init__(
+        self,
+        min_interval: float = MIN_INTERVAL,
+        busy_interval: float = BUSY_INTERVAL,
+        max_interval: float = MAX_INTERVAL,
+    ):
+        """Initialize the cadence.
+
+        Args:
+            min_interval: Shortest interval, used when a download is
+                          about to finish.
+            busy_interval: Longest interval while downloads are active.
+            max_interval: Longest interval when idle.
+        """
+        self._min_interval = min_interval
+        self._busy_interval = busy_interval
+        self._max_interval = max_interval
+        self._interval = busy_interval
+        # Last seen (progress, time) per download ID
+        self._progress: dict[int, tuple[float, float]] = {}
+
+    @property
+    def interval(self) -> float:
+        """Seconds until the next poll is due."""
+        return self._interval
+
+    def record(self, progress: dict[int, float], now: float | None = None) -> float:
+        """Record a poll and compute the interval until the next one.
+
+        Args:
+            progress: Progress (0-100) of each active download by ID.
+            now: Monotonic time of the poll (default: now).
+
+        Returns:
+            Seconds until the next poll.
+        """
+        now = time.monotonic() if now is None else now
+        if not progress:
+            self._progress.clear()
+            self._interval = min(
+                self._max_interval, max(self._busy_interval, self._interval * 2)
+            )
+            return self._interval
+
+        eta = None
+        for download_id, current in progress.items():
+            previous = self._progress.get(download_id)
+            if previous is None or current <= previous[0] or now <= previous[1]:
+                continue
+            rate = (current - previous[0]) / (now - previous[1])
+            remaining = max(0.0, 100.0 - current) / rate
+            eta = remaining if eta is None else min(eta, remaining)
+
+        self._progress = {
+            download_id: (current, now) for download_id, current in progress.items()
+        }
+        if eta is None:
+            self._interval = self._busy_interval
+        else:
+            self._interval = min(self._busy_interval, max(self._min_interval, eta))
+        return self._interval
+
+    def reset(self) -> None:
+        """Drop back to the busy interval, e.g. after new downloads start."""
+        self._interval = self._busy_interval
+
+
+class DownloadScheduler:
+    """Single submitter that fills free Yubal queue slots.
+
+    Pending AlbumDownload rows form a persistent queue. Explicit priority
+    (e.g. user retries) goes first, then the critical-path score, so the
+    downloads that let waiting playlists finish soonest jump ahead.
+    Scores are compared in tiers of SCORE_TIER, and ties are shared
+    between sync jobs round-robin, so one large job can't take the whole
+    queue. Downloads whose URL already has a live Yubal job are
+    linked to it instead of being submitted again.
+
+    Passes are serialized, so sync jobs, the status loop and the API can
+    all call submit() without racing each other for slots. Listeners
+    added with add_submit_listener() are called after every pass that
+    submitted something, from whichever thread ran it.
+    """
+
+    # Yubal accepts 20 active jobs; keep a buffer for other clients
+    MAX_QUEUE_SIZE = 18
+
+    # Priority for downloads the user explicitly retried
+    RETRY_PRIORITY = 10
+
+    def __init__(
+        self,
+        yubal_url: str,
+        session_factory: Callable[[], Session],
+        max_queue_size: int | None = None,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            yubal_url: Base URL of the Yubal server.
+            session_factory: SQLAlchemy session factory.
+            max_queue_size: Active Yubal jobs to allow at once
+                            (default: MAX_QUEUE_SIZE).
+        """
+        self._yubal_url = yubal_url
+        self._session_factory = session_factory
+        self._max_queue_size = (
+            max_queue_size if max_queue_size is not None else self.MAX_QUEUE_SIZE
+        )
+        self._lock = threading.Lock()
+        self._submit_listeners: list[Callable[[], None]] = []
+
+    def add_submit_listener(self, listener: Callable[[], None]) -> None:
+        """Call listener after each pass that submitted downloads."""
+        self._submit_listeners.append(listener)
+
+    def submit(
+        self, session: Session | None = None, snapshot: YubalSnapshot | None = None
+    ) -> int:
+        """Submit pending downloads while Yubal has free slots.
+
+        Args:
+            session: Session to use; a new one is opened if not given.
+            snapshot: Yubal job state for this pass; listed if not given.
+                      Jobs created by the pass are added to it.
+
+        Returns:
+            Number of downloads submitted or linked to an existing job.
+        """
+        with self._lock:
+            if session is not None:
+                submitted = self._submit(session, snapshot)
+            else:
+                with self._session_factory() as own_session:
+                    submitted = self._submit(own_session, snapshot)
+
+        if submitted:
+            for listener in self._submit_listeners:
+                try:
+                    listener()
+                except Exception as e:
+                    logger.warning("Submit listener failed: %s", e)
+        return submitted
+
+    def _submit(self, session: Session, snapshot: YubalSnapshot | None) -> int:
+        yubal = YubalClient(self._yubal_url)
+        try:
+            if snapshot is None:
+                try:
+                    snapshot = yubal.snapshot()
+                except Exception as e:
+                    logger.warning("Failed to check Yubal queue: %s", e)
+                    return 0
+
+            available_slots = max(0, self._max_queue_size - snapshot.active_count)
+            if available_slots == 0:
+                return 0
+
+            queue = self._next_downloads(session, available_slots)
+            if not queue:
+                return 0
+
+            logger.info(
+                "Yubal queue: %d active jobs, submitting up to %d download(s)",
+                snapshot.active_count,
+                len(queue),
+            )
+
+            submitted = 0
+            for download in queue:
+                existing_job = snapshot.find_by_url(download.ytmusic_album_url)
+                if existing_job and existing_job.status not in (
+                    JobStatus.FAILED,
+                    JobStatus.CANCELLED,
+                ):
+                    logger.info(
+                        "Found existing job %s for download %d, linking",
+                        existing_job.id,
+                        download.id,
+                    )
+                    self._mark_queued(download, existing_job.id)
+                    submitted += 1
+                    continue
+
+                try:
+                    job = yubal.create_job(download.ytmusic_album_url)
+                except Exception as e:
+                    if "409" in str(e) or "Conflict" in str(e):
+                        # Queue full; what's left stays pending for next pass
+                        logger.info("Yubal queue full, stopping submission")
+                        break
+                    self._mark_failed(download, e)
+                    continue
+
+                snapshot.add(job)
+                self._mark_queued(download, job.id)
+                submitted += 1
+                logger.info(
+                    "Submitted download: %s - %s",
+                    download.artist_name,
+                    download.album_name,
+                )
+
+            session.commit()
+            if submitted:
+                logger.info("Submitted %d download(s)", submitted)
+            return submitted
+        finally:
+            yubal.close()
+
+    def _next_downloads(self, session: Session, limit: int) -> list[AlbumDownload]:
+        """Pick up to limit pending downloads in submission order.
+
+        A download belongs to the oldest sync job waiting on it; downloads
+        no job waits on share one queue. Each pick takes the best head of
+        the per-job queues: highest priority first, then highest
+        critical-path score tier (score plus aging), then the job with the
+        fewest picks so far this pass, then the longest-waiting download.
+        """
+        pending = (
+            session.query(AlbumDownload)
+            .filter(AlbumDownload.status == DownloadStatus.PENDING)
+            .filter(AlbumDownload.yubal_job_id.is_(None))
+            .order_by(AlbumDownload.created_at, AlbumDownload.id)
+            .all()
+        )
+        if not pending:
+            return []
+
+        path = critical_path(session)
+        now = datetime.now(timezone.utc)
+        rank = {}
+        for position, download in enumerate(pending):
+            created_at = download.created_at
+            if created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=timezone.utc)
+            hours = max(0.0, (now - created_at).total_seconds() / 3600)
+            score = path.scores.get(download.id, 0.0) + AGE_WEIGHT_PER_HOUR * hours
+            tier = round(score / SCORE_TIER)
+            rank[download.id] = (-download.priority, -tier, position)
+
+        queues: dict[int | None, list[AlbumDownload]] = {}
+        for download in sorted(pending, key=lambda d: rank[d.id]):
+            queues.setdefault(path.owners.get(download.id), []).append(download)
+        picks = dict.fromkeys(queues, 0)
+
+        def head_key(owner: int | None) -> tuple:
+            priority, tier, position = rank[queues[owner][0].id]
+            return priority, tier, picks[owner], position
+
+        selected = []
+        while queues and len(selected) < limit:
+            owner = min(queues, key=head_key)
+            selected.append(queues[owner].pop(0))
+            picks[owner] += 1
+            if not queues[owner]:
+                del queues[owner]
+        return selected
+
+    @staticmethod
+    def _mark_queued(download: AlbumDownload, job_id: str) -> None:
+        download.yubal_job_id = job_id
+        download.status = DownloadStatus.QUEUED
+        download.queued_at = datetime.now(timezone.utc)
+
+    @staticmethod
+    def _mark_failed(download: AlbumDownload, error: Exception) -> None:
+        logger.warning("Failed to submit download %d: %s", download.id, error)
+        download.status = DownloadStatus.FAILED
+        download.error_message = str(error)
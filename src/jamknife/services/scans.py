@@ -0,0 +1,147 @@
+"""Targeted and coalesced Plex library scans for completed downloads."""
+
+import logging
+import threading
+from collections.abc import Callable, Iterable
+from datetime import datetime, timezone
+from pathlib import Path, PurePosixPath
+
+from jamknife.matching import normalize_name
+
+logger = logging.getLogger(__name__)
+
+# Function that triggers a scan of the given Plex paths (None = whole section)
+# and returns the section's scannedAt marker from before the scan
+ScanTrigger = Callable[[list[str] | None], datetime | None]
+
+
+def find_download_folders(
+    downloads_dir: Path, since: datetime | None, album_name: str | None = None
+) -> list[Path]:
+    """Find album folders under the downloads directory written since a time.
+
+    Looks at most two levels deep (artist/album). When an album name is
+    given, folders whose name matches it are preferred over every other
+    folder that happened to change in the same period.
+
+    Args:
+        downloads_dir: Root of the downloads directory.
+        since: Only consider folders modified at or after this time.
+        album_name: Optional album name to narrow the result.
+
+    Returns:
+        Matching folders; empty if nothing could be found.
+    """
+    if not downloads_dir.is_dir():
+        return []
+
+    if since is not None and since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    threshold = since.timestamp() if since else 0.0
+
+    changed: list[Path] = []
+    try:
+        for artist_dir in downloads_dir.iterdir():
+            if not artist_dir.is_dir():
+                continue
+            album_dirs = [d for d in artist_dir.iterdir() if d.is_dir()]
+            recent = [d for d in album_dirs if d.stat().st_mtime >= threshold]
+            if recent:
+                changed.extend(recent)
+            elif not album_dirs and artist_dir.stat().st_mtime >= threshold:
+                changed.append(artist_dir)
+    except OSError as e:
+        logger.warning("Failed to inspect downloads directory %s: %s", downloads_dir, e)
+        return []
+
+    if album_name:
+        wanted = normalize_name(album_name)
+        named = [d for d in changed if wanted and wanted in normalize_name(d.name)]
+        if named:
+            return named
+
+    return changed
+
+
+def to_plex_paths(
+    folders: Iterable[Path], downloads_dir: Path, plex_downloads_dir: str
+) -> list[str]:
+    """Translate local download folders to the paths Plex sees them at."""
+    paths = []
+    for folder in folders:
+        try:
+            relative = folder.relative_to(downloads_dir)
+        except ValueError:
+            continue
+        paths.append(str(PurePosixPath(plex_downloads_dir, *relative.parts)))
+    return sorted(set(paths))
+
+
+class _ScanBatch:
+    """Paths collected during one coalescing window."""
+
+    def __init__(self):
+        self.paths: set[str] = set()
+        self.full_scan = False
+        self.done = threading.Event()
+        self.marker: datetime | None = None
+        self.error: Exception | None = None
+
+
+class LibraryScanCoalescer:
+    """Batch scan requests arriving close together into a single Plex scan.
+
+    The first request opens a window; every request made before it closes
+    joins the batch. When the window closes, one scan covering all queued
+    paths is triggered and every caller gets the same scan marker.
+    """
+
+    def __init__(self, trigger: ScanTrigger, window: float = 5.0):
+        """Initialize the coalescer.
+
+        Args:
+            trigger: Function that triggers the scan.
+            window: Seconds to wait for more requests before scanning.
+        """
+        self._trigger = trigger
+        self._window = window
+        self._lock = threading.Lock()
+        self._batch: _ScanBatch | None = None
+
+    def request(self, paths: list[str] | None) -> datetime | None:
+        """Request a scan of the given paths and block until it is triggered.
+
+        Args:
+            paths: Plex paths to scan, or None/empty for the whole section.
+
+        Returns:
+            The section's scannedAt from before the scan, for
+            PlexClient.wait_for_library_scan.
+        """
+        with self._lock:
+            batch = self._batch
+            is_leader = batch is None
+            if is_leader:
+                batch = self._batch = _ScanBatch()
+            if paths:
+                batch.paths.update(paths)
+            else:
+                batch.full_scan = True
+
+        if is_leader:
+            batch.done.wait(self._window)
+            with self._lock:
+                self._batch = None
+            try:
+                scan_paths = None if batch.full_scan else sorted(batch.paths)
+                batch.marker = self._trigger(scan_paths)
+            except Exception as e:
+                batch.error = e
+            finally:
+                batch.done.set()
+        else:
+            batch.done.wait()
+
+        if batch.error is not None:
+            raise batch.error
+        return batch.marker
@@ -1,17 +1,30 @@
 """Playlist sync orchestration service."""
 
 import logging
+import threading
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
 
 from sqlalchemy.orm import Session
 
 from jamknife.clients import (
+    AdaptiveRateLimiter,
     ListenBrainzClient,
     PlexClient,
+    PlexClientPool,
+    PlexLibraryIndex,
+    PlexTrackCatalog,
+    YTMusicAlbumCache,
+    YTMusicArtistCache,
+    YTMusicPool,
+    YTMusicResolutionCache,
     YTMusicResolver,
-    YubalClient,
 )
+from jamknife.clients.listenbrainz import Track
+from jamknife.clients.plex import PlexTrackMatch
+from jamknife.clients.ytmusic import AlbumInfo, AlbumTrack
 from jamknife.config import Config
 from jamknife.database import (
     AlbumDownload,
@@ -22,6 +35,13 @@ from jamknife.database import (
     SyncStatus,
     TrackMatch,
 )
+from jamknife.matching import names_match, normalize_name, similarity
+from jamknife.services.downloads import DownloadScheduler, prefer_track_downloads
+from jamknife.services.scans import (
+    LibraryScanCoalescer,
+    find_download_folders,
+    to_plex_paths,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +49,46 @@ logger = logging.getLogger(__name__)
 ProgressCallback = Callable[[str, float], None]
 
 
+@dataclass
+class TrackResolution:
+    """Result of looking a playlist track up in Plex and YouTube Music.
+
+    Produced without touching the database so tracks can be resolved
+    concurrently; TrackMatch rows are written from it afterwards.
+    """
+
+    track: Track
+    position: int
+    rating_key: str | None = None
+    # Whether the rating key came from a fresh search and should be cached
+    searched: bool = False
+    album_info: AlbumInfo | None = None
+    # Set when only this track of the album should be downloaded
+    album_track: AlbumTrack | None = None
+
+
+def plan_release_groups(
+    resolutions: list[TrackResolution],
+) -> list[list[TrackResolution]]:
+    """Group unresolved tracks that come from the same release.
+
+    Tracks are grouped by release MBID, falling back to the normalized
+    album and artist names. Tracks without either are kept on their own.
+    Groups are ordered by their first track's position.
+    """
+    groups: dict[str, list[TrackResolution]] = {}
+    for resolution in resolutions:
+        track = resolution.track
+        if track.release_mbid:
+            key = f"release:{track.release_mbid}"
+        elif track.album:
+            key = f"album:{normalize_name(track.album)}|{normalize_name(track.artist)}"
+        else:
+            key = f"track:{resolution.position}"
+        groups.setdefault(key, []).append(resolution)
+    return list(groups.values())
+
+
 class PlaylistSyncService:
     """Service for syncing ListenBrainz playlists to Plex."""
 
@@ -36,15 +96,64 @@ class PlaylistSyncService:
         self,
         config: Config,
         session_factory: Callable[[], Session],
+        plex_pool: PlexClientPool | None = None,
+        ytmusic_pool: YTMusicPool | None = None,
     ):
         """Initialize the sync service.
 
         Args:
             config: Application configuration.
             session_factory: SQLAlchemy session factory.
+            plex_pool: Shared Plex connection pool (created if not given).
+            ytmusic_pool: Shared YouTube Music client pool (created if not
+                          given).
         """
         self._config = config
         self._session_factory = session_factory
+        self._plex_pool = plex_pool or PlexClientPool(
+            config.plex_url,
+            config.plex_token,
+            config.plex_music_library,
+            config.plex_verify_ssl,
+        )
+        self._ytmusic_pool = ytmusic_pool or YTMusicPool(config.ytmusic_pool_size)
+        self._plex_index = (
+            PlexLibraryIndex(
+                max_age=config.plex_index_max_age,
+                catalog=PlexTrackCatalog(session_factory),
+            )
+            if config.plex_index_enabled
+            else None
+        )
+        self._scan_coalescer = LibraryScanCoalescer(
+            self._trigger_library_scan, window=config.plex_scan_coalesce_window
+        )
+        self._ytmusic_cache = YTMusicResolutionCache(
+            session_factory,
+            ttl=config.ytmusic_cache_ttl,
+            negative_ttl=config.ytmusic_negative_cache_ttl,
+        )
+        self._album_cache = YTMusicAlbumCache(session_factory)
+        self._artist_cache = YTMusicArtistCache(
+            session_factory, ttl=config.ytmusic_artist_cache_ttl
+        )
+        self._ytmusic_limiter = AdaptiveRateLimiter(rate=config.ytmusic_rate_limit)
+        self._download_scheduler = DownloadScheduler(config.yubal_url, session_factory)
+        # Caps on in-flight lookups per service, shared by all running jobs
+        self._plex_slots = threading.BoundedSemaphore(config.plex_match_concurrency)
+        self._ytmusic_slots = threading.BoundedSemaphore(
+            config.ytmusic_match_concurrency
+        )
+
+    @property
+    def ytmusic_rate_limiter(self) -> AdaptiveRateLimiter:
+        """Rate limiter shared by all YouTube Music lookups."""
+        return self._ytmusic_limiter
+
+    @property
+    def download_scheduler(self) -> DownloadScheduler:
+        """Scheduler that submits every queued download to Yubal."""
+        return self._download_scheduler
 
     def discover_playlists(self) -> list[ListenBrainzPlaylist]:
         """Discover daily/weekly playlists from ListenBrainz.
@@ -181,38 +290,38 @@ class PlaylistSyncService:
                 if on_progress:
                     on_progress("Matching tracks in Plex library", 0.10)
 
-                plex = PlexClient(
-                    self._config.plex_url,
-                    self._config.plex_token,
-                    self._config.plex_music_library,
-                    self._config.plex_verify_ssl,
+                plex = self._get_plex()
+                ytmusic = YTMusicResolver(
+                    cache=self._ytmusic_cache,
+                    album_cache=self._album_cache,
+                    rate_limiter=self._ytmusic_limiter,
+                    race_strategies=self._config.ytmusic_race_strategies,
+                    artist_cache=self._artist_cache,
+                    pool=self._ytmusic_pool,
                 )
-                ytmusic = YTMusicResolver()
-
-                matched_tracks = []
-                missing_tracks = []
-
-                for _i, track in enumerate(lb_playlist.tracks):
-                    progress = 0.10 + (0.30 * (_i / len(lb_playlist.tracks)))
-                    if on_progress:
-                        on_progress(
-                            f"Matching track {_i + 1}/{len(lb_playlist.tracks)}",
-                            progress,
-                        )
 
-                    track_match = self._match_track(
-                        session, job, track, _i, plex, ytmusic
-                    )
-                    session.add(track_match)
+                cached_rating_keys = self._get_valid_cached_mappings(
+                    session, plex, lb_playlist.tracks
+                )
 
-                    if track_match.matched_in_plex:
-                        matched_tracks.append(track_match)
-                    else:
-                        missing_tracks.append(track_match)
+                track_matches = self._match_tracks(
+                    session,
+                    job,
+                    lb_playlist.tracks,
+                    plex,
+                    ytmusic,
+                    cached_rating_keys,
+                    on_progress,
+                )
+                matched_tracks = [tm for tm in track_matches if tm.matched_in_plex]
+                missing_tracks = [tm for tm in track_matches if not tm.matched_in_plex]
 
                 job.tracks_matched = len(matched_tracks)
                 job.tracks_missing = len(missing_tracks)
                 session.commit()
+                self._ytmusic_cache.flush()
+                self._album_cache.flush()
+                self._artist_cache.flush()
 
                 # Phase 3: Download missing albums
                 if missing_tracks:
@@ -245,19 +354,12 @@ class PlaylistSyncService:
                 if on_progress:
                     on_progress("Creating Plex playlist", 0.90)
 
-                plex_tracks = []
-                for track_match in job.track_matches:
-                    if track_match.matched_in_plex and track_match.plex_rating_key:
-                        plex_track = plex.get_track_by_rating_key(
-                            track_match.plex_rating_key
-                        )
-                        if plex_track:
-                            plex_tracks.append(plex_track)
+                plex_tracks = self._get_playlist_tracks(
+                    session, plex, job.track_matches
+                )
 
                 if plex_tracks:
-                    plex_playlist = plex.create_playlist(
-                        lb_playlist.name, plex_tracks, replace_existing=True
-                    )
+                    plex_playlist = plex.update_playlist(lb_playlist.name, plex_tracks)
                     job.plex_playlist_key = str(plex_playlist.ratingKey)
 
                 # Mark as completed
@@ -306,21 +408,20 @@ class PlaylistSyncService:
 
             try:
                 playlist = job.playlist
-                plex = PlexClient(
-                    self._config.plex_url,
-                    self._config.plex_token,
-                    self._config.plex_music_library,
-                    self._config.plex_verify_ssl,
-                )
+                plex = self._get_plex()
 
-                # Trigger Plex library refresh and wait
+                # Scan the downloaded folders, batched with other resuming
+                # jobs, and wait for the scan to finish
                 logger.info("Refreshing Plex library for job %d", job_id)
-                plex.refresh_library()
-
-                # Wait for library to update
-                import time
+                scanned_at = self._scan_coalescer.request(
+                    self._get_download_scan_paths(job)
+                )
+                plex.wait_for_library_scan(
+                    since=scanned_at, timeout=self._config.plex_scan_timeout
+                )
 
-                time.sleep(10)
+                # Pick up the newly imported tracks without a full crawl
+                plex.refresh_library_index()
 
                 # Re-match previously missing tracks
                 logger.info("Re-matching downloaded tracks for job %d", job_id)
@@ -359,19 +460,12 @@ class PlaylistSyncService:
                 self._update_job_status(session, job, SyncStatus.CREATING_PLAYLIST)
                 logger.info("Creating Plex playlist for job %d", job_id)
 
-                plex_tracks = []
-                for track_match in job.track_matches:
-                    if track_match.matched_in_plex and track_match.plex_rating_key:
-                        plex_track = plex.get_track_by_rating_key(
-                            track_match.plex_rating_key
-                        )
-                        if plex_track:
-                            plex_tracks.append(plex_track)
+                plex_tracks = self._get_playlist_tracks(
+                    session, plex, job.track_matches
+                )
 
                 if plex_tracks:
-                    plex_playlist = plex.create_playlist(
-                        playlist.name, plex_tracks, replace_existing=True
-                    )
+                    plex_playlist = plex.update_playlist(playlist.name, plex_tracks)
                     job.plex_playlist_key = str(plex_playlist.ratingKey)
 
                 # Mark as completed
@@ -392,80 +486,277 @@ class PlaylistSyncService:
 
             return job
 
-    def _match_track(
+    def _get_download_scan_paths(self, job: PlaylistSyncJob) -> list[str] | None:
+        """Get the Plex paths of the folders the job's downloads wrote to.
+
+        Returns None (scan everything) if any completed download's folder
+        cannot be located.
+        """
+        downloads = {
+            tm.album_download.id: tm.album_download
+            for tm in job.track_matches
+            if tm.album_download
+            and tm.album_download.status == DownloadStatus.COMPLETED
+        }
+        if not downloads:
+            return None
+
+        folders = []
+        for download in downloads.values():
+            found = find_download_folders(
+                self._config.downloads_dir,
+                download.queued_at or download.created_at,
+                download.album_name,
+            )
+            if not found:
+                logger.info(
+                    "Could not locate folder for download %s, scanning whole library",
+                    download.album_name,
+                )
+                return None
+            folders.extend(found)
+
+        return to_plex_paths(
+            folders, self._config.downloads_dir, self._config.plex_scan_root
+        )
+
+    def _trigger_library_scan(self, paths: list[str] | None) -> datetime | None:
+        """Trigger one Plex scan for a batch of coalesced scan requests."""
+        return self._plex_pool.get_client().refresh_library(paths)
+
+    def _get_plex(self) -> PlexClient:
+        """Get a pooled Plex client that consults the library index."""
+        return self._plex_pool.get_client(library_index=self._plex_index)
+
+    def _match_tracks(
         self,
         session: Session,
         job: PlaylistSyncJob,
-        track,
-        position: int,
+        tracks: list[Track],
         plex: PlexClient,
         ytmusic: YTMusicResolver,
-    ) -> TrackMatch:
-        """Match a single track against Plex and resolve to YouTube Music."""
-        # Check cached MBID mapping first
-        cached = (
-            session.query(MBIDPlexMapping)
-            .filter_by(recording_mbid=track.recording_mbid)
-            .first()
-        )
+        cached_rating_keys: dict[str, str],
+        on_progress: ProgressCallback | None = None,
+    ) -> list[TrackMatch]:
+        """Match all playlist tracks, resolving them concurrently.
 
-        if cached:
-            # Verify the track still exists in Plex
-            plex_track = plex.get_track_by_rating_key(cached.plex_rating_key)
-            if plex_track:
-                return TrackMatch(
-                    sync_job_id=job.id,
-                    position=position,
-                    recording_mbid=track.recording_mbid,
-                    track_name=track.title,
-                    artist_name=track.artist,
-                    album_name=track.album,
-                    release_mbid=track.release_mbid,
-                    plex_rating_key=cached.plex_rating_key,
-                    matched_in_plex=True,
+        Tracks are first looked up in Plex. Tracks Plex doesn't have are
+        grouped by release (see plan_release_groups) and each group is
+        resolved on YouTube Music once. Lookups run on a thread pool bounded
+        by the Plex and YouTube Music concurrency limits; results are
+        applied to the session in playlist order from the calling thread.
+
+        Returns:
+            TrackMatch rows in position order, added to the session.
+        """
+        if not tracks:
+            return []
+
+        workers = min(
+            len(tracks),
+            self._config.plex_match_concurrency
+            + self._config.ytmusic_match_concurrency,
+        )
+        executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix=f"match-job-{job.id}"
+        )
+        try:
+            futures = [
+                executor.submit(
+                    self._resolve_in_plex, track, position, plex, cached_rating_keys
                 )
+                for position, track in enumerate(tracks)
+            ]
+            resolutions = []
+            for position, future in enumerate(futures):
+                if on_progress:
+                    on_progress(
+                        f"Matching track {position + 1}/{len(tracks)}",
+                        0.10 + (0.20 * (position / len(tracks))),
+                    )
+                resolutions.append(future.result())
 
-        # Try to match in Plex
-        plex_match = plex.search_track(track.title, track.artist, track.album)
+            groups = plan_release_groups(
+                [r for r in resolutions if r.rating_key is None]
+            )
+            futures = [
+                executor.submit(self._resolve_release_group, group, ytmusic)
+                for group in groups
+            ]
+            for i, future in enumerate(futures):
+                if on_progress:
+                    on_progress(
+                        f"Resolving missing album {i + 1}/{len(groups)}",
+                        0.30 + (0.10 * (i / len(groups))),
+                    )
+                future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        self._plan_track_downloads(
+            session, [r for r in resolutions if r.rating_key is None], ytmusic
+        )
+
+        track_matches = []
+        for resolution in resolutions:
+            track_match = self._apply_resolution(session, job, resolution)
+            session.add(track_match)
+            track_matches.append(track_match)
+        return track_matches
 
+    def _resolve_in_plex(
+        self,
+        track: Track,
+        position: int,
+        plex: PlexClient,
+        cached_rating_keys: dict[str, str],
+    ) -> TrackResolution:
+        """Look a track up in Plex without DB access."""
+        resolution = TrackResolution(track=track, position=position)
+
+        # Exact match on the MusicBrainz GUIDs Plex stores on tracks
+        plex_match: PlexTrackMatch | None
+        with self._plex_slots:
+            plex_match = plex.find_track_by_mbid(track.recording_mbid)
         if plex_match:
-            # Cache the mapping
-            self._cache_mbid_mapping(
-                session,
-                track.recording_mbid,
-                plex_match.rating_key,
-                track.title,
-                track.artist,
-                track.album,
-            )
+            resolution.rating_key = plex_match.rating_key
+            return resolution
 
-            return TrackMatch(
-                sync_job_id=job.id,
-                position=position,
-                recording_mbid=track.recording_mbid,
-                track_name=track.title,
-                artist_name=track.artist,
-                album_name=track.album,
-                release_mbid=track.release_mbid,
-                plex_rating_key=plex_match.rating_key,
-                matched_in_plex=True,
-            )
+        # Check cached MBID mapping next
+        cached_rating_key = cached_rating_keys.get(track.recording_mbid)
+        if cached_rating_key:
+            resolution.rating_key = cached_rating_key
+            return resolution
 
-        # Track not in Plex, resolve to YouTube Music album
+        # Try to match in Plex
+        with self._plex_slots:
+            plex_match = plex.search_track(track.title, track.artist, track.album)
+        if plex_match:
+            resolution.rating_key = plex_match.rating_key
+            resolution.searched = True
+        return resolution
+
+    def _resolve_release_group(
+        self, group: list[TrackResolution], ytmusic: YTMusicResolver
+    ) -> None:
+        """Resolve a group of tracks from one release to a YouTube Music album.
+
+        Members are tried in order until one resolves to an album named like
+        the release; that AlbumInfo is then shared by the rest of the group.
+        An album found some other way (e.g. a single from the song search)
+        only applies to the track that found it.
+        """
+        for i, resolution in enumerate(group):
+            track = resolution.track
+            with self._ytmusic_slots:
+                album_info = ytmusic.find_album_for_track(
+                    track.title,
+                    track.artist,
+                    track.album,
+                    recording_mbid=track.recording_mbid,
+                )
+            resolution.album_info = album_info
+            if album_info and (
+                not track.album or names_match(album_info.title, track.album)
+            ):
+                for other in group[i + 1 :]:
+                    other.album_info = album_info
+                return
+
+    def _plan_track_downloads(
+        self,
+        session: Session,
+        resolutions: list[TrackResolution],
+        ytmusic: YTMusicResolver,
+    ) -> None:
+        """Choose albums to download track by track instead of whole.
+
+        For each album the playlist needs that isn't already recorded as a
+        download, prefer_track_downloads weighs the number of tracks needed
+        against the album's size (fetching its track list if the size isn't
+        known). Chosen albums get each resolution's album_track set; an
+        album stays a whole-album download if any needed track can't be
+        found on it.
+        """
+        threshold = self._config.track_download_threshold
+        if threshold <= 0:
+            return
+
+        by_album: dict[str, list[TrackResolution]] = {}
+        for resolution in resolutions:
+            if resolution.album_info:
+                by_album.setdefault(resolution.album_info.album_id, []).append(
+                    resolution
+                )
+        if not by_album:
+            return
+
+        downloaded = {
+            album_id
+            for (album_id,) in session.query(AlbumDownload.ytmusic_album_id).filter(
+                AlbumDownload.ytmusic_album_id.in_(list(by_album))
+            )
+        }
+        for album_id, members in by_album.items():
+            if album_id in downloaded:
+                continue
+            track_count = members[0].album_info.track_count
+            if track_count and not prefer_track_downloads(
+                len(members), track_count, threshold
+            ):
+                continue
+
+            with self._ytmusic_slots:
+                album_tracks = ytmusic.get_album_tracks(album_id)
+            if not album_tracks or not prefer_track_downloads(
+                len(members), track_count or len(album_tracks), threshold
+            ):
+                continue
+
+            matches = [
+                self._find_album_track(album_tracks, r.track.title) for r in members
+            ]
+            if all(matches):
+                for resolution, album_track in zip(members, matches, strict=True):
+                    resolution.album_track = album_track
+
+    @staticmethod
+    def _find_album_track(
+        album_tracks: list[AlbumTrack], title: str
+    ) -> AlbumTrack | None:
+        """Find the album track closest to a playlist track's title."""
+        candidates = [t for t in album_tracks if names_match(t.title, title)]
+        return max(candidates, key=lambda t: similarity(t.title, title), default=None)
+
+    def _apply_resolution(
+        self, session: Session, job: PlaylistSyncJob, resolution: TrackResolution
+    ) -> TrackMatch:
+        """Build the TrackMatch for a resolved track and record side effects."""
+        track = resolution.track
         track_match = TrackMatch(
             sync_job_id=job.id,
-            position=position,
+            position=resolution.position,
             recording_mbid=track.recording_mbid,
             track_name=track.title,
             artist_name=track.artist,
             album_name=track.album,
             release_mbid=track.release_mbid,
-            matched_in_plex=False,
+            plex_rating_key=resolution.rating_key,
+            matched_in_plex=resolution.rating_key is not None,
         )
 
-        album_info = ytmusic.find_album_for_track(
-            track.title, track.artist, track.album
-        )
+        if resolution.searched:
+            # Cache the mapping
+            self._cache_mbid_mapping(
+                session,
+                track.recording_mbid,
+                resolution.rating_key,
+                track.title,
+                track.artist,
+                track.album,
+            )
+
+        album_info = resolution.album_info
         if album_info:
             track_match.ytmusic_album_id = album_info.album_id
             track_match.ytmusic_album_url = album_info.url
@@ -477,8 +768,29 @@ class PlaylistSyncService:
                 .first()
             )
 
+            album_track = resolution.album_track
+            if existing_download is None and album_track:
+                # Only a few of the album's tracks are needed
+                existing_download = (
+                    session.query(AlbumDownload)
+                    .filter_by(ytmusic_album_id=album_track.video_id)
+                    .first()
+                )
+
             if existing_download:
                 track_match.album_download_id = existing_download.id
+            elif album_track:
+                # Create new single-track download record
+                download = AlbumDownload(
+                    ytmusic_album_id=album_track.video_id,
+                    ytmusic_album_url=YTMusicResolver.track_url(album_track),
+                    album_name=album_info.title,
+                    artist_name=album_info.artist,
+                    track_name=album_track.title,
+                )
+                session.add(download)
+                session.flush()
+                track_match.album_download_id = download.id
             else:
                 # Create new album download record
                 download = AlbumDownload(
@@ -493,6 +805,69 @@ class PlaylistSyncService:
 
         return track_match
 
+    def _get_valid_cached_mappings(
+        self, session: Session, plex: PlexClient, tracks: list
+    ) -> dict[str, str]:
+        """Load cached MBID mappings for tracks and drop ones gone from Plex.
+
+        Tracks the library index already finds by MBID are skipped, since
+        they never reach the cache. The remaining cached rating keys are
+        validated with batched requests instead of one request per track.
+
+        Returns:
+            Mapping of recording MBID to a rating key that still exists.
+        """
+        mbids = [
+            t.recording_mbid
+            for t in tracks
+            if t.recording_mbid and not plex.find_track_by_mbid(t.recording_mbid)
+        ]
+        if not mbids:
+            return {}
+
+        mappings = (
+            session.query(MBIDPlexMapping)
+            .filter(MBIDPlexMapping.recording_mbid.in_(mbids))
+            .all()
+        )
+        if not mappings:
+            return {}
+
+        lookup = plex.get_tracks_by_rating_keys([m.plex_rating_key for m in mappings])
+        return {
+            m.recording_mbid: m.plex_rating_key
+            for m in mappings
+            if m.plex_rating_key in lookup.tracks
+        }
+
+    def _get_playlist_tracks(
+        self, session: Session, plex: PlexClient, track_matches: list[TrackMatch]
+    ) -> list:
+        """Fetch the Plex tracks for matched tracks in playlist order.
+
+        Cached MBID mappings pointing at tracks that vanished from Plex are
+        removed so they are re-matched on the next sync.
+        """
+        matched = sorted(
+            (tm for tm in track_matches if tm.matched_in_plex and tm.plex_rating_key),
+            key=lambda tm: tm.position,
+        )
+        lookup = plex.get_tracks_by_rating_keys([tm.plex_rating_key for tm in matched])
+
+        if lookup.missing:
+            logger.warning(
+                "%d matched track(s) no longer exist in Plex", len(lookup.missing)
+            )
+            session.query(MBIDPlexMapping).filter(
+                MBIDPlexMapping.plex_rating_key.in_(lookup.missing)
+            ).delete(synchronize_session=False)
+
+        return [
+            lookup.tracks[tm.plex_rating_key]
+            for tm in matched
+            if tm.plex_rating_key in lookup.tracks
+        ]
+
     def _download_missing_albums(
         self,
         session: Session,
@@ -501,7 +876,12 @@ class PlaylistSyncService:
         progress_start: float,
         progress_end: float,
     ) -> None:
-        """Download albums for missing tracks via Yubal."""
+        """Download albums for missing tracks via Yubal.
+
+        The albums are already queued as pending AlbumDownload rows; this
+        runs a scheduler pass so whatever fits in Yubal starts right away.
+        The status loop submits the rest as slots free up.
+        """
         # Collect unique albums to download
         albums_to_download: dict[int, AlbumDownload] = {}
         for track in missing_tracks:
@@ -513,117 +893,21 @@ class PlaylistSyncService:
         if not albums_to_download:
             return
 
-        yubal = YubalClient(self._config.yubal_url)
-
-        try:
-            # Check current queue size (Yubal max is 20, keep buffer)
-            try:
-                all_jobs = yubal.list_jobs()
-                active_jobs = [j for j in all_jobs if j.status.is_active]
-                current_queue_size = len(active_jobs)
-                max_queue_size = 18  # Leave buffer for other operations
-                available_slots = max(0, max_queue_size - current_queue_size)
+        self._download_scheduler.submit(session)
 
-                logger.info(
-                    "Yubal queue: %d active jobs, %d slots available",
-                    current_queue_size,
-                    available_slots,
-                )
-            except Exception as e:
-                logger.warning("Failed to check Yubal queue size: %s", e)
-                available_slots = 5  # Conservative default
-
-            # Submit albums for download (respecting queue limit)
-            submitted = 0
-            for _i, download in enumerate(albums_to_download.values()):
-                # Stop if queue is full
-                if submitted >= available_slots:
-                    logger.info(
-                        "Reached Yubal queue limit, leaving %d downloads pending",
-                        len(albums_to_download) - submitted,
-                    )
-                    break
-
-                try:
-                    logger.info(
-                        "Submitting album for download: %s - %s",
-                        download.artist_name,
-                        download.album_name,
-                    )
-
-                    job = yubal.create_job(download.ytmusic_album_url)
-                    download.yubal_job_id = job.id
-                    download.status = DownloadStatus.QUEUED
-                    download.queued_at = datetime.now(timezone.utc)
-                    session.commit()
-                    submitted += 1
-
-                except Exception as e:
-                    error_str = str(e)
-
-                    # Handle 409 Conflict - queue full or duplicate
-                    if "409" in error_str or "Conflict" in error_str:
-                        # Check if there's already a job for this URL
-                        try:
-                            all_jobs = yubal.list_jobs()
-                            existing_job = next(
-                                (
-                                    j
-                                    for j in all_jobs
-                                    if j.url == download.ytmusic_album_url
-                                ),
-                                None,
-                            )
-                            if existing_job:
-                                logger.info(
-                                    "Found existing job for %s, linking to job %s",
-                                    download.album_name,
-                                    existing_job.id,
-                                )
-                                download.yubal_job_id = existing_job.id
-                                download.status = DownloadStatus.QUEUED
-                                download.queued_at = datetime.now(timezone.utc)
-                                session.commit()
-                                submitted += 1
-                                continue
-                        except Exception as list_err:
-                            logger.warning(
-                                "Failed to check for existing jobs: %s", list_err
-                            )
-
-                        # Queue is full - leave in PENDING for background task
-                        logger.warning(
-                            "Yubal queue full for %s, leaving pending",
-                            download.album_name,
-                        )
-                        # Leave download in PENDING state, don't mark as failed
-                        break  # Stop trying to submit more
-                    else:
-                        logger.error(
-                            "Failed to submit album %s: %s", download.album_name, e
-                        )
-                        download.status = DownloadStatus.FAILED
-                        download.error_message = str(e)
-
-                    session.commit()
-
-            # Report progress for submitted downloads
-            if on_progress and albums_to_download:
-                submitted_count = sum(
-                    1 for d in albums_to_download.values() if d.yubal_job_id
-                )
-                on_progress(
-                    f"Submitted {submitted_count} album(s) for download",
-                    progress_end,
-                )
-
-            logger.info(
-                "Submitted %d album(s) for download. Background task will track completion.",
-                len([d for d in albums_to_download.values() if d.yubal_job_id]),
+        # Report progress for submitted downloads
+        submitted_count = sum(1 for d in albums_to_download.values() if d.yubal_job_id)
+        if on_progress:
+            on_progress(
+                f"Submitted {submitted_count} album(s) for download",
+                progress_end,
             )
 
-        finally:
-            yubal.close()
+        logger.info(
+            "Submitted %d of %d album(s) for download. Background task will track completion.",
+            submitted_count,
+            len(albums_to_download),
+        )
 
     def _cache_mbid_mapping(
         self,
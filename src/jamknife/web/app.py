@@ -1,7 +1,9 @@
 """FastAPI web application for Jamknife."""
 
+import contextvars
 import logging
 from contextlib import asynccontextmanager
+from dataclasses import asdict
 from datetime import datetime, timezone
 from typing import Annotated
 
@@ -11,7 +13,9 @@ from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
-from jamknife.clients.yubal import YubalClient
+from jamknife.clients.plex import PlexClientPool
+from jamknife.clients.ytmusic import YTMusicPool
+from jamknife.clients.yubal import YubalClient, YubalJobFeed, YubalSnapshot
 from jamknife.config import get_config
 from jamknife.database import (
     AlbumDownload,
@@ -22,6 +26,7 @@ from jamknife.database import (
     TrackMatch,
     init_database,
 )
+from jamknife.services.downloads import DownloadScheduler, PollCadence
 from jamknife.services.sync import PlaylistSyncService
 
 logger = logging.getLogger(__name__)
@@ -29,6 +34,13 @@ logger = logging.getLogger(__name__)
 # Global state
 _session_factory = None
 _sync_service = None
+_status_loop = None
+_status_wakeup = None
+_job_feed = None
+
+# Set in the status loop's context (and copied into the threads it starts),
+# so downloads the loop submits itself don't wake it for another pass
+_in_status_loop = contextvars.ContextVar("in_status_loop", default=False)
 
 
 def get_session():
@@ -53,89 +65,48 @@ SessionDep = Annotated[Session, Depends(get_session)]
 SyncServiceDep = Annotated[PlaylistSyncService, Depends(get_sync_service)]
 
 
-async def submit_pending_downloads(session: Session, config):
-    """Submit pending downloads if there's space in the Yubal queue."""
+async def submit_pending_downloads(config, snapshot: YubalSnapshot | None = None):
+    """Submit pending downloads if there's space in the Yubal queue.
 
-    # Get pending downloads
-    pending_downloads = (
-        session.query(AlbumDownload)
-        .filter(AlbumDownload.status == DownloadStatus.PENDING)
-        .filter(AlbumDownload.yubal_job_id.is_(None))
-        .order_by(AlbumDownload.created_at)
-        .limit(20)  # Limit to avoid overwhelming
-        .all()
-    )
+    Reads queue size and existing jobs from the snapshot taken for this
+    tick, if given, instead of listing Yubal's jobs again. The scheduler
+    blocks on Yubal requests and on passes run by sync jobs, so it runs in
+    a worker thread with its own session.
+    """
+    import asyncio
 
-    if not pending_downloads:
-        return
+    if not _sync_service:
+        return 0
 
-    # Check Yubal queue space
-    yubal = YubalClient(config.yubal_url)
     try:
-        all_jobs = yubal.list_jobs()
-        active_jobs = [j for j in all_jobs if j.status.is_active]
-        current_queue_size = len(active_jobs)
-        max_queue_size = 18  # Leave buffer
-        available_slots = max(0, max_queue_size - current_queue_size)
-
-        if available_slots == 0:
-            return
-
-        logger.info(
-            "Submitting pending downloads: %d pending, %d slots available",
-            len(pending_downloads),
-            available_slots,
+        return await asyncio.to_thread(
+            _sync_service.download_scheduler.submit, None, snapshot
         )
+    except Exception as e:
+        logger.error("Error submitting pending downloads: %s", e)
+        return 0
 
-        submitted = 0
-        for download in pending_downloads[:available_slots]:
-            try:
-                # Check if job already exists for this URL
-                existing_job = next(
-                    (j for j in all_jobs if j.url == download.ytmusic_album_url),
-                    None,
-                )
-                if existing_job:
-                    logger.info(
-                        "Found existing job %s for pending download %d",
-                        existing_job.id,
-                        download.id,
-                    )
-                    download.yubal_job_id = existing_job.id
-                    download.status = DownloadStatus.QUEUED
-                    download.queued_at = datetime.now(timezone.utc)
-                    submitted += 1
-                else:
-                    job = yubal.create_job(download.ytmusic_album_url)
-                    download.yubal_job_id = job.id
-                    download.status = DownloadStatus.QUEUED
-                    download.queued_at = datetime.now(timezone.utc)
-                    submitted += 1
-                    logger.info(
-                        "Submitted pending download: %s - %s",
-                        download.artist_name,
-                        download.album_name,
-                    )
-            except Exception as e:
-                if "409" in str(e) or "Conflict" in str(e):
-                    # Queue full, stop trying
-                    logger.info("Yubal queue full, stopping pending submission")
-                    break
-                else:
-                    logger.warning(
-                        "Failed to submit pending download %d: %s", download.id, e
-                    )
-                    download.status = DownloadStatus.FAILED
-                    download.error_message = str(e)
 
-        if submitted > 0:
-            session.commit()
-            logger.info("Submitted %d pending download(s)", submitted)
+def wake_download_status_loop():
+    """Make the status loop poll Yubal now instead of at its next interval.
 
-    except Exception as e:
-        logger.error("Error submitting pending downloads: %s", e)
-    finally:
-        yubal.close()
+    Safe to call from any thread; the scheduler calls it after submitting
+    downloads so new jobs are tracked right away.
+    """
+    import asyncio
+
+    if _status_loop is None or _status_wakeup is None or _in_status_loop.get():
+        return
+
+    try:
+        running_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+
+    if running_loop is _status_loop:
+        _status_wakeup.set()
+    else:
+        _status_loop.call_soon_threadsafe(_status_wakeup.set)
 
 
 async def check_and_resume_sync_jobs(session: Session):
@@ -192,16 +163,32 @@ def resume_sync_job(job_id: int):
 
 
 async def update_download_statuses_loop(config):
-    """Background task to periodically update download statuses from Yubal."""
+    """Background task to periodically update download statuses from Yubal.
+
+    Polls often while downloads are close to finishing, backs off while
+    nothing is active, and wakes up early when downloads are submitted
+    (see PollCadence and wake_download_status_loop). While Yubal pushes
+    job events, job state comes from the live feed, which also wakes the
+    loop on status changes; otherwise each pass lists Yubal's jobs.
+    """
     import asyncio
 
     from jamknife.clients.yubal import JobStatus as YubalJobStatus
 
     logger.info("Starting download status update loop")
 
+    _in_status_loop.set(True)
+    cadence = PollCadence()
     while True:
         try:
-            await asyncio.sleep(30)  # Update every 30 seconds
+            # Not wait_for: on 3.11 it swallows a cancel that lands as the
+            # wakeup fires, and shutdown would then wait forever
+            try:
+                async with asyncio.timeout(cadence.interval):
+                    await _status_wakeup.wait()
+            except TimeoutError:
+                pass
+            _status_wakeup.clear()
 
             if not _session_factory:
                 continue
@@ -225,15 +212,22 @@ async def update_download_statuses_loop(config):
                 )
 
                 if not active_downloads:
+                    # Nothing to track, but pending downloads may still fit
+                    snapshot = _job_feed.snapshot() if _job_feed else None
+                    if await submit_pending_downloads(config, snapshot):
+                        cadence.reset()
+                    else:
+                        cadence.record({})
                     continue
 
-                # Fetch all jobs from Yubal once
-                yubal = YubalClient(config.yubal_url)
-                try:
-                    all_jobs = yubal.list_jobs()
-                    jobs_by_id = {job.id: job for job in all_jobs}
-                finally:
-                    yubal.close()
+                # Use pushed job state if live, else fetch all jobs once
+                snapshot = _job_feed.snapshot() if _job_feed else None
+                if snapshot is None:
+                    yubal = YubalClient(config.yubal_url)
+                    try:
+                        snapshot = yubal.snapshot()
+                    finally:
+                        yubal.close()
 
                 # Update each download based on job status
                 updated_count = 0
@@ -260,7 +254,7 @@ async def update_download_statuses_loop(config):
                                 updated_count += 1
                                 continue
 
-                    job = jobs_by_id.get(download.yubal_job_id)
+                    job = snapshot.get(download.yubal_job_id)
                     if not job:
                         # Job not found in Yubal - might have been deleted or very old
                         if download.status == DownloadStatus.DOWNLOADING:
@@ -302,8 +296,18 @@ async def update_download_statuses_loop(config):
                 if updated_count > 0:
                     logger.info("Updated %d download(s) from Yubal", updated_count)
 
+                # Poll again when the first in-flight download should be done
+                cadence.record(
+                    {
+                        download.id: download.progress or 0.0
+                        for download in active_downloads
+                        if download.status
+                        not in (DownloadStatus.COMPLETED, DownloadStatus.FAILED)
+                    }
+                )
+
                 # Try to submit pending downloads if queue has space
-                await submit_pending_downloads(session, config)
+                await submit_pending_downloads(config, snapshot)
 
                 # Check for sync jobs that can now continue
                 if updated_count > 0 and _sync_service:
@@ -326,7 +330,7 @@ async def lifespan(app: FastAPI):
     """Application lifespan manager."""
     import asyncio
 
-    global _session_factory, _sync_service
+    global _session_factory, _sync_service, _status_loop, _status_wakeup, _job_feed
 
     config = get_config()
 
@@ -346,10 +350,27 @@ async def lifespan(app: FastAPI):
     with _session_factory() as session:
         run_migrations(session, ALL_MIGRATIONS)
 
-    # Initialize sync service
-    _sync_service = PlaylistSyncService(config, _session_factory)
+    # Initialize sync service with Plex and YouTube Music connection pools
+    # shared by all jobs
+    plex_pool = PlexClientPool(
+        config.plex_url,
+        config.plex_token,
+        config.plex_music_library,
+        config.plex_verify_ssl,
+    )
+    ytmusic_pool = YTMusicPool(config.ytmusic_pool_size)
+    _sync_service = PlaylistSyncService(
+        config, _session_factory, plex_pool=plex_pool, ytmusic_pool=ytmusic_pool
+    )
 
-    # Start background task to update download statuses
+    # Start background task to update download statuses, woken early
+    # whenever the scheduler submits downloads
+    _status_loop = asyncio.get_running_loop()
+    _status_wakeup = asyncio.Event()
+    _sync_service.download_scheduler.add_submit_listener(wake_download_status_loop)
+    if config.yubal_push_updates:
+        _job_feed = YubalJobFeed(config.yubal_url, on_change=wake_download_status_loop)
+        _job_feed.start()
     update_task = asyncio.create_task(update_download_statuses_loop(config))
 
     logger.info("Jamknife started")
@@ -361,7 +382,14 @@ async def lifespan(app: FastAPI):
         await update_task
     except asyncio.CancelledError:
         pass
-
+    if _job_feed is not None:
+        _job_feed.stop()
+        _job_feed = None
+    _status_loop = None
+    _status_wakeup = None
+
+    plex_pool.close()
+    ytmusic_pool.close()
     logger.info("Jamknife shutting down")
 
 
@@ -428,6 +456,7 @@ class AlbumDownloadResponse(BaseModel):
     ytmusic_album_id: str
     album_name: str
     artist_name: str
+    track_name: str | None = None
     status: str
     progress: float
     error_message: str | None
@@ -482,6 +511,18 @@ class StatusResponse(BaseModel):
     pending_downloads: int
 
 
+class RateLimiterMetricsResponse(BaseModel):
+    """Response model for rate limiter metrics."""
+
+    rate: float
+    max_rate: float
+    tokens: float
+    queue_depth: int
+    calls: int
+    throttled: int
+    paused_for: float
+
+
 # ============================================================================
 # API Routes
 # ============================================================================
@@ -525,6 +566,15 @@ async def get_status(session: SessionDep) -> StatusResponse:
     )
 
 
+@app.get("/api/metrics/ytmusic")
+async def get_ytmusic_metrics(
+    sync_service: SyncServiceDep,
+) -> RateLimiterMetricsResponse:
+    """Get the current YouTube Music request rate and queue depth."""
+    metrics = sync_service.ytmusic_rate_limiter.metrics()
+    return RateLimiterMetricsResponse(**asdict(metrics))
+
+
 @app.get("/api/playlists")
 async def list_playlists(session: SessionDep) -> list[PlaylistResponse]:
     """List all tracked playlists."""
@@ -849,6 +899,7 @@ async def list_downloads(
             ytmusic_album_id=d.ytmusic_album_id,
             album_name=d.album_name,
             artist_name=d.artist_name,
+            track_name=d.track_name,
             status=d.status.value,
             progress=d.progress,
             error_message=d.error_message,
@@ -887,6 +938,7 @@ async def list_active_downloads(
             ytmusic_album_id=d.ytmusic_album_id,
             album_name=d.album_name,
             artist_name=d.artist_name,
+            track_name=d.track_name,
             status=d.status.value,
             progress=d.progress,
             error_message=d.error_message,
@@ -912,77 +964,19 @@ async def retry_download(
             status_code=400, detail="Only failed downloads can be retried"
         )
 
-    # Reset the download to pending
+    # Reset the download to pending, ahead of downloads nobody asked for
     download.status = DownloadStatus.PENDING
+    download.yubal_job_id = None
+    download.priority = max(download.priority, DownloadScheduler.RETRY_PRIORITY)
     download.progress = 0
     download.error_message = None
     download.completed_at = None
     session.commit()
 
-    # Queue the download in the background
-    config = get_config()
-    yubal = YubalClient(config.yubal_url)
-
-    def start_download():
-        try:
-            job = yubal.create_job(url=download.ytmusic_album_url)
-            # Update status to queued
-            s = _session_factory()
-            try:
-                d = s.query(AlbumDownload).filter_by(id=download_id).first()
-                if d:
-                    d.status = DownloadStatus.QUEUED
-                    d.yubal_job_id = job.id
-                    d.queued_at = datetime.now(timezone.utc)
-                    s.commit()
-            finally:
-                s.close()
-        except Exception as e:
-            logger.exception("Failed to retry download %d", download_id)
-
-            # Handle 409 Conflict - check for existing job
-            if "409" in str(e) or "Conflict" in str(e):
-                try:
-                    all_jobs = yubal.list_jobs()
-                    existing_job = next(
-                        (j for j in all_jobs if j.url == download.ytmusic_album_url),
-                        None,
-                    )
-                    if existing_job:
-                        logger.info(
-                            "Found existing job %s for download %d, linking",
-                            existing_job.id,
-                            download_id,
-                        )
-                        s = _session_factory()
-                        try:
-                            d = s.query(AlbumDownload).filter_by(id=download_id).first()
-                            if d:
-                                d.status = DownloadStatus.QUEUED
-                                d.yubal_job_id = existing_job.id
-                                d.queued_at = datetime.now(timezone.utc)
-                                s.commit()
-                        finally:
-                            s.close()
-                        return
-                except Exception as list_err:
-                    logger.warning("Failed to check for existing jobs: %s", list_err)
-
-            # Failed - update download status
-            s = _session_factory()
-            try:
-                d = s.query(AlbumDownload).filter_by(id=download_id).first()
-                if d:
-                    d.status = DownloadStatus.FAILED
-                    if "409" in str(e) or "Conflict" in str(e):
-                        d.error_message = "Yubal queue full - try again later"
-                    else:
-                        d.error_message = str(e)
-                    s.commit()
-            finally:
-                s.close()
-
-    background_tasks.add_task(start_download)
+    # Submit it in the background if Yubal has room; otherwise the status
+    # loop submits it when a slot frees up
+    if _sync_service:
+        background_tasks.add_task(_sync_service.download_scheduler.submit)
 
     return {"message": "Download retry initiated", "download_id": download_id}
 
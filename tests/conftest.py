@@ -0,0 +1,147 @@
+"""Shared test fixtures."""
+
+import json
+import queue
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class FakeYubal:
+    """Minimal Yubal API served on a local port.
+
+    Serves the job list and job creation, plus the job event stream when
+    push is enabled (otherwise the stream endpoint is a 404, like a Yubal
+    without job events).
+    """
+
+    def __init__(self, push: bool):
+        self.push = push
+        self.jobs: dict[str, dict] = {}
+        self.list_calls = 0
+        self.event_requests = 0
+        self._subscribers: list[queue.Queue] = []
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    @property
+    def subscribers(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def add_job(self, job_id: str, url: str, **fields) -> dict:
+        """Add a job without announcing it."""
+        job = {"id": job_id, "url": url, "status": "pending", "progress": 0.0}
+        job.update(fields)
+        with self._lock:
+            self.jobs[job_id] = job
+        return job
+
+    def update_job(self, job_id: str, **fields) -> None:
+        """Change a job and push it to subscribers."""
+        with self._lock:
+            self.jobs[job_id].update(fields)
+            job = dict(self.jobs[job_id])
+        self._publish("job", job)
+
+    def disconnect(self) -> None:
+        """Close every open event stream."""
+        self._publish(None, None)
+
+    def close(self) -> None:
+        self._closed.set()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _publish(self, event_type: str | None, data: dict | None) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            subscriber.put((event_type, data))
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, status: int, payload: dict) -> None:
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path == "/api/jobs":
+                    with fake._lock:
+                        fake.list_calls += 1
+                        jobs = [dict(job) for job in fake.jobs.values()]
+                    self._send_json(200, {"jobs": jobs})
+                elif self.path == "/api/jobs/events":
+                    with fake._lock:
+                        fake.event_requests += 1
+                    if not fake.push:
+                        self._send_json(404, {"detail": "Not Found"})
+                        return
+                    self._stream_events()
+                else:
+                    self._send_json(404, {"detail": "Not Found"})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                data = json.loads(self.rfile.read(length) or b"{}")
+                job_id = f"job-{len(fake.jobs) + 1}"
+                fake.add_job(job_id, data["url"])
+                fake._publish("job", dict(fake.jobs[job_id]))
+                self._send_json(201, {"id": job_id})
+
+            def _stream_events(self):
+                subscriber: queue.Queue = queue.Queue()
+                with fake._lock:
+                    fake._subscribers.append(subscriber)
+                try:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/event-stream")
+                    self.end_headers()
+                    self.wfile.write(b": connected\n\n")
+                    self.wfile.flush()
+                    while not fake._closed.is_set():
+                        try:
+                            event_type, data = subscriber.get(timeout=0.1)
+                        except queue.Empty:
+                            continue
+                        if event_type is None:
+                            break
+                        message = f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+                        self.wfile.write(message.encode())
+                        self.wfile.flush()
+                except OSError:
+                    pass
+                finally:
+                    with fake._lock:
+                        fake._subscribers.remove(subscriber)
+
+        return Handler
+
+
+@pytest.fixture(params=[True, False], ids=["push", "polling"])
+def fake_yubal(request):
+    """Run a fake Yubal server, with and without job events."""
+    server = FakeYubal(push=request.param)
+    yield server
+    server.close()
@@ -1,12 +1,19 @@
 """Tests for client modules."""
 
-from unittest.mock import Mock, patch
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from unittest.mock import Mock, call, patch
 
 import httpx
+import pytest
+from plexapi.exceptions import NotFound
 
 from jamknife.clients.listenbrainz import ListenBrainzClient
-from jamknife.clients.ytmusic import YTMusicResolver
-from jamknife.clients.yubal import JobStatus, YubalClient
+from jamknife.clients.plex import PlexClient, PlexClientPool, plan_playlist_update
+from jamknife.clients.ytmusic import AlbumInfo, YTMusicPool, YTMusicResolver
+from jamknife.clients.yubal import Job, JobStatus, YubalClient, YubalJobFeed
 
 
 class TestListenBrainzClient:
@@ -137,6 +144,123 @@ class TestYubalClient:
         client = YubalClient("http://localhost:8000")
         assert client.health_check() is False
 
+    @patch("jamknife.clients.yubal.httpx.Client")
+    def test_create_job_does_not_list_jobs(self, mock_client_class):
+        """Test creating a job doesn't download the whole job list."""
+        mock_response = Mock()
+        mock_response.json.return_value = {"id": "job-1"}
+        mock_client = Mock()
+        mock_client.post.return_value = mock_response
+        mock_client_class.return_value = mock_client
+
+        client = YubalClient("http://localhost:8000")
+        job = client.create_job("https://music.youtube.com/playlist?list=OLAK1")
+
+        assert job.id == "job-1"
+        assert job.url == "https://music.youtube.com/playlist?list=OLAK1"
+        assert job.status == JobStatus.PENDING
+        mock_client.get.assert_not_called()
+
+    @patch("jamknife.clients.yubal.httpx.Client")
+    def test_snapshot_indexes_jobs_by_id_and_url(self, mock_client_class):
+        """Test a snapshot answers lookups from a single job listing."""
+        mock_response = Mock()
+        mock_response.json.return_value = {
+            "jobs": [
+                {"id": "old", "url": "https://yt/a", "status": "failed"},
+                {"id": "new", "url": "https://yt/a", "status": "downloading"},
+                {"id": "other", "url": "https://yt/b", "status": "completed"},
+            ]
+        }
+        mock_client = Mock()
+        mock_client.get.return_value = mock_response
+        mock_client_class.return_value = mock_client
+
+        snapshot = YubalClient("http://localhost:8000").snapshot()
+        snapshot.add(Job("created", "https://yt/c", JobStatus.PENDING, 0.0))
+
+        assert snapshot.get("old").status == JobStatus.FAILED
+        assert snapshot.find_by_url("https://yt/a").id == "new"
+        assert snapshot.find_by_url("https://yt/c").id == "created"
+        assert snapshot.find_by_url("https://yt/missing") is None
+        assert snapshot.active_count == 2
+        mock_client.get.assert_called_once()
+
+
+def wait_for(condition, timeout=5.0):
+    """Wait until condition() is true, failing after timeout seconds."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+class TestYubalJobFeed:
+    """Tests for following Yubal job events, against a local fake Yubal."""
+
+    def test_subscribe_jobs(self, fake_yubal):
+        """Test pushed job events are parsed, or None without an event stream."""
+        fake_yubal.add_job("job-1", "https://yt/1")
+
+        with YubalClient(fake_yubal.url) as client:
+            with client.subscribe_jobs() as events:
+                if not fake_yubal.push:
+                    assert events is None
+                    return
+                fake_yubal.update_job("job-1", status="downloading", progress=40)
+                event = next(events)
+
+        assert [(job.id, job.status, job.progress) for job in event.jobs] == [
+            ("job-1", JobStatus.DOWNLOADING, 40)
+        ]
+        assert not event.replace
+
+    def test_feed_follows_events_or_falls_back(self, fake_yubal):
+        """Test the feed tracks pushed changes, or stays off without events."""
+        fake_yubal.add_job("job-1", "https://yt/1", status="downloading")
+        changes = threading.Event()
+        feed = YubalJobFeed(fake_yubal.url, on_change=changes.set)
+        feed.start()
+        try:
+            if not fake_yubal.push:
+                wait_for(lambda: fake_yubal.event_requests == 1)
+                assert not feed.live
+                assert feed.snapshot() is None
+                return
+
+            wait_for(lambda: feed.live)
+            changes.clear()
+
+            fake_yubal.update_job("job-1", progress=50)
+            wait_for(lambda: feed.snapshot().get("job-1").progress == 50)
+            assert not changes.is_set()
+
+            fake_yubal.update_job("job-1", status="completed", progress=100)
+            assert changes.wait(5)
+            assert feed.snapshot().get("job-1").status == JobStatus.COMPLETED
+            # Seeded once; everything after that was pushed
+            assert fake_yubal.list_calls == 1
+        finally:
+            feed.stop()
+
+    def test_feed_reconnects_after_stream_breaks(self, fake_yubal):
+        """Test a broken stream falls back to polling until reconnected."""
+        if not fake_yubal.push:
+            pytest.skip("needs job events")
+        feed = YubalJobFeed(fake_yubal.url, reconnect_interval=0.3)
+        feed.start()
+        try:
+            wait_for(lambda: feed.live)
+
+            fake_yubal.disconnect()
+            wait_for(lambda: not feed.live)
+            assert feed.snapshot() is None
+
+            wait_for(lambda: feed.live)
+            assert fake_yubal.event_requests == 2
+        finally:
+            feed.stop()
+
 
 class TestYTMusicResolver:
     """Tests for YouTube Music resolver."""
@@ -174,3 +298,460 @@ class TestYTMusicResolver:
         result = resolver.find_album_for_track("Test Track", "Test Artist")
 
         assert result is None
+
+    @patch("jamknife.clients.ytmusic.YTMusic")
+    def test_race_overlaps_album_and_song_search(self, mock_ytmusic):
+        """Test a strategy 1 miss doesn't delay strategy 2 when racing."""
+        song_album = AlbumInfo("MPREb_2", "Single", "Artist", "https://yt/2")
+
+        def slow(result):
+            def search(*args):
+                time.sleep(0.2)
+                return result
+
+            return search
+
+        resolver = YTMusicResolver(race_strategies=True)
+        resolver._search_album = Mock(side_effect=slow(None))
+        resolver._search_song_get_album = Mock(side_effect=slow(song_album))
+
+        start = time.monotonic()
+        result = resolver.find_album_for_track("Track", "Artist", "Album")
+
+        assert result == song_album
+        assert time.monotonic() - start < 0.35
+
+    @patch("jamknife.clients.ytmusic.YTMusic")
+    def test_race_prefers_album_search(self, mock_ytmusic):
+        """Test the album search wins even when the song search answers first."""
+        album = AlbumInfo("MPREb_1", "Album", "Artist", "https://yt/1")
+        song_album = AlbumInfo("MPREb_2", "Single", "Artist", "https://yt/2")
+
+        def slow_album_search(*args):
+            time.sleep(0.1)
+            return album
+
+        resolver = YTMusicResolver(race_strategies=True)
+        resolver._search_album = Mock(side_effect=slow_album_search)
+        resolver._search_song_get_album = Mock(return_value=song_album)
+
+        assert resolver.find_album_for_track("Track", "Artist", "Album") == album
+
+    @patch("jamknife.clients.ytmusic.YTMusic")
+    def test_race_abandons_losing_song_search(self, mock_ytmusic):
+        """Test a song search that lost the race makes no further calls."""
+        album = AlbumInfo("MPREb_1", "Album", "Artist", "https://yt/1")
+        song_searching = threading.Event()
+        album_found = threading.Event()
+
+        def search(query, filter, limit):
+            song_searching.set()
+            album_found.wait(1)
+            return [
+                {
+                    "resultType": "song",
+                    "title": "Track",
+                    "artists": [{"name": "Artist"}],
+                    "album": {"id": "MPREb_2"},
+                }
+            ]
+
+        def album_search(*args):
+            song_searching.wait(1)
+            return album
+
+        mock_ytmusic.return_value.search.side_effect = search
+        resolver = YTMusicResolver(race_strategies=True)
+        resolver._search_album = Mock(side_effect=album_search)
+
+        assert resolver.find_album_for_track("Track", "Artist", "Album") == album
+        album_found.set()
+        resolver._race_executor().shutdown(wait=True)
+
+        mock_ytmusic.return_value.get_album.assert_not_called()
+
+
+class TestYTMusicPool:
+    """Tests for YTMusicPool."""
+
+    def test_resolvers_share_race_threads(self):
+        """Test racing resolvers use the pool's threads, stopped on close."""
+        pool = YTMusicPool(size=2)
+        first = YTMusicResolver(race_strategies=True, pool=pool)
+        second = YTMusicResolver(race_strategies=True, pool=pool)
+
+        executor = first._race_executor()
+        assert second._race_executor() is executor
+        assert pool.race_executor is executor
+
+        pool.close()
+        with pytest.raises(RuntimeError):
+            executor.submit(print)
+
+    @patch("jamknife.clients.ytmusic.YTMusic")
+    def test_clients_are_reused(self, mock_ytmusic):
+        """Test sequential checkouts reuse one client."""
+        mock_ytmusic.side_effect = lambda **kwargs: Mock()
+        pool = YTMusicPool(size=2)
+
+        with pool.client() as first:
+            pass
+        with pool.client() as second:
+            pass
+
+        assert first is second
+        assert mock_ytmusic.call_count == 1
+
+    @patch("jamknife.clients.ytmusic.YTMusic")
+    def test_checkout_blocks_when_exhausted(self, mock_ytmusic):
+        """Test no more than size clients are handed out at once."""
+        mock_ytmusic.side_effect = lambda **kwargs: Mock()
+        pool = YTMusicPool(size=1)
+        checked_out = threading.Event()
+
+        def borrow():
+            with pool.client():
+                checked_out.set()
+
+        with pool.client():
+            worker = threading.Thread(target=borrow)
+            worker.start()
+            assert not checked_out.wait(0.1)
+
+        worker.join(timeout=1)
+        assert checked_out.is_set()
+        assert mock_ytmusic.call_count == 1
+
+    @patch("jamknife.clients.ytmusic.YTMusic")
+    def test_resolvers_search_in_parallel(self, mock_ytmusic):
+        """Test resolvers sharing a pool run lookups concurrently."""
+
+        def slow_search(*args, **kwargs):
+            time.sleep(0.2)
+            return []
+
+        def make_client(**kwargs):
+            client = Mock()
+            client.search.side_effect = slow_search
+            return client
+
+        mock_ytmusic.side_effect = make_client
+        pool = YTMusicPool(size=2)
+        resolvers = [YTMusicResolver(pool=pool) for _ in range(2)]
+        threads = [
+            threading.Thread(target=r._search_song_get_album, args=("T", "A"))
+            for r in resolvers
+        ]
+
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert time.monotonic() - start < 0.35
+        # Only the pool's clients were created, not one per resolver
+        assert mock_ytmusic.call_count == 2
+
+
+class TestPlexClient:
+    """Tests for Plex client."""
+
+    def test_get_tracks_by_rating_keys_batches_requests(self):
+        """Test rating keys are fetched in batches and vanished keys reported."""
+
+        def fetch_items(key, container_size=None):
+            keys = key.rsplit("/", 1)[-1].split(",")
+            assert container_size == len(keys)
+            found = [Mock(ratingKey=int(k)) for k in keys if k != "3"]
+            if not found:
+                raise NotFound("not found")
+            return found
+
+        server = Mock()
+        server.fetchItems.side_effect = fetch_items
+        client = PlexClient("http://plex", "token")
+        client._server = server
+
+        lookup = client.get_tracks_by_rating_keys(
+            ["1", "2", "3", "4", "1", "bogus"], batch_size=2
+        )
+
+        assert server.fetchItems.call_count == 2
+        server.fetchItems.assert_any_call("/library/metadata/1,2", container_size=2)
+        assert set(lookup.tracks) == {"1", "2", "4"}
+        assert sorted(lookup.missing) == ["3", "bogus"]
+
+    def test_artist_search_uses_single_track_request(self):
+        """Test strategy 2 costs two requests however many albums exist."""
+        requests_made = []
+
+        def request(name, result):
+            def call(*args, **kwargs):
+                requests_made.append(name)
+                return result
+
+            return call
+
+        albums = [
+            Mock(title=f"Album {i}", tracks=request("album.tracks", []))
+            for i in range(45)
+        ]
+        wanted = Mock(title="Deep Cut", parentTitle="Album 44", ratingKey=9)
+        artist = Mock(
+            title="Prolific",
+            albums=request("artist.albums", albums),
+            tracks=request("artist.tracks", [Mock(title="Intro"), wanted]),
+        )
+        section = Mock()
+        section.searchTracks.side_effect = request("searchTracks", [])
+        section.searchArtists.side_effect = request("searchArtists", [artist])
+        client = PlexClient("http://plex", "token")
+        client._music_section = section
+
+        match = client.search_track("Deep Cut", "Prolific", "Album 44")
+
+        assert match is not None
+        assert match.rating_key == "9"
+        # Crawling album by album would cost 2 + 1 + 45 requests
+        assert requests_made == ["searchTracks", "searchArtists", "artist.tracks"]
+
+
+def _apply_playlist_plan(current, plan):
+    """Apply a PlaylistUpdatePlan to a list of keys."""
+    removed = set(plan.remove)
+    slots = [k for i, k in enumerate(current) if i not in removed] + plan.add
+    items = list(range(len(slots)))
+    for slot, after in plan.moves:
+        items.remove(slot)
+        items.insert(0 if after is None else items.index(after) + 1, slot)
+    return [slots[i] for i in items]
+
+
+class TestPlanPlaylistUpdate:
+    """Tests for the playlist diff planner."""
+
+    def test_unchanged_playlist_needs_no_edits(self):
+        """Test an identical playlist produces an empty plan."""
+        plan = plan_playlist_update(["1", "2", "3"], ["1", "2", "3"])
+        assert plan.is_empty
+
+    def test_appended_tracks_are_only_added(self):
+        """Test tracks appended at the end need no moves."""
+        plan = plan_playlist_update(["1", "2"], ["1", "2", "3"])
+        assert plan.remove == []
+        assert plan.add == ["3"]
+        assert plan.moves == []
+
+    def test_single_moved_track_costs_one_move(self):
+        """Test moving one track only moves that track."""
+        plan = plan_playlist_update(["1", "2", "3", "4"], ["4", "1", "2", "3"])
+        assert plan.remove == [] and plan.add == []
+        assert len(plan.moves) == 1
+
+    def test_random_plans_produce_desired_order(self):
+        """Test applying any plan yields the desired playlist."""
+        rng = random.Random(0)
+        for _ in range(200):
+            current = [str(rng.randint(0, 15)) for _ in range(rng.randint(0, 12))]
+            desired = [str(rng.randint(0, 15)) for _ in range(rng.randint(0, 12))]
+            plan = plan_playlist_update(current, desired)
+            assert _apply_playlist_plan(current, plan) == desired
+
+    def test_update_playlist_applies_minimal_edits(self):
+        """Test update_playlist removes and adds without recreating."""
+        existing = [
+            Mock(ratingKey=1, playlistItemID=101),
+            Mock(ratingKey=2, playlistItemID=102),
+        ]
+        playlist = Mock(key="/playlists/9", smart=False)
+        playlist.items.return_value = existing
+        server = Mock()
+        server.playlist.return_value = playlist
+        client = PlexClient("http://plex", "token")
+        client._server = server
+
+        result = client.update_playlist(
+            "Daily Jams", [Mock(ratingKey=1), Mock(ratingKey=3)]
+        )
+
+        assert result is playlist
+        playlist.removeItems.assert_called_once_with([existing[1]])
+        playlist.addItems.assert_called_once()
+        playlist.moveItem.assert_not_called()
+        server.query.assert_not_called()
+        server.createPlaylist.assert_not_called()
+        playlist.delete.assert_not_called()
+
+    def test_update_playlist_moves_through_playlist_api(self):
+        """Test reordered tracks are moved with Playlist.moveItem."""
+        existing = [Mock(ratingKey=1), Mock(ratingKey=2), Mock(ratingKey=3)]
+        playlist = Mock(key="/playlists/9", smart=False)
+        playlist.items.return_value = existing
+        server = Mock()
+        server.playlist.return_value = playlist
+        client = PlexClient("http://plex", "token")
+        client._server = server
+
+        client.update_playlist(
+            "Daily Jams", [Mock(ratingKey=3), Mock(ratingKey=1), Mock(ratingKey=2)]
+        )
+
+        playlist.moveItem.assert_called_once_with(existing[2], after=None)
+        playlist.removeItems.assert_not_called()
+        server.query.assert_not_called()
+        server.createPlaylist.assert_not_called()
+
+    def test_update_playlist_recreates_playlist_with_duplicates(self):
+        """Test a playlist listing a track twice is rebuilt, not edited."""
+        playlist = Mock(key="/playlists/9", smart=False)
+        playlist.items.return_value = [Mock(ratingKey=1), Mock(ratingKey=2)]
+        server = Mock()
+        server.playlist.return_value = playlist
+        client = PlexClient("http://plex", "token")
+        client._server = server
+        tracks = [Mock(ratingKey=1), Mock(ratingKey=2), Mock(ratingKey=1)]
+
+        client.update_playlist("Daily Jams", tracks)
+
+        playlist.removeItems.assert_not_called()
+        playlist.addItems.assert_not_called()
+        playlist.delete.assert_called_once()
+        server.createPlaylist.assert_called_once_with("Daily Jams", items=tracks)
+
+
+class TestPlexClientPool:
+    """Tests for the shared Plex connection pool."""
+
+    @patch("jamknife.clients.plex.PlexServer")
+    def test_clients_share_one_connection(self, mock_server_cls):
+        """Test the server and section are looked up only once."""
+        pool = PlexClientPool("http://plex", "token")
+
+        first = pool.get_client()
+        second = pool.get_client(library_index=Mock())
+
+        mock_server_cls.assert_called_once()
+        assert mock_server_cls.call_args.kwargs["session"] is not None
+        server = mock_server_cls.return_value
+        server.library.section.assert_called_once_with("Music")
+        assert first._get_music_section() is second._get_music_section()
+
+    @patch("jamknife.clients.plex.PlexServer")
+    def test_reconnects_after_failed_health_check(self, mock_server_cls):
+        """Test a connection that stops answering is re-established."""
+        broken = Mock()
+        broken.query.side_effect = ConnectionError("gone")
+        mock_server_cls.side_effect = [broken, Mock()]
+        pool = PlexClientPool("http://plex", "token", health_check_interval=0)
+
+        pool.get_client()
+        client = pool.get_client()
+
+        assert mock_server_cls.call_count == 2
+        assert client._connect() is not broken
+
+
+class TestPlexLibraryScan:
+    """Tests for waiting on Plex library scans."""
+
+    @patch("jamknife.clients.plex.time.sleep")
+    def test_wait_returns_once_scan_finishes(self, mock_sleep):
+        """Test waiting stops as soon as scannedAt moves past the marker."""
+        before = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        after = datetime(2024, 1, 1, 0, 5, tzinfo=timezone.utc)
+        client = PlexClient("http://plex", "token")
+        client.get_library_scan_state = Mock(
+            side_effect=[
+                (False, before),
+                (True, before),
+                (True, before),
+                (False, after),
+            ]
+        )
+
+        assert client.wait_for_library_scan(since=before, timeout=60)
+        assert client.get_library_scan_state.call_count == 4
+        assert mock_sleep.call_count == 3
+
+    @patch("jamknife.clients.plex.time.sleep")
+    def test_failed_poll_does_not_count_as_running(self, mock_sleep):
+        """Test a transient poll error doesn't end the wait early."""
+        before = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        after = datetime(2024, 1, 1, 0, 5, tzinfo=timezone.utc)
+        client = PlexClient("http://plex", "token")
+        client.get_library_scan_state = Mock(
+            side_effect=[
+                ConnectionError("timed out"),
+                (False, before),
+                (True, before),
+                (False, after),
+            ]
+        )
+
+        assert client.wait_for_library_scan(since=before, timeout=60)
+        assert client.get_library_scan_state.call_count == 4
+
+    @patch("jamknife.clients.plex.time.sleep")
+    @patch("jamknife.clients.plex.time.monotonic")
+    def test_unobserved_scan_ends_after_start_timeout(self, mock_monotonic, mock_sleep):
+        """Test a scan never seen running stops the wait at start_timeout."""
+        before = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        mock_monotonic.side_effect = [0, 1, 5, 11, 11]
+        client = PlexClient("http://plex", "token")
+        client.get_library_scan_state = Mock(return_value=(False, before))
+
+        assert client.wait_for_library_scan(since=before, timeout=60)
+        assert client.get_library_scan_state.call_count == 3
+
+    @patch("jamknife.clients.plex.time.sleep")
+    @patch("jamknife.clients.plex.time.monotonic")
+    def test_wait_gives_up_after_timeout(self, mock_monotonic, mock_sleep):
+        """Test waiting returns False when the scan outlasts the timeout."""
+        mock_monotonic.side_effect = [0, 5, 100]
+        client = PlexClient("http://plex", "token")
+        client.get_library_scan_state = Mock(return_value=(True, None))
+
+        assert not client.wait_for_library_scan(timeout=60)
+
+    def test_scan_state_reads_section_directory(self):
+        """Test the scan state is read from /library/sections."""
+        server = Mock()
+        server.query.return_value = [
+            Mock(attrib={"key": "1", "refreshing": "0"}),
+            Mock(attrib={"key": "3", "refreshing": "1", "scannedAt": "1704067200"}),
+        ]
+        client = PlexClient("http://plex", "token")
+        client._server = server
+        client._music_section = Mock(key=3)
+
+        refreshing, scanned_at = client.get_library_scan_state()
+
+        assert refreshing
+        assert scanned_at == datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def test_refresh_library_scans_only_given_paths(self):
+        """Test partial scans drop nested paths and skip the full scan."""
+        section = Mock()
+        client = PlexClient("http://plex", "token")
+        client._music_section = section
+        client.get_library_scan_state = Mock(return_value=(False, None))
+
+        client.refresh_library(["/music/A/Album", "/music/B/Album", "/music/A"])
+
+        section.update.assert_has_calls(
+            [call(path="/music/A"), call(path="/music/B/Album")]
+        )
+        assert section.update.call_count == 2
+        section.refresh.assert_not_called()
+
+    def test_refresh_library_collapses_many_paths(self):
+        """Test that too many folders are scanned through their common parent."""
+        section = Mock()
+        client = PlexClient("http://plex", "token")
+        client._music_section = section
+        client.get_library_scan_state = Mock(return_value=(False, None))
+
+        client.refresh_library([f"/music/Artist {i}/Album" for i in range(20)])
+
+        section.update.assert_called_once_with(path="/music")
@@ -52,6 +52,26 @@ def test_config_validation_complete(monkeypatch):
     assert len(errors) == 0
 
 
+def test_config_validation_rejects_zero_concurrency(monkeypatch):
+    """Test match concurrency settings must allow at least one lookup."""
+    monkeypatch.setenv("PLEX_MATCH_CONCURRENCY", "0")
+    monkeypatch.setenv("YTMUSIC_MATCH_CONCURRENCY", "-1")
+
+    errors = Config().validate()
+
+    assert any("PLEX_MATCH_CONCURRENCY" in e for e in errors)
+    assert any("YTMUSIC_MATCH_CONCURRENCY" in e for e in errors)
+
+
+def test_config_validation_rejects_non_positive_rate_limit(monkeypatch):
+    """Test the YouTube Music rate limit must be positive."""
+    monkeypatch.setenv("YTMUSIC_RATE_LIMIT", "0")
+
+    errors = Config().validate()
+
+    assert any("YTMUSIC_RATE_LIMIT" in e for e in errors)
+
+
 def test_db_path():
     """Test database path property."""
     config = Config()
@@ -0,0 +1,309 @@
+"""Tests for the download scheduler."""
+
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from jamknife.clients.yubal import Job, JobStatus, YubalClient, YubalSnapshot
+from jamknife.database import (
+    AlbumDownload,
+    Base,
+    DownloadStatus,
+    ListenBrainzPlaylist,
+    PlaylistSyncJob,
+    SyncStatus,
+    TrackMatch,
+)
+from jamknife.services.downloads import (
+    DownloadScheduler,
+    PollCadence,
+    critical_path,
+    prefer_track_downloads,
+)
+
+
+@pytest.fixture
+def session_factory():
+    """Create an in-memory database and return its session factory."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def yubal(monkeypatch):
+    """Fake Yubal: records created jobs and serves them from list_jobs."""
+    state = {"jobs": [], "created": [], "full_after": None}
+
+    def create_job(self, url):
+        if (
+            state["full_after"] is not None
+            and len(state["created"]) >= state["full_after"]
+        ):
+            request = httpx.Request("POST", "http://yubal/api/jobs")
+            response = httpx.Response(409, request=request)
+            raise httpx.HTTPStatusError(
+                "409 Conflict", request=request, response=response
+            )
+        job = Job(f"job-{len(state['created'])}", url, JobStatus.PENDING, 0.0)
+        state["created"].append(url)
+        state["jobs"].append(job)
+        return job
+
+    monkeypatch.setattr(YubalClient, "list_jobs", lambda self: list(state["jobs"]))
+    monkeypatch.setattr(YubalClient, "create_job", create_job)
+    return state
+
+
+def add_sync_job(session, name, status=SyncStatus.DOWNLOADING):
+    """Create a playlist and a sync job for it."""
+    playlist = ListenBrainzPlaylist(mbid=f"{name}-mbid", name=name, creator="lb")
+    session.add(playlist)
+    session.flush()
+    job = PlaylistSyncJob(playlist_id=playlist.id, status=status)
+    session.add(job)
+    session.flush()
+    return job
+
+
+def add_job_with_downloads(session, name, count, priority=0, created_at=None):
+    """Create a sync job waiting on count pending album downloads."""
+    job = add_sync_job(session, name)
+    for i in range(count):
+        download = AlbumDownload(
+            ytmusic_album_id=f"{name}-{i}",
+            ytmusic_album_url=f"https://yt/{name}/{i}",
+            album_name=f"{name} {i}",
+            artist_name="Artist",
+            priority=priority,
+            created_at=created_at or datetime.now(timezone.utc),
+        )
+        session.add(download)
+        session.flush()
+        session.add(
+            TrackMatch(
+                sync_job_id=job.id,
+                position=i,
+                recording_mbid=f"{name}-rec-{i}",
+                track_name=f"Track {i}",
+                artist_name="Artist",
+                album_download_id=download.id,
+            )
+        )
+    session.commit()
+
+
+def test_slots_are_shared_between_sync_jobs(session_factory, yubal):
+    """Test a large older job doesn't take every free slot."""
+    scheduler = DownloadScheduler("http://yubal", session_factory, max_queue_size=4)
+    with session_factory() as session:
+        earlier = datetime.now(timezone.utc) - timedelta(hours=1)
+        add_job_with_downloads(session, "big", 10, created_at=earlier)
+        add_job_with_downloads(session, "small", 2)
+
+    assert scheduler.submit() == 4
+
+    assert sorted(yubal["created"]) == [
+        "https://yt/big/0",
+        "https://yt/big/1",
+        "https://yt/small/0",
+        "https://yt/small/1",
+    ]
+
+
+def test_higher_priority_goes_first(session_factory, yubal):
+    """Test priority outranks fair sharing and age."""
+    scheduler = DownloadScheduler("http://yubal", session_factory, max_queue_size=2)
+    with session_factory() as session:
+        earlier = datetime.now(timezone.utc) - timedelta(hours=1)
+        add_job_with_downloads(session, "old", 3, created_at=earlier)
+        add_job_with_downloads(session, "retried", 2, priority=10)
+
+    scheduler.submit()
+
+    assert yubal["created"] == ["https://yt/retried/0", "https://yt/retried/1"]
+
+
+def test_no_slots_when_queue_is_full(session_factory, yubal):
+    """Test nothing is submitted while Yubal's queue is at the limit."""
+    scheduler = DownloadScheduler("http://yubal", session_factory, max_queue_size=1)
+    yubal["jobs"].append(Job("busy", "https://yt/other", JobStatus.DOWNLOADING, 0.1))
+    with session_factory() as session:
+        add_job_with_downloads(session, "job", 1)
+
+    assert scheduler.submit() == 0
+    assert yubal["created"] == []
+
+
+def test_conflict_leaves_remaining_downloads_pending(session_factory, yubal):
+    """Test a 409 stops the pass without failing downloads."""
+    yubal["full_after"] = 1
+    scheduler = DownloadScheduler("http://yubal", session_factory)
+    with session_factory() as session:
+        add_job_with_downloads(session, "job", 3)
+
+    assert scheduler.submit() == 1
+
+    with session_factory() as session:
+        statuses = sorted(d.status for d in session.query(AlbumDownload))
+    assert statuses == [
+        DownloadStatus.PENDING,
+        DownloadStatus.PENDING,
+        DownloadStatus.QUEUED,
+    ]
+
+
+def test_existing_jobs_are_linked_unless_failed(session_factory, yubal):
+    """Test live jobs for a URL are reused but failed ones are resubmitted."""
+    scheduler = DownloadScheduler("http://yubal", session_factory)
+    snapshot = YubalSnapshot(
+        [
+            Job("live", "https://yt/job/0", JobStatus.DOWNLOADING, 0.5),
+            Job("dead", "https://yt/job/1", JobStatus.FAILED, 0.0),
+        ]
+    )
+    with session_factory() as session:
+        add_job_with_downloads(session, "job", 2)
+
+        assert scheduler.submit(session, snapshot) == 2
+
+        job_ids = {
+            d.ytmusic_album_url: d.yubal_job_id for d in session.query(AlbumDownload)
+        }
+    assert job_ids["https://yt/job/0"] == "live"
+    assert job_ids["https://yt/job/1"] == "job-0"
+    assert yubal["created"] == ["https://yt/job/1"]
+
+
+def test_listeners_are_called_after_submitting(session_factory, yubal):
+    """Test submit listeners run only for passes that submitted something."""
+    scheduler = DownloadScheduler("http://yubal", session_factory)
+    calls = []
+    scheduler.add_submit_listener(lambda: calls.append("submitted"))
+
+    assert scheduler.submit() == 0
+    with session_factory() as session:
+        add_job_with_downloads(session, "job", 1)
+    assert scheduler.submit() == 1
+
+    assert calls == ["submitted"]
+
+
+def test_critical_path_scores_downloads_by_jobs_unblocked(session_factory):
+    """Test scores grow with tracks unblocked and shrink with work left."""
+    with session_factory() as session:
+        downloads = [
+            AlbumDownload(
+                ytmusic_album_id=f"album-{i}",
+                ytmusic_album_url=f"https://yt/album/{i}",
+                album_name=f"Album {i}",
+                artist_name="Artist",
+            )
+            for i in range(3)
+        ]
+        session.add_all(downloads)
+        nearly_done = add_sync_job(session, "nearly-done")
+        started = add_sync_job(session, "started")
+        finished = add_sync_job(session, "finished", status=SyncStatus.COMPLETED)
+        waits = [
+            (nearly_done, downloads[0]),
+            (nearly_done, downloads[0]),
+            (started, downloads[0]),
+            (started, downloads[1]),
+            (started, downloads[2]),
+            (finished, downloads[2]),
+        ]
+        for position, (job, download) in enumerate(waits):
+            session.add(
+                TrackMatch(
+                    sync_job_id=job.id,
+                    position=position,
+                    recording_mbid=f"rec-{position}",
+                    track_name=f"Track {position}",
+                    artist_name="Artist",
+                    album_download_id=download.id,
+                )
+            )
+        session.commit()
+
+        path = critical_path(session)
+
+        # nearly-done: 2 tracks, last download; started: 1 track of 3 downloads
+        assert path.scores[downloads[0].id] == pytest.approx(3 + 2 / 3)
+        assert path.scores[downloads[1].id] == pytest.approx(2 / 3)
+        assert path.scores[downloads[2].id] == pytest.approx(2 / 3)
+        assert path.owners[downloads[0].id] == nearly_done.id
+        assert path.owners[downloads[2].id] == started.id
+
+
+def test_job_closest_to_done_is_submitted_first(session_factory, yubal):
+    """Test a job's last album isn't stuck behind a job that just started."""
+    scheduler = DownloadScheduler("http://yubal", session_factory, max_queue_size=1)
+    with session_factory() as session:
+        earlier = datetime.now(timezone.utc) - timedelta(minutes=10)
+        add_job_with_downloads(session, "started", 20, created_at=earlier)
+        add_job_with_downloads(session, "last-album", 1)
+
+    scheduler.submit()
+
+    assert yubal["created"] == ["https://yt/last-album/0"]
+
+
+def test_jobs_with_similar_scores_take_turns(session_factory, yubal):
+    """Test a slightly older job doesn't take every slot from a similar one."""
+    scheduler = DownloadScheduler("http://yubal", session_factory, max_queue_size=4)
+    with session_factory() as session:
+        earlier = datetime.now(timezone.utc) - timedelta(minutes=10)
+        add_job_with_downloads(session, "older", 4, created_at=earlier)
+        add_job_with_downloads(session, "newer", 4)
+
+    scheduler.submit()
+
+    assert yubal["created"] == [
+        "https://yt/older/0",
+        "https://yt/newer/0",
+        "https://yt/older/1",
+        "https://yt/newer/1",
+    ]
+
+
+@pytest.mark.parametrize(
+    ("needed", "track_count", "threshold", "expected"),
+    [
+        (1, 25, 0.2, True),
+        (5, 25, 0.2, True),
+        (6, 25, 0.2, False),
+        (1, 3, 0.2, False),
+        (1, None, 0.2, False),
+        (1, 25, 0, False),
+    ],
+)
+def test_prefer_track_downloads(needed, track_count, threshold, expected):
+    """Test tracks are downloaded alone only when they're a small share."""
+    assert prefer_track_downloads(needed, track_count, threshold) is expected
+
+
+def test_poll_cadence_backs_off_when_idle():
+    """Test idle polls double the interval up to the maximum."""
+    cadence = PollCadence(min_interval=5, busy_interval=30, max_interval=200)
+
+    intervals = [cadence.record({}, now=float(i)) for i in range(4)]
+
+    assert intervals == [60, 120, 200, 200]
+    cadence.reset()
+    assert cadence.interval == 30
+
+
+def test_poll_cadence_follows_download_progress():
+    """Test polls come sooner as the fastest download nears completion."""
+    cadence = PollCadence(min_interval=5, busy_interval=30, max_interval=600)
+
+    # No progress delta yet
+    assert cadence.record({1: 10.0, 2: 50.0}, now=0.0) == 30
+    # Download 2 gains 1%/s with 20% left; download 1 stalls
+    assert cadence.record({1: 10.0, 2: 80.0}, now=30.0) == pytest.approx(20)
+    # Nearly done: never poll faster than the minimum
+    assert cadence.record({1: 10.0, 2: 99.0}, now=50.0) == 5
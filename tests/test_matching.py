@@ -0,0 +1,34 @@
+"""Tests for shared name matching."""
+
+from jamknife.matching import names_match, normalize_name, similarity
+
+
+def test_normalize_name_folds_case_punctuation_and_diacritics():
+    """Test normalization used by both clients."""
+    assert normalize_name("The Beatles") == "beatles"
+    assert normalize_name("  Sigur Rós ") == "sigur ros"
+    assert normalize_name("Hello, World! (Live)") == "hello world live"
+    assert normalize_name("Song - Remastered: 2011") == "song remastered 2011"
+    assert normalize_name("Don’t Stop") == "dont stop"
+
+
+def test_names_match_allows_containment():
+    """Test names match when equal or one contains the other."""
+    assert names_match("Björk", "bjork")
+    assert names_match("Creep", "Creep (Acoustic)")
+    assert not names_match("Creep", "Airbag")
+    assert not names_match(None, "Airbag")
+    assert not names_match("", "Airbag")
+
+
+def test_similarity_ranks_exact_over_containment_over_fuzzy():
+    """Test similarity scores order candidates sensibly."""
+    exact = similarity("OK Computer", "ok computer")
+    contained = similarity("OK Computer", "OK Computer (Deluxe Edition)")
+    fuzzy = similarity("OK Computer", "OK Computor")
+    unrelated = similarity("OK Computer", "Kid A")
+
+    assert exact == 1.0
+    assert 0.8 < contained < 1.0
+    assert unrelated < fuzzy < 0.8
+    assert similarity(None, "Kid A") == 0.0
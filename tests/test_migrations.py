@@ -194,3 +194,86 @@ def test_migration_001_adds_playlist_fields():
     assert "sync_time" in columns
 
     session.close()
+
+
+def test_migration_002_creates_plex_tracks_fts(db_session):
+    """Test that migration 002 indexes plex_tracks rows for full-text search."""
+    run_migrations(db_session, ALL_MIGRATIONS)
+
+    db_session.execute(
+        text(
+            """
+            INSERT INTO plex_tracks
+                (rating_key, title, artist, title_norm, artist_norm, indexed_at)
+            VALUES
+                ('1', 'Airbag', 'Radiohead', 'airbag', 'radiohead', CURRENT_TIMESTAMP)
+            """
+        )
+    )
+    db_session.commit()
+
+    result = db_session.execute(
+        text("SELECT rowid FROM plex_tracks_fts WHERE plex_tracks_fts MATCH 'airbag'")
+    )
+    assert result.fetchone() is not None
+
+
+def test_migration_003_adds_download_priority():
+    """Test that migration 003 adds priority to existing album downloads."""
+    engine = create_engine("sqlite:///:memory:")
+    session = sessionmaker(bind=engine)()
+    session.execute(
+        text(
+            """
+            CREATE TABLE album_downloads (
+                id INTEGER PRIMARY KEY,
+                ytmusic_album_id VARCHAR(100) NOT NULL,
+                ytmusic_album_url VARCHAR(500) NOT NULL,
+                album_name VARCHAR(500) NOT NULL,
+                artist_name VARCHAR(500) NOT NULL,
+                status VARCHAR(11) NOT NULL
+            )
+            """
+        )
+    )
+    session.execute(
+        text(
+            """
+            INSERT INTO album_downloads
+                (ytmusic_album_id, ytmusic_album_url, album_name, artist_name, status)
+            VALUES ('MPREb_1', 'https://yt/1', 'Album', 'Artist', 'PENDING')
+            """
+        )
+    )
+    session.commit()
+
+    migration = next(m for m in ALL_MIGRATIONS if m.version == "003")
+    run_migrations(session, [migration])
+
+    priority = session.execute(text("SELECT priority FROM album_downloads")).scalar()
+    assert priority == 0
+    session.close()
+
+
+def test_migration_004_adds_track_download_columns():
+    """Test that migration 004 adds track columns to existing tables."""
+    engine = create_engine("sqlite:///:memory:")
+    session = sessionmaker(bind=engine)()
+    session.execute(
+        text("CREATE TABLE album_downloads (id INTEGER PRIMARY KEY, priority INTEGER)")
+    )
+    session.execute(
+        text("CREATE TABLE ytmusic_albums (id INTEGER PRIMARY KEY, title TEXT)")
+    )
+    session.commit()
+
+    migration = next(m for m in ALL_MIGRATIONS if m.version == "004")
+    run_migrations(session, [migration])
+
+    for table, column in (
+        ("album_downloads", "track_name"),
+        ("ytmusic_albums", "tracks"),
+    ):
+        result = session.execute(text(f"PRAGMA table_info({table})"))
+        assert column in {row[1] for row in result.fetchall()}
+    session.close()
@@ -0,0 +1,111 @@
+"""Tests for the persistent Plex track catalog."""
+
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from jamknife.clients.plex_catalog import PlexTrackCatalog
+from jamknife.clients.plex_index import IndexedTrack, PlexLibraryIndex
+from jamknife.database import Base
+from jamknife.migrations import ALL_MIGRATIONS, run_migrations
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Create a migrated database and return its session factory."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'catalog.db'}")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as session:
+        run_migrations(session, ALL_MIGRATIONS)
+    return factory
+
+
+def _entry(rating_key, title, artist, album=None, **kwargs):
+    """Create an IndexedTrack."""
+    return IndexedTrack(rating_key, title, artist, album, **kwargs)
+
+
+def test_replace_all_and_load_round_trip(session_factory):
+    """Test that a snapshot survives a reload from SQLite."""
+    catalog = PlexTrackCatalog(session_factory)
+    catalog.replace_all(
+        [
+            _entry(
+                "1",
+                "Airbag",
+                "Radiohead",
+                "OK Computer",
+                added_at=datetime(2024, 1, 1),
+                guids=("mbid://abc", "plex://track/1"),
+            ),
+            _entry("2", "Reckoner", "Radiohead", "In Rainbows"),
+        ]
+    )
+
+    loaded = {e.rating_key: e for e in catalog.load()}
+
+    assert set(loaded) == {"1", "2"}
+    assert loaded["1"].guids == ("mbid://abc", "plex://track/1")
+    assert loaded["1"].added_at == datetime(2024, 1, 1)
+    assert catalog.last_rebuilt_at() is not None
+
+
+def test_upsert_replaces_existing_rows(session_factory):
+    """Test that upserting a rating key replaces its previous row."""
+    catalog = PlexTrackCatalog(session_factory)
+    catalog.replace_all([_entry("1", "Old Title", "Artist")])
+
+    catalog.upsert([_entry("1", "New Title", "Artist"), _entry("2", "Other", "X")])
+
+    titles = sorted(e.title for e in catalog.load())
+    assert titles == ["New Title", "Other"]
+    assert catalog.search("Old Title", "Artist") == []
+
+
+def test_search_matches_all_tokens(session_factory):
+    """Test full-text search finds titles with extra words."""
+    catalog = PlexTrackCatalog(session_factory)
+    catalog.replace_all(
+        [
+            _entry("1", "Karma Police - Remastered", "Radiohead", "OK Computer"),
+            _entry("2", "Police and Thieves", "The Clash", "The Clash"),
+        ]
+    )
+
+    results = catalog.search("Karma Police", "Radiohead")
+
+    assert [e.rating_key for e in results] == ["1"]
+
+
+def test_index_loads_from_catalog_instead_of_crawling(session_factory):
+    """Test a cold index refresh reloads the catalog and only fetches deltas."""
+    catalog = PlexTrackCatalog(session_factory)
+    catalog.replace_all(
+        [
+            _entry(
+                "1", "Airbag", "Radiohead", "OK Computer", added_at=datetime(2024, 1, 1)
+            )
+        ]
+    )
+    section = Mock()
+    section.searchTracks.return_value = []
+
+    index = PlexLibraryIndex(catalog=catalog)
+    index.refresh(section)
+
+    assert index.find_track("Airbag", "Radiohead").rating_key == "1"
+    assert "filters" in section.searchTracks.call_args.kwargs
+
+
+def test_index_search_catalog_verifies_candidates(session_factory):
+    """Test catalog hits are verified with the regular matching rules."""
+    catalog = PlexTrackCatalog(session_factory)
+    catalog.replace_all([_entry("1", "Creep - Acoustic", "Radiohead", "Creep EP")])
+    index = PlexLibraryIndex(catalog=catalog)
+
+    assert index.search_catalog("Creep", "Radiohead").rating_key == "1"
+    assert index.search_catalog("Creep", "Radiohead", "Pablo Honey") is None
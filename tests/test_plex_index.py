@@ -0,0 +1,236 @@
+"""Tests for the Plex library index."""
+
+from datetime import datetime
+from unittest.mock import Mock
+from xml.etree import ElementTree
+
+from plexapi.audio import Track
+
+from jamknife.clients.plex import PlexClient
+from jamknife.clients.plex_index import IndexedTrack, PlexLibraryIndex
+
+
+def _plex_track(
+    rating_key,
+    title,
+    artist,
+    album,
+    original_title=None,
+    added_at=None,
+    guids=("plex://track/1",),
+    server=None,
+):
+    """Create a partial plexapi Track, as returned by a section search."""
+    data = ElementTree.Element(
+        "Track",
+        type="track",
+        ratingKey=str(rating_key),
+        key=f"/library/metadata/{rating_key}",
+        title=title,
+        grandparentTitle=artist,
+        parentTitle=album,
+    )
+    if original_title:
+        data.set("originalTitle", original_title)
+    if added_at:
+        data.set("addedAt", str(int(added_at.timestamp())))
+    for guid in guids:
+        ElementTree.SubElement(data, "Guid", id=guid)
+    return Track(server or Mock(), data, initpath="/library/sections/1/all")
+
+
+def _section(*tracks):
+    """Create a mock music section returning the given tracks."""
+    section = Mock()
+    section.searchTracks.return_value = list(tracks)
+    return section
+
+
+def test_rebuild_indexes_all_tracks():
+    """Test that a rebuild snapshots every track in the section."""
+    index = PlexLibraryIndex()
+    assert index.is_stale
+
+    count = index.rebuild(
+        _section(
+            _plex_track(1, "Karma Police", "Radiohead", "OK Computer"),
+            _plex_track(2, "Airbag", "Radiohead", "OK Computer"),
+        )
+    )
+
+    assert count == 2
+    assert len(index) == 2
+    assert index.is_loaded
+    assert not index.is_stale
+
+
+def test_find_track_normalizes_names():
+    """Test lookups ignore case, punctuation and a leading 'the'."""
+    index = PlexLibraryIndex()
+    index.rebuild(_section(_plex_track(1, "Help!", "The Beatles", "Help!")))
+
+    match = index.find_track("help", "Beatles")
+    assert match is not None
+    assert match.rating_key == "1"
+
+    assert index.find_track("Help", "The Rolling Stones") is None
+
+
+def test_find_track_respects_album():
+    """Test that a provided album disambiguates between versions."""
+    index = PlexLibraryIndex()
+    index.rebuild(
+        _section(
+            _plex_track(1, "Creep", "Radiohead", "Pablo Honey"),
+            _plex_track(2, "Creep", "Radiohead", "Live at the BBC"),
+        )
+    )
+
+    assert index.find_track("Creep", "Radiohead", "Live at the BBC").rating_key == "2"
+
+
+def test_find_track_on_album_uses_album_artist():
+    """Test album lookups match the album artist, not the track artist."""
+    index = PlexLibraryIndex()
+    index.rebuild(
+        _section(
+            _plex_track(
+                1,
+                "Under Pressure",
+                "Queen",
+                "Hot Space",
+                original_title="Queen & Bowie",
+            )
+        )
+    )
+
+    match = index.find_track_on_album("Hot Space", "Under Pressure", "Queen")
+    assert match is not None
+    assert match.rating_key == "1"
+
+
+def test_add_replaces_existing_entry():
+    """Test that re-adding a rating key replaces the old entry."""
+    index = PlexLibraryIndex()
+    index.add(IndexedTrack("1", "Old Title", "Artist", "Album"))
+    index.add(IndexedTrack("1", "New Title", "Artist", "Album"))
+
+    assert len(index) == 1
+    assert index.find_track("Old Title", "Artist") is None
+    assert index.find_track("New Title", "Artist").rating_key == "1"
+
+
+def test_plex_client_answers_from_index_without_searching():
+    """Test that an index hit skips the server-side search."""
+    section = _section(_plex_track(7, "Teardrop", "Massive Attack", "Mezzanine"))
+    client = PlexClient("http://plex", "token", library_index=PlexLibraryIndex())
+    client._music_section = section
+
+    match = client.search_track("Teardrop", "Massive Attack", "Mezzanine")
+
+    assert match is not None
+    assert match.rating_key == "7"
+    assert match.track is None
+    section.searchArtists.assert_not_called()
+    section.search.assert_not_called()
+    section.searchTracks.assert_called_once()
+
+
+def test_update_merges_only_changed_tracks():
+    """Test incremental updates query past the high-water mark and merge."""
+    old = _plex_track(
+        1, "Airbag", "Radiohead", "OK Computer", added_at=datetime(2024, 1, 1)
+    )
+    index = PlexLibraryIndex()
+    index.rebuild(_section(old))
+    assert index.high_water_mark == datetime(2024, 1, 1)
+
+    new = _plex_track(
+        2, "Reckoner", "Radiohead", "In Rainbows", added_at=datetime(2024, 6, 1)
+    )
+    section = _section(new)
+
+    assert index.update(section) == 1
+
+    filters = section.searchTracks.call_args.kwargs["filters"]
+    since = filters["or"][0]["addedAt>>"]
+    assert since < datetime(2024, 1, 1)
+    assert len(index) == 2
+    assert index.find_track("Reckoner", "Radiohead").rating_key == "2"
+    assert index.high_water_mark == datetime(2024, 6, 1)
+
+
+def test_refresh_rebuilds_when_never_loaded():
+    """Test the first refresh performs a full crawl."""
+    index = PlexLibraryIndex()
+    section = _section(_plex_track(1, "Airbag", "Radiohead", "OK Computer"))
+
+    index.refresh(section)
+
+    assert "filters" not in section.searchTracks.call_args.kwargs
+    assert len(index) == 1
+
+
+def test_find_by_recording_mbid_uses_guids():
+    """Test tracks are indexed by the MusicBrainz IDs in their GUIDs."""
+    index = PlexLibraryIndex()
+    index.add(
+        IndexedTrack(
+            "1",
+            "Airbag",
+            "Radiohead",
+            "OK Computer",
+            guids=("mbid://8A65705B-C08A-455B-910E-A69ED72C68F5", "plex://track/1"),
+        )
+    )
+
+    match = index.find_by_recording_mbid("8a65705b-c08a-455b-910e-a69ed72c68f5")
+    assert match is not None
+    assert match.rating_key == "1"
+
+    index.remove("1")
+    assert index.find_by_recording_mbid("8a65705b-c08a-455b-910e-a69ed72c68f5") is None
+
+
+def test_rebuild_does_not_reload_partial_tracks():
+    """Test indexing partial tracks never fetches their full metadata."""
+    server = Mock()
+    index = PlexLibraryIndex()
+
+    index.rebuild(
+        _section(
+            _plex_track(1, "Airbag", "Radiohead", "OK Computer", server=server),
+            _plex_track(
+                2, "Teardrop", "Massive Attack", "Mezzanine", "Liz", server=server
+            ),
+        )
+    )
+
+    server.query.assert_not_called()
+    assert index.get("1").artist == "Radiohead"
+    assert index.get("2").artist == "Liz"
+
+
+def test_rebuild_reads_guids_without_reloading():
+    """Test GUIDs come from the crawl, and tracks without any aren't reloaded."""
+    server = Mock()
+    section = _section(
+        _plex_track(
+            1,
+            "Airbag",
+            "Radiohead",
+            "OK Computer",
+            guids=("mbid://8a65705b-c08a-455b-910e-a69ed72c68f5",),
+            server=server,
+        ),
+        _plex_track(2, "Reckoner", "Radiohead", "In Rainbows", guids=(), server=server),
+    )
+    index = PlexLibraryIndex()
+
+    index.rebuild(section)
+
+    server.query.assert_not_called()
+    assert section.searchTracks.call_args.kwargs["includeGuids"] is True
+    match = index.find_by_recording_mbid("8a65705b-c08a-455b-910e-a69ed72c68f5")
+    assert match.rating_key == "1"
+    assert index.get("2").guids == ()
@@ -0,0 +1,81 @@
+"""Tests for the adaptive rate limiter."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+from ytmusicapi.exceptions import YTMusicServerError
+
+from jamknife.clients.rate_limit import AdaptiveRateLimiter, is_throttled
+
+
+class FakeClock:
+    """Monotonic clock advanced by sleep()."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    """Patch the limiter's clock."""
+    fake = FakeClock()
+    with (
+        patch("jamknife.clients.rate_limit.time.monotonic", fake.monotonic),
+        patch("jamknife.clients.rate_limit.time.sleep", fake.sleep),
+    ):
+        yield fake
+
+
+def test_bucket_allows_burst_then_paces_calls(clock):
+    """Test calls beyond the burst wait for tokens at the configured rate."""
+    limiter = AdaptiveRateLimiter(rate=2.0, burst=2)
+
+    for _ in range(4):
+        limiter.acquire()
+
+    assert clock.now == pytest.approx(1.0)
+    assert limiter.metrics().calls == 4
+
+
+def test_throttling_halves_rate_and_pauses(clock):
+    """Test a throttling error backs off and successes recover the rate."""
+    limiter = AdaptiveRateLimiter(rate=4.0, burst=4, recovery=1.0, backoff=10.0)
+    throttled = YTMusicServerError("Server returned HTTP 429: Too Many Requests.")
+
+    with pytest.raises(YTMusicServerError):
+        limiter.call(Mock(side_effect=throttled))
+
+    metrics = limiter.metrics()
+    assert metrics.rate == 2.0
+    assert metrics.throttled == 1
+    assert metrics.paused_for == pytest.approx(10.0)
+
+    assert limiter.call(lambda: "ok") == "ok"
+    assert clock.now >= 10.0
+    assert limiter.metrics().rate == 3.0
+
+
+def test_retry_after_header_sets_pause(clock):
+    """Test Retry-After on an HTTP error response is honoured."""
+    limiter = AdaptiveRateLimiter(backoff=60.0)
+    error = Exception("Too Many Requests")
+    error.response = Mock(status_code=429, headers={"Retry-After": "2"})
+
+    with pytest.raises(Exception, match="Too Many"):
+        limiter.call(Mock(side_effect=error))
+
+    assert limiter.metrics().paused_for == pytest.approx(2.0)
+
+
+def test_is_throttled_ignores_other_errors():
+    """Test ordinary failures don't trigger a backoff."""
+    assert not is_throttled(ValueError("Server returned HTTP 404: Not Found."))
+    assert is_throttled(YTMusicServerError("Server returned HTTP 503: Unavailable."))
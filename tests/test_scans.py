@@ -0,0 +1,91 @@
+"""Tests for targeted and coalesced Plex scans."""
+
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from jamknife.services.scans import (
+    LibraryScanCoalescer,
+    find_download_folders,
+    to_plex_paths,
+)
+
+
+def _make_album(root: Path, artist: str, album: str, mtime: float) -> Path:
+    """Create an album folder with the given modification time."""
+    folder = root / artist / album
+    folder.mkdir(parents=True)
+    os.utime(folder, (mtime, mtime))
+    return folder
+
+
+def test_find_download_folders_filters_by_time_and_album(tmp_path):
+    """Test only recent folders are returned, preferring the album name."""
+    queued = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    old = _make_album(tmp_path, "Radiohead", "Pablo Honey", queued.timestamp() - 60)
+    new = _make_album(tmp_path, "Radiohead", "OK Computer", queued.timestamp() + 60)
+    other = _make_album(tmp_path, "Bjork", "Homogenic", queued.timestamp() + 60)
+
+    assert sorted(find_download_folders(tmp_path, queued)) == sorted([new, other])
+    assert find_download_folders(tmp_path, queued, "OK Computer") == [new]
+    assert old not in find_download_folders(tmp_path, queued, "Pablo Honey")
+
+
+def test_find_download_folders_accepts_naive_times(tmp_path):
+    """Test naive database timestamps are treated as UTC."""
+    queued = datetime(2024, 1, 1)
+    folder = _make_album(
+        tmp_path,
+        "Radiohead",
+        "Kid A",
+        queued.replace(tzinfo=timezone.utc).timestamp() + 1,
+    )
+
+    assert find_download_folders(tmp_path, queued) == [folder]
+
+
+def test_to_plex_paths_maps_downloads_dir(tmp_path):
+    """Test local folders are translated to the Plex server's mount point."""
+    folder = tmp_path / "Radiohead" / "Kid A"
+
+    assert to_plex_paths([folder, folder], tmp_path, "/data/music") == [
+        "/data/music/Radiohead/Kid A"
+    ]
+    assert to_plex_paths([Path("/elsewhere")], tmp_path, "/data/music") == []
+
+
+def test_coalescer_batches_concurrent_requests():
+    """Test requests within one window produce a single scan."""
+    marker = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    scans = []
+
+    def trigger(paths):
+        scans.append(paths)
+        return marker
+
+    coalescer = LibraryScanCoalescer(trigger, window=0.2)
+    results = []
+    threads = [
+        threading.Thread(target=lambda p=p: results.append(coalescer.request([p])))
+        for p in ("/music/A", "/music/B", "/music/C")
+    ]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.01)
+    for thread in threads:
+        thread.join()
+
+    assert scans == [["/music/A", "/music/B", "/music/C"]]
+    assert results == [marker, marker, marker]
+
+
+def test_coalescer_full_scan_wins():
+    """Test a request without paths turns the batch into a full scan."""
+    scans = []
+    coalescer = LibraryScanCoalescer(lambda paths: scans.append(paths), window=0)
+
+    coalescer.request(None)
+
+    assert scans == [None]
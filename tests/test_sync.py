@@ -0,0 +1,353 @@
+"""Tests for the playlist sync service."""
+
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from jamknife.clients.listenbrainz import Track
+from jamknife.clients.plex import PlexTrackMatch, RatingKeyLookup
+from jamknife.clients.ytmusic import AlbumInfo, AlbumTrack
+from jamknife.config import Config
+from jamknife.database import (
+    AlbumDownload,
+    Base,
+    DownloadStatus,
+    ListenBrainzPlaylist,
+    MBIDPlexMapping,
+    PlaylistSyncJob,
+)
+from jamknife.services.sync import (
+    PlaylistSyncService,
+    TrackResolution,
+    plan_release_groups,
+)
+
+
+@pytest.fixture
+def session_factory():
+    """Create an in-memory database and return its session factory."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def service(session_factory):
+    """Create a sync service without a Plex library index."""
+    return PlaylistSyncService(
+        Config(plex_index_enabled=False), session_factory=session_factory
+    )
+
+
+@pytest.fixture
+def job(session_factory):
+    """Create a playlist and sync job."""
+    with session_factory() as session:
+        playlist = ListenBrainzPlaylist(
+            mbid="playlist-mbid", name="Daily Jams", creator="listenbrainz"
+        )
+        session.add(playlist)
+        session.flush()
+        job = PlaylistSyncJob(playlist_id=playlist.id)
+        session.add(job)
+        session.commit()
+        session.refresh(job)
+        return job
+
+
+def _track(title="Airbag", artist="Radiohead", album="OK Computer"):
+    """Create a ListenBrainz track."""
+    return Track(
+        recording_mbid="recording-mbid",
+        title=title,
+        artist=artist,
+        album=album,
+        release_mbid="release-mbid",
+    )
+
+
+def test_match_tracks_prefers_mbid_guid_match(service, session_factory, job):
+    """Test a GUID match resolves the track without a fuzzy search."""
+    plex = Mock()
+    plex.find_track_by_mbid.return_value = PlexTrackMatch(
+        rating_key="42", title="Airbag", artist="Radiohead", album="OK Computer"
+    )
+    ytmusic = Mock()
+
+    with session_factory() as session:
+        [match] = service._match_tracks(session, job, [_track()], plex, ytmusic, {})
+
+    assert match.matched_in_plex
+    assert match.plex_rating_key == "42"
+    plex.find_track_by_mbid.assert_called_once_with("recording-mbid")
+    plex.search_track.assert_not_called()
+    ytmusic.find_album_for_track.assert_not_called()
+
+
+def test_match_tracks_falls_back_to_search(service, session_factory, job):
+    """Test tracks without a GUID match fall back to the name search."""
+    plex = Mock()
+    plex.find_track_by_mbid.return_value = None
+    plex.search_track.return_value = PlexTrackMatch(
+        rating_key="7", title="Airbag", artist="Radiohead", album="OK Computer"
+    )
+
+    with session_factory() as session:
+        [match] = service._match_tracks(session, job, [_track()], plex, Mock(), {})
+        session.flush()
+        cached = session.query(MBIDPlexMapping).one()
+
+    assert match.plex_rating_key == "7"
+    assert cached.plex_rating_key == "7"
+
+
+def test_match_tracks_runs_concurrently_and_keeps_order(session_factory, job):
+    """Test lookups overlap up to the Plex cap while rows keep playlist order."""
+    service = PlaylistSyncService(
+        Config(
+            plex_index_enabled=False,
+            plex_match_concurrency=3,
+            ytmusic_match_concurrency=1,
+        ),
+        session_factory=session_factory,
+    )
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def search_track(title, artist, album):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        # Later tracks finish first to exercise ordering
+        time.sleep(0.05 * (10 - int(title)) / 10)
+        with lock:
+            in_flight -= 1
+        return PlexTrackMatch(rating_key=title, title=title, artist=artist, album=album)
+
+    plex = Mock()
+    plex.find_track_by_mbid.return_value = None
+    plex.search_track.side_effect = search_track
+    tracks = [
+        Track(recording_mbid=f"mbid-{i}", title=str(i), artist="Artist")
+        for i in range(10)
+    ]
+
+    with session_factory() as session:
+        matches = service._match_tracks(session, job, tracks, plex, Mock(), {})
+        session.flush()
+        cached = session.query(MBIDPlexMapping).count()
+
+    assert [m.position for m in matches] == list(range(10))
+    assert [m.plex_rating_key for m in matches] == [str(i) for i in range(10)]
+    assert cached == 10
+    assert 1 < peak <= 3
+
+
+def test_get_valid_cached_mappings_drops_vanished_keys(service, session_factory):
+    """Test cached mappings are validated with one bulk lookup."""
+    with session_factory() as session:
+        for mbid, key in (("mbid-a", "1"), ("mbid-b", "2")):
+            session.add(
+                MBIDPlexMapping(
+                    recording_mbid=mbid,
+                    plex_rating_key=key,
+                    track_title="Title",
+                    artist_name="Artist",
+                )
+            )
+        session.commit()
+
+        plex = Mock()
+        plex.find_track_by_mbid.return_value = None
+        plex.get_tracks_by_rating_keys.return_value = RatingKeyLookup(
+            tracks={"1": Mock()}, missing=["2"]
+        )
+        tracks = [
+            Track(recording_mbid="mbid-a", title="A", artist="Artist"),
+            Track(recording_mbid="mbid-b", title="B", artist="Artist"),
+            Track(recording_mbid="mbid-c", title="C", artist="Artist"),
+        ]
+
+        result = service._get_valid_cached_mappings(session, plex, tracks)
+
+    assert result == {"mbid-a": "1"}
+    plex.get_tracks_by_rating_keys.assert_called_once()
+    plex.get_track_by_rating_key.assert_not_called()
+
+
+def test_get_valid_cached_mappings_skips_tracks_found_by_mbid(service, session_factory):
+    """Test only tracks the library index can't find are validated."""
+    with session_factory() as session:
+        for mbid, key in (("mbid-a", "1"), ("mbid-b", "2")):
+            session.add(
+                MBIDPlexMapping(
+                    recording_mbid=mbid,
+                    plex_rating_key=key,
+                    track_title="Title",
+                    artist_name="Artist",
+                )
+            )
+        session.commit()
+
+        plex = Mock()
+        plex.find_track_by_mbid.side_effect = lambda mbid: (
+            PlexTrackMatch(rating_key="1", title="A", artist="Artist", album=None)
+            if mbid == "mbid-a"
+            else None
+        )
+        plex.get_tracks_by_rating_keys.return_value = RatingKeyLookup(
+            tracks={"2": Mock()}, missing=[]
+        )
+        tracks = [
+            Track(recording_mbid="mbid-a", title="A", artist="Artist"),
+            Track(recording_mbid="mbid-b", title="B", artist="Artist"),
+        ]
+
+        result = service._get_valid_cached_mappings(session, plex, tracks)
+
+    assert result == {"mbid-b": "2"}
+    plex.get_tracks_by_rating_keys.assert_called_once_with(["2"])
+
+
+def test_download_scan_paths_map_to_plex(session_factory, tmp_path):
+    """Test completed downloads are scanned at their Plex-side folders."""
+    (tmp_path / "Radiohead" / "OK Computer").mkdir(parents=True)
+    service = PlaylistSyncService(
+        Config(
+            plex_index_enabled=False,
+            downloads_dir=tmp_path,
+            plex_downloads_dir="/data/music",
+        ),
+        session_factory=session_factory,
+    )
+    download = Mock(
+        id=1,
+        status=DownloadStatus.COMPLETED,
+        album_name="OK Computer",
+        queued_at=None,
+        created_at=None,
+    )
+    job = Mock(track_matches=[Mock(album_download=download)])
+
+    assert service._get_download_scan_paths(job) == [
+        "/data/music/Radiohead/OK Computer"
+    ]
+
+    (tmp_path / "Radiohead" / "OK Computer").rmdir()
+    (tmp_path / "Radiohead").rmdir()
+    assert service._get_download_scan_paths(job) is None
+
+
+def test_plan_release_groups_groups_by_release_then_album():
+    """Test tracks are grouped by release MBID, then album and artist."""
+    resolutions = [
+        TrackResolution(Track("a", "A", "Radiohead", "OK Computer", "rel-1"), 0),
+        TrackResolution(Track("b", "B", "Radiohead", "OK Computer (1997)", "rel-1"), 1),
+        TrackResolution(Track("c", "C", "The Beatles", "Help!"), 2),
+        TrackResolution(Track("d", "D", "Beatles", "help"), 3),
+        TrackResolution(Track("e", "E", "Beatles"), 4),
+        TrackResolution(Track("f", "F", "Beatles"), 5),
+    ]
+
+    groups = plan_release_groups(resolutions)
+
+    assert [[r.position for r in g] for g in groups] == [[0, 1], [2, 3], [4], [5]]
+
+
+def test_match_tracks_resolves_each_release_once(service, session_factory, job):
+    """Test tracks from one release share a single YouTube Music lookup."""
+    album = AlbumInfo(
+        "MPREb_1", "OK Computer", "Radiohead", "https://yt/1", track_count=12
+    )
+    plex = Mock()
+    plex.find_track_by_mbid.return_value = None
+    plex.search_track.return_value = None
+    ytmusic = Mock()
+    ytmusic.find_album_for_track.return_value = album
+    tracks = [
+        Track(f"mbid-{i}", title, "Radiohead", "OK Computer", "rel-1")
+        for i, title in enumerate(["Airbag", "Paranoid Android", "Lucky"])
+    ]
+
+    with session_factory() as session:
+        matches = service._match_tracks(session, job, tracks, plex, ytmusic, {})
+        session.flush()
+        downloads = session.query(AlbumDownload).count()
+
+    ytmusic.find_album_for_track.assert_called_once()
+    assert [m.ytmusic_album_id for m in matches] == ["MPREb_1"] * 3
+    assert len({m.album_download_id for m in matches}) == 1
+    assert downloads == 1
+
+
+def test_few_tracks_of_large_album_are_downloaded_alone(service, session_factory, job):
+    """Test one track of a deluxe edition is downloaded by itself."""
+    album = AlbumInfo("MPREb_1", "OK Computer OKNOTOK", "Radiohead", "https://yt/1")
+    plex = Mock()
+    plex.find_track_by_mbid.return_value = None
+    plex.search_track.return_value = None
+    ytmusic = Mock()
+    ytmusic.find_album_for_track.return_value = album
+    ytmusic.get_album_tracks.return_value = [
+        AlbumTrack(f"video-{i}", f"Song {i}", i) for i in range(22)
+    ] + [AlbumTrack("video-airbag", "Airbag (Remastered)", 23)]
+    tracks = [Track("mbid-1", "Airbag", "Radiohead", "OK Computer OKNOTOK", "rel-1")]
+
+    with session_factory() as session:
+        matches = service._match_tracks(session, job, tracks, plex, ytmusic, {})
+        session.flush()
+        download = session.get(AlbumDownload, matches[0].album_download_id)
+
+        assert download.ytmusic_album_id == "video-airbag"
+        assert download.ytmusic_album_url.endswith("watch?v=video-airbag")
+        assert download.track_name == "Airbag (Remastered)"
+        assert matches[0].ytmusic_album_id == "MPREb_1"
+
+
+def test_album_is_downloaded_when_a_track_is_not_on_it(service, session_factory, job):
+    """Test a needed track missing from the track list keeps the album."""
+    album = AlbumInfo(
+        "MPREb_1", "OK Computer", "Radiohead", "https://yt/1", track_count=20
+    )
+    plex = Mock()
+    plex.find_track_by_mbid.return_value = None
+    plex.search_track.return_value = None
+    ytmusic = Mock()
+    ytmusic.find_album_for_track.return_value = album
+    ytmusic.get_album_tracks.return_value = [AlbumTrack("video-1", "Airbag", 1)]
+    tracks = [
+        Track("mbid-1", "Airbag", "Radiohead", "OK Computer", "rel-1"),
+        Track("mbid-2", "Lucky", "Radiohead", "OK Computer", "rel-1"),
+    ]
+
+    with session_factory() as session:
+        service._match_tracks(session, job, tracks, plex, ytmusic, {})
+        session.flush()
+        downloads = session.query(AlbumDownload).all()
+
+        assert [d.ytmusic_album_id for d in downloads] == ["MPREb_1"]
+        assert downloads[0].track_name is None
+
+
+def test_release_group_does_not_share_unrelated_album(service):
+    """Test an album that doesn't match the release isn't fanned out."""
+    single = AlbumInfo("MPREb_2", "Airbag (Single)", "Radiohead", "https://yt/2")
+    album = AlbumInfo("MPREb_1", "OK Computer", "Radiohead", "https://yt/1")
+    ytmusic = Mock()
+    ytmusic.find_album_for_track.side_effect = [single, album]
+    group = [
+        TrackResolution(Track("a", "Airbag", "Radiohead", "OK Computer", "r"), 0),
+        TrackResolution(Track("b", "Lucky", "Radiohead", "OK Computer", "r"), 1),
+        TrackResolution(Track("c", "Karma", "Radiohead", "OK Computer", "r"), 2),
+    ]
+
+    service._resolve_release_group(group, ytmusic)
+
+    assert [r.album_info for r in group] == [single, album, album]
+    assert ytmusic.find_album_for_track.call_count == 2
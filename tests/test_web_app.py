@@ -26,6 +26,7 @@ def client(tmp_path, monkeypatch):
     monkeypatch.setenv("PLEX_TOKEN", "testtoken")
     monkeypatch.setenv("YUBAL_URL", "http://yubal:8000")
     monkeypatch.setenv("PLEX_URL", "http://localhost:32400")
+    monkeypatch.setenv("YUBAL_PUSH_UPDATES", "false")
 
     templates_dir = Path(__file__).resolve().parents[1] / "src/jamknife/web/templates"
     setup_templates(str(templates_dir))
@@ -119,6 +120,17 @@ def test_list_playlists_api_returns_json(client):
     assert "sync_time" in payload[0]
 
 
+def test_ytmusic_metrics_api(client):
+    """Ensure /api/metrics/ytmusic reports the shared rate limiter."""
+    response = client.get("/api/metrics/ytmusic")
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["rate"] == payload["max_rate"]
+    assert payload["queue_depth"] == 0
+    assert payload["throttled"] == 0
+
+
 def test_index_page_renders(client):
     """Ensure index page renders with jobs and downloads."""
     _playlist_id, _job_id = _create_playlist_and_job()
@@ -189,7 +201,8 @@ def test_retry_download_endpoint(client, monkeypatch):
 
     from jamknife.clients.yubal import YubalClient
 
-    mock_job = Mock(id="job123")
+    mock_job = Mock(id="job123", url="https://music.youtube.com/browse/retry123")
+    monkeypatch.setattr(YubalClient, "list_jobs", lambda self: [])
     monkeypatch.setattr(YubalClient, "create_job", lambda self, url: mock_job)
 
     with web_app._session_factory() as session:
@@ -218,6 +231,194 @@ def test_retry_download_endpoint(client, monkeypatch):
         assert download.status in (DownloadStatus.PENDING, DownloadStatus.QUEUED)
         assert download.progress == 0
         assert download.error_message is None
+        assert download.priority > 0
+
+
+def test_submit_pending_downloads_reads_tick_snapshot(client, monkeypatch):
+    """Ensure pending submission uses the tick's snapshot instead of listing."""
+    import asyncio
+
+    from jamknife.clients.yubal import Job, JobStatus, YubalClient, YubalSnapshot
+
+    def fail_list(self):
+        raise AssertionError("list_jobs should not be called")
+
+    created = []
+
+    def create_job(self, url):
+        created.append(url)
+        return Job(f"job-{len(created)}", url, JobStatus.PENDING, 0.0)
+
+    monkeypatch.setattr(YubalClient, "list_jobs", fail_list)
+    monkeypatch.setattr(YubalClient, "create_job", create_job)
+
+    existing_url = "https://music.youtube.com/browse/existing"
+    new_url = "https://music.youtube.com/browse/new"
+    snapshot = YubalSnapshot([Job("job-0", existing_url, JobStatus.DOWNLOADING, 0.5)])
+
+    with web_app._session_factory() as session:
+        for album_id, url in (("existing", existing_url), ("new", new_url)):
+            session.add(
+                AlbumDownload(
+                    ytmusic_album_id=album_id,
+                    ytmusic_album_url=url,
+                    album_name=album_id,
+                    artist_name="Artist",
+                    status=DownloadStatus.PENDING,
+                )
+            )
+        session.commit()
+
+        asyncio.run(web_app.submit_pending_downloads(web_app.get_config(), snapshot))
+
+        downloads = {d.ytmusic_album_url: d for d in session.query(AlbumDownload)}
+        assert downloads[existing_url].yubal_job_id == "job-0"
+        assert downloads[new_url].yubal_job_id == "job-1"
+        assert created == [new_url]
+        assert snapshot.active_count == 2
+
+
+def test_submitting_downloads_wakes_status_loop(client, monkeypatch):
+    """Ensure the status loop polls right after downloads are submitted."""
+    import threading
+
+    from jamknife.clients.yubal import Job, JobStatus, YubalClient, YubalSnapshot
+
+    polled = threading.Event()
+    jobs = []
+
+    def snapshot(self):
+        polled.set()
+        return YubalSnapshot(list(jobs))
+
+    def create_job(self, url):
+        job = Job(f"job-{len(jobs)}", url, JobStatus.PENDING, 0.0)
+        jobs.append(job)
+        return job
+
+    monkeypatch.setattr(YubalClient, "snapshot", snapshot)
+    monkeypatch.setattr(YubalClient, "create_job", create_job)
+
+    with web_app._session_factory() as session:
+        session.add(
+            AlbumDownload(
+                ytmusic_album_id="album",
+                ytmusic_album_url="https://music.youtube.com/browse/album",
+                album_name="Album",
+                artist_name="Artist",
+                status=DownloadStatus.PENDING,
+            )
+        )
+        session.commit()
+
+    # Submitting lists jobs once; the woken loop then polls well before
+    # its 30 second interval
+    assert web_app.get_sync_service().download_scheduler.submit() == 1
+    polled.clear()
+    assert polled.wait(timeout=5)
+
+
+def test_status_loop_stops_when_cancelled_as_it_wakes(monkeypatch):
+    """Ensure a cancel arriving with a wakeup still stops the status loop."""
+    import asyncio
+
+    monkeypatch.setattr(web_app, "_session_factory", None)
+
+    async def run():
+        monkeypatch.setattr(web_app, "_status_wakeup", asyncio.Event())
+        task = asyncio.create_task(web_app.update_download_statuses_loop(None))
+        await asyncio.sleep(0.01)
+        web_app._status_wakeup.set()
+        await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.wait_for(asyncio.shield(task), 1)
+
+    asyncio.run(run())
+
+
+def test_download_status_follows_yubal(tmp_path, monkeypatch, fake_yubal):
+    """Ensure completions are picked up from pushed events or by polling."""
+    import time
+
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    monkeypatch.setenv("PLEX_TOKEN", "testtoken")
+    monkeypatch.setenv("YUBAL_URL", fake_yubal.url)
+    web_app._session_factory = None
+    web_app._sync_service = None
+    url = "https://music.youtube.com/browse/album"
+    fake_yubal.add_job("job-1", url, status="downloading", progress=50)
+
+    with TestClient(web_app.app):
+        with web_app._session_factory() as session:
+            download = AlbumDownload(
+                ytmusic_album_id="album",
+                ytmusic_album_url=url,
+                album_name="Album",
+                artist_name="Artist",
+                status=DownloadStatus.DOWNLOADING,
+                yubal_job_id="job-1",
+            )
+            session.add(download)
+            session.commit()
+            download_id = download.id
+
+        if fake_yubal.push:
+            deadline = time.monotonic() + 5
+            while not web_app._job_feed.live:
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+
+        fake_yubal.update_job("job-1", status="completed", progress=100)
+        if not fake_yubal.push:
+            # Nothing is pushed; have the loop poll now instead of in 30s
+            web_app.wake_download_status_loop()
+
+        deadline = time.monotonic() + 5
+        while True:
+            with web_app._session_factory() as session:
+                status = session.get(AlbumDownload, download_id).status
+            if status == DownloadStatus.COMPLETED or time.monotonic() > deadline:
+                break
+            time.sleep(0.05)
+
+    assert status == DownloadStatus.COMPLETED
+    if fake_yubal.push:
+        # Listed once to seed the feed, never polled
+        assert fake_yubal.list_calls == 1
+    else:
+        assert fake_yubal.list_calls >= 1
+
+
+def test_submit_pending_downloads_runs_off_event_loop(client, monkeypatch):
+    """Ensure a scheduler pass held up elsewhere doesn't stall the event loop."""
+    import asyncio
+    import threading
+    import time
+
+    from jamknife.clients.yubal import YubalClient, YubalSnapshot
+
+    monkeypatch.setattr(YubalClient, "snapshot", lambda self: YubalSnapshot([]))
+    scheduler = web_app.get_sync_service().download_scheduler
+
+    # Stand in for a sync job's pass; the timer only guards against a hang
+    scheduler._lock.acquire()
+    safety = threading.Timer(2, scheduler._lock.release)
+    safety.start()
+
+    async def run():
+        task = asyncio.create_task(
+            web_app.submit_pending_downloads(web_app.get_config())
+        )
+        start = time.monotonic()
+        await asyncio.sleep(0.05)
+        elapsed = time.monotonic() - start
+        if elapsed < 1:
+            safety.cancel()
+            scheduler._lock.release()
+        await task
+        return elapsed
+
+    assert asyncio.run(run()) < 1
 
 
 def test_retry_non_failed_download_fails(client):
@@ -0,0 +1,256 @@
+"""Tests for the YouTube Music resolution cache."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from jamknife.clients.ytmusic import (
+    AlbumDetails,
+    AlbumInfo,
+    AlbumTrack,
+    ArtistAlbum,
+    YTMusicResolver,
+)
+from jamknife.clients.ytmusic_cache import (
+    YTMusicAlbumCache,
+    YTMusicArtistCache,
+    YTMusicResolutionCache,
+)
+from jamknife.database import Base, YTMusicArtist, YTMusicResolution
+
+ALBUM = AlbumInfo(
+    album_id="MPREb_1",
+    title="OK Computer",
+    artist="Radiohead",
+    url="https://music.youtube.com/playlist?list=OLAK5uy_1",
+    year="1997",
+    track_count=12,
+)
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Create a database and return its session factory."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'cache.db'}")
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+def test_flushed_entries_survive_a_new_cache(session_factory):
+    """Test hits and misses are persisted and found by MBID or query."""
+    cache = YTMusicResolutionCache(session_factory)
+    cache.put("Airbag", "Radiohead", "OK Computer", "mbid-1", ALBUM)
+    cache.put("Unknown", "Nobody", None, None, None)
+    assert cache.flush() == 2
+
+    reloaded = YTMusicResolutionCache(session_factory)
+    hit = reloaded.get("Different title", "Radiohead", recording_mbid="mbid-1")
+    assert hit is not None
+    assert hit.album == ALBUM
+    assert reloaded.get("AIRBAG!", "radiohead", "OK Computer").album == ALBUM
+
+    miss = reloaded.get("Unknown", "Nobody")
+    assert miss is not None
+    assert not miss.found
+    assert reloaded.get("Never looked up", "Nobody") is None
+
+
+def test_not_found_entries_expire_separately(session_factory):
+    """Test the negative TTL applies only to "not found" entries."""
+    cache = YTMusicResolutionCache(session_factory, ttl=3600, negative_ttl=60)
+    cache.put("Airbag", "Radiohead", None, None, ALBUM)
+    cache.put("Unknown", "Nobody", None, None, None)
+    cache.flush()
+
+    with session_factory() as session:
+        for row in session.query(YTMusicResolution):
+            row.resolved_at = datetime.now(timezone.utc) - timedelta(minutes=5)
+        session.commit()
+
+    reloaded = YTMusicResolutionCache(session_factory, ttl=3600, negative_ttl=60)
+    assert reloaded.get("Airbag", "Radiohead").album == ALBUM
+    assert reloaded.get("Unknown", "Nobody") is None
+
+
+@patch("jamknife.clients.ytmusic.YTMusic")
+def test_resolver_answers_from_cache(mock_ytmusic, session_factory):
+    """Test cached results, including misses, skip YouTube Music searches."""
+    mock_ytmusic.return_value.search.return_value = []
+    cache = YTMusicResolutionCache(session_factory)
+    resolver = YTMusicResolver(cache=cache)
+
+    assert resolver.find_album_for_track("Unknown", "Nobody", "Nothing") is None
+    searches = mock_ytmusic.return_value.search.call_count
+    assert searches > 0
+
+    assert resolver.find_album_for_track("Unknown", "Nobody", "Nothing") is None
+    assert mock_ytmusic.return_value.search.call_count == searches
+
+
+@patch("jamknife.clients.ytmusic.YTMusic")
+def test_resolver_does_not_cache_failed_searches(mock_ytmusic, session_factory):
+    """Test a miss caused by a search error is retried next time."""
+    mock_ytmusic.return_value.search.side_effect = ConnectionError("offline")
+    cache = YTMusicResolutionCache(session_factory)
+    resolver = YTMusicResolver(cache=cache)
+
+    assert resolver.find_album_for_track("Airbag", "Radiohead", "OK Computer") is None
+    assert cache.get("Airbag", "Radiohead", "OK Computer") is None
+
+
+def test_album_cache_evicts_least_recently_used(session_factory):
+    """Test the in-memory LRU is bounded and falls back to the database."""
+    cache = YTMusicAlbumCache(session_factory, max_size=2)
+    for i in range(3):
+        cache.put(AlbumDetails(f"MPREb_{i}", f"Album {i}", "Artist"))
+
+    assert list(cache._entries) == ["MPREb_1", "MPREb_2"]
+    assert cache.get("MPREb_0") is None
+
+    cache.flush()
+    assert cache.get("MPREb_0").title == "Album 0"
+
+
+@patch("jamknife.clients.ytmusic.YTMusic")
+def test_album_details_are_fetched_once(mock_ytmusic, session_factory):
+    """Test get_album runs once per album, across resolver instances."""
+    mock_ytmusic.return_value.get_album.return_value = {
+        "title": "OK Computer",
+        "artists": [{"name": "Radiohead"}],
+        "audioPlaylistId": "OLAK5uy_1",
+        "year": "1997",
+        "trackCount": 12,
+    }
+    cache = YTMusicAlbumCache(session_factory)
+    resolver = YTMusicResolver(album_cache=cache)
+
+    assert resolver._fetch_album_details("MPREb_1") == ALBUM
+    assert resolver._fetch_album_details("MPREb_1") == ALBUM
+    cache.flush()
+
+    fresh = YTMusicResolver(album_cache=YTMusicAlbumCache(session_factory))
+    assert fresh._fetch_album_details("MPREb_1") == ALBUM
+    mock_ytmusic.return_value.get_album.assert_called_once_with("MPREb_1")
+
+
+@patch("jamknife.clients.ytmusic.YTMusic")
+def test_album_search_result_with_playlist_id_skips_get_album(mock_ytmusic):
+    """Test an album search result with its playlist ID needs no fetch."""
+    mock_ytmusic.return_value.search.return_value = [
+        {
+            "resultType": "album",
+            "title": "OK Computer",
+            "artists": [{"name": "Radiohead"}],
+            "browseId": "MPREb_1",
+            "playlistId": "OLAK5uy_1",
+            "year": "1997",
+            "trackCount": "12 songs",
+        }
+    ]
+    resolver = YTMusicResolver()
+
+    album = resolver.find_album_for_track("Airbag", "Radiohead", "OK Computer")
+
+    assert album.url == ALBUM.url
+    assert album.track_count == 12
+    mock_ytmusic.return_value.get_album.assert_not_called()
+
+
+def test_artist_cache_persists_and_expires(session_factory):
+    """Test artist searches and album lists reload until their TTL passes."""
+    cache = YTMusicArtistCache(session_factory, ttl=60)
+    cache.put_artist_ids("The Beatles", ["UC_1"])
+    cache.put_artist_ids("Nobody", [])
+    cache.put_albums("UC_1", [ArtistAlbum("MPREb_1", "Abbey Road")])
+    assert cache.flush() == 3
+
+    reloaded = YTMusicArtistCache(session_factory, ttl=60)
+    assert reloaded.get_artist_ids("beatles") == ["UC_1"]
+    assert reloaded.get_artist_ids("Nobody") == []
+    assert reloaded.get_artist_ids("Someone else") is None
+    assert reloaded.get_albums("UC_1") == [ArtistAlbum("MPREb_1", "Abbey Road")]
+
+    with session_factory() as session:
+        for row in session.query(YTMusicArtist):
+            row.fetched_at = datetime.now(timezone.utc) - timedelta(minutes=5)
+        session.commit()
+
+    assert YTMusicArtistCache(session_factory, ttl=60).get_albums("UC_1") is None
+
+
+@patch("jamknife.clients.ytmusic.YTMusic")
+def test_artist_is_browsed_once(mock_ytmusic, session_factory):
+    """Test strategy 3 searches and browses an artist once across resolvers."""
+    ytm = mock_ytmusic.return_value
+    ytm.search.side_effect = lambda query, filter, limit: (
+        [{"resultType": "artist", "artist": "Radiohead", "browseId": "UC_1"}]
+        if filter == "artists"
+        else []
+    )
+    ytm.get_artist.return_value = {
+        "albums": {"results": [{"title": "OK Computer", "browseId": "MPREb_1"}]}
+    }
+    ytm.get_album.return_value = {
+        "title": "OK Computer",
+        "artists": [{"name": "Radiohead"}],
+        "audioPlaylistId": "OLAK5uy_1",
+        "year": "1997",
+        "trackCount": 12,
+    }
+    cache = YTMusicArtistCache(session_factory)
+
+    first = YTMusicResolver(artist_cache=cache)
+    assert first.find_album_for_track("Airbag", "Radiohead", "OK Computer") == ALBUM
+    cache.flush()
+
+    second = YTMusicResolver(artist_cache=YTMusicArtistCache(session_factory))
+    assert second._search_artist_albums("Radiohead", "OK Computer") == ALBUM
+
+    artist_searches = [
+        c for c in ytm.search.call_args_list if c.kwargs.get("filter") == "artists"
+    ]
+    assert len(artist_searches) == 1
+    ytm.get_artist.assert_called_once_with("UC_1")
+
+
+@patch("jamknife.clients.ytmusic.YTMusic")
+def test_failed_artist_browse_is_not_cached(mock_ytmusic, session_factory):
+    """Test a get_artist error is retried on the next lookup."""
+    ytm = mock_ytmusic.return_value
+    ytm.search.return_value = [
+        {"resultType": "artist", "artist": "Radiohead", "browseId": "UC_1"}
+    ]
+    ytm.get_artist.side_effect = Exception("Server returned HTTP 500")
+    cache = YTMusicArtistCache(session_factory)
+    resolver = YTMusicResolver(artist_cache=cache)
+
+    assert resolver._search_artist_albums("Radiohead", "OK Computer") is None
+    assert cache.get_artist_ids("Radiohead") == ["UC_1"]
+    assert cache.get_albums("UC_1") is None
+
+
+@patch("jamknife.clients.ytmusic.YTMusic")
+def test_album_tracks_are_cached(mock_ytmusic, session_factory):
+    """Test track lists persist and details cached without them are refetched."""
+    ytm = mock_ytmusic.return_value
+    ytm.get_album.return_value = {
+        "title": "OK Computer",
+        "artists": [{"name": "Radiohead"}],
+        "tracks": [
+            {"videoId": "v1", "title": "Airbag", "trackNumber": 1},
+            {"videoId": None, "title": "Unavailable", "trackNumber": 2},
+        ],
+    }
+    cache = YTMusicAlbumCache(session_factory)
+    cache.put(AlbumDetails("MPREb_1", "OK Computer", "Radiohead"))
+    resolver = YTMusicResolver(album_cache=cache)
+
+    assert resolver.get_album_tracks("MPREb_1") == [AlbumTrack("v1", "Airbag", 1)]
+    cache.flush()
+
+    fresh = YTMusicResolver(album_cache=YTMusicAlbumCache(session_factory))
+    assert fresh.get_album_tracks("MPREb_1") == [AlbumTrack("v1", "Airbag", 1)]
+    ytm.get_album.assert_called_once_with("MPREb_1")